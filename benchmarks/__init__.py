@@ -0,0 +1,2 @@
+from .plants import Loop, Plant, nested, cooler
+from .suite import run, run_case, cases
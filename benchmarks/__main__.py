@@ -0,0 +1,15 @@
+import argparse
+
+from .suite import run
+
+parser = argparse.ArgumentParser(
+    prog="python -m benchmarks",
+    description="Бенчмарк генерации kordat на синтетических установках"
+)
+parser.add_argument("-o", "--output", default="benchmark.json", help="файл JSON с результатами")
+parser.add_argument("-r", "--repeat", type=int, default=3, help="количество повторов измерения времени")
+parser.add_argument("-q", "--quick", action="store_true", help="уменьшенные размеры сценариев")
+parser.add_argument("cases", nargs="*", help="имена сценариев (по умолчанию - все)")
+args = parser.parse_args()
+
+run(args.output, args.quick, args.repeat, args.cases if len(args.cases) > 0 else None)
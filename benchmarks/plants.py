@@ -0,0 +1,138 @@
+import os
+import io
+import sys
+import runpy
+import contextlib
+from typing import List
+
+import numpy as np
+
+from nlpy import Model
+from nlpy import Event
+from nlpy.elements import CH
+from nlpy.elements import HCS
+from nlpy.elements import BVOL_T
+from nlpy.elements import BHEAT
+from nlpy.materials import Steel08H18N10T
+
+# examples of the repository (cooler.py fixture)
+EXAMPLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "examples")
+
+
+class Loop(Model):
+    """
+    Синтетическая петля (аналог examples/tube.py)
+    =====
+
+    Канал с теплопроводящей структурой, граничным условием теплообмена, входным и выходным объемами,
+    датчиками давления по длине канала и событиями печати
+    """
+    def __init__(
+        self,
+        id: int,
+        cells: int = 10,
+        sensors: int = 2,
+        events: int = 1,
+        submodels: List[Model] = [],
+        submodel_links_layout: List[str] = []
+    ):
+        Model.__init__(self, name="Loop", id=id)
+
+        z = np.linspace(0., 1., cells)
+        self.ch1 = CH(
+            N = cells,
+            S = 1.2e-4*(1.+0.1*z),
+            PR = 3.9e-2,
+            DZ = 2.49/cells,
+            DH = 2.49/cells*(1.-z),
+            P = 1.e6-1.e4*z,
+            T = [293.+160.*z, 453.15],
+            VOID = 0.,
+            TYPE = 0,
+            ROU = 2.e-5)
+
+        self.hcs1 = HCS(
+            N = cells,
+            KL = 1,
+            K = 5,
+            TYPE = 0,
+            COOR = 1,
+            XL = np.array([6.2e-3, 8.0e-3]),
+            X = np.linspace(6.2e-3, 8.0e-3, 5),
+            MAT = [Steel08H18N10T],
+            DFZ = 2.49/cells,
+            B = 36.01482461,
+            NGE = 0,
+            KIND = np.array([6, 4])
+        )
+
+        self.bv1 = BVOL_T(P = 1.e6, T = [293.0, 453.15], VOID = 0.)
+        self.bv2 = BVOL_T(P = 1.e6, T = [293.0, 453.15], VOID = 0.)
+        self.bh = BHEAT(TYPE = 3, BCOND = [1., 293.])
+
+        self.rebuild(
+            elements = [self.ch1, self.hcs1, self.bh, self.bv1, self.bv2],
+            model_layout = [
+                "CH1(1:"+str(cells)+") - HCS1(1:"+str(cells)+")/1;",
+                "HCS1(1:"+str(cells)+")/2 - BHEAT1;"
+            ],
+            boundary_layout = [
+                "CH1/i - BVOL_T1;",
+                "CH1/o - BVOL_T2;"
+            ],
+            sensors = [
+                Model.Sensor("p"+str(i+1), "P.CH1("+str(1+i*cells//max(sensors, 1))+");") for i in range(sensors)
+            ],
+            submodels = submodels,
+            submodel_links_layout = submodel_links_layout,
+            events = [
+                Event("_print"+str(i+1), 0, 1, [self], ["PRINT 'P', P.CH1(1);"]) for i in range(events)
+            ]
+        )
+
+
+class Plant(Model):
+    """
+    Синтетическая установка: n последовательно соединенных петель (подмоделей Loop)
+    """
+    def __init__(self, loops: int = 10, cells: int = 10, sensors: int = 2, events: int = 1):
+        Model.__init__(self, name="Plant", id=1)
+
+        self.loops = [Loop(i+1, cells, sensors, events) for i in range(loops)]
+        for loop in self.loops[:-1]:
+            loop.bv2.disable()
+
+        self.rebuild(
+            elements = [],
+            model_layout = [],
+            boundary_layout = [],
+            submodel_links_layout = [
+                a.model_name_task+".CH1/o - "+b.model_name_task+".CH1/i;"
+                for a, b in zip(self.loops[:-1], self.loops[1:])
+            ],
+            sensors = [],
+            submodels = self.loops,
+            events = []
+        )
+
+
+def nested(depth: int = 10, cells: int = 10, sensors: int = 2, events: int = 1) -> Model:
+    """
+    Синтетическая иерархия глубины depth: каждая петля содержит следующую как подмодель
+    """
+    model = Loop(depth, cells, sensors, events)
+    for i in reversed(range(1, depth)):
+        model = Loop(i, cells, sensors, events, submodels = [model])
+    return model
+
+
+def cooler() -> Model:
+    """
+    Модель examples/cooler.py
+    """
+    sys.path.insert(0, os.path.abspath(EXAMPLES))
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return runpy.run_path(os.path.join(EXAMPLES, "cooler.py"))["cool"]
+    finally:
+        sys.path.remove(os.path.abspath(EXAMPLES))
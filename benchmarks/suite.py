@@ -0,0 +1,234 @@
+import os
+import json
+import time
+import platform
+import tempfile
+import tracemalloc
+from typing import Callable, List
+
+import numpy as np
+
+import nlpy
+from nlpy import Model, Task, NumberingScope
+from nlpy.elements.element import DATA_CACHE
+from nlpy.sections import SECTIONS
+
+from .plants import Plant, nested, cooler
+
+# task keys of benchmark decks
+TASK_KEYS = dict(
+    restart = 0,
+    title = "'benchmark'",
+    dt_max = 0.01,
+    dt_out = 1.,
+    fin_tim = 600.,
+    dt_sav = 1.,
+    append_res = 1,
+    append_sav = 1,
+    check_only = 0,
+    local_err = 1.0e-4,
+    ngas = "'H2O'",
+    dt_diag = 1.,
+    inf = 1,
+    accel_stat = 0,
+    okbm = 1,
+    nwsp_dat = "'nwsp_dat'",
+    _monPer = 2.,
+    _diag = 2.
+)
+
+
+def cases(quick: bool = False) -> List[tuple]:
+    """
+    Набор сценариев: имя, параметры, функция построения модели
+
+    Arguments
+    ----------
+    quick : bool
+        Уменьшенные размеры сценариев (для быстрой проверки)
+    """
+    loops = [1, 10, 100] if not quick else [1, 10]
+    cells = [10, 1000, 100000] if not quick else [10, 1000]
+    depths = [1, 10, 50] if not quick else [1, 10]
+
+    out = [("cooler", {}, cooler)]
+    out += [("loops", {"loops": n}, lambda n=n: Plant(loops=n)) for n in loops]
+    out += [("cells", {"cells": n}, lambda n=n: Plant(loops=1, cells=n)) for n in cells]
+    out += [("nesting", {"depth": n}, lambda n=n: nested(depth=n)) for n in depths]
+    out += [(
+        "sensors_events", {"loops": 10, "sensors": 100, "events": 20},
+        lambda: Plant(loops=10, sensors=100, events=20)
+    )]
+    return out
+
+
+def _hierarchy(model: Model) -> List[Model]:
+    out = [model]
+    for m in model.submodels:
+        out.extend(_hierarchy(m))
+    return out
+
+
+def _clear(model: Model):
+    """
+    Сбросить кэши построения моделей иерархии (фрагменты kordat, блоки DATA и хэши элементов)
+    """
+    DATA_CACHE.clear()
+    for m in _hierarchy(model):
+        m.__fragments__ = {}
+        for el in m.all_elements:
+            # element is rendered again on the next refresh
+            el.__dict__.pop("__rendered_generation__", None)
+            el.__dict__.pop("__fingerprint__", None)
+
+
+def _render_model(model: Model, inputs: dict):
+    """
+    Перестроить модель и все фрагменты kordat ее иерархии
+    """
+    model.rebuild(**inputs)
+    model.render()
+
+
+def _render(task: Task):
+    """
+    Перестроить задачу и фрагменты моделей всех разделов kordat (без сборки текста разделов)
+    """
+    task.rebuild()
+    for name in SECTIONS:
+        task.sections.iter(name)
+
+
+def _best(f: Callable, repeat: int, setup: Callable = None) -> float:
+    """
+    Минимальное время выполнения f [с] из repeat повторов
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        if not setup is None:
+            setup()
+        t = time.perf_counter()
+        f()
+        best = min(best, time.perf_counter()-t)
+    return best
+
+
+def run_case(name: str, parameters: dict, build: Callable[[], Model], repeat: int = 3, directory: str = None) -> dict:
+    """
+    Выполнить сценарий
+
+    Измеряется время (лучшее из repeat повторов) этапов:
+    build - построение модели;
+    element_rebuild - Element.rebuild всех элементов;
+    model_rebuild - Model.rebuild и построение всех фрагментов (Model.render) с очищенными кэшами фрагментов 
+    и блоков DATA (элементы перестраиваются);
+    model_rebuild_noop - повторные Model.rebuild и Model.render без изменений;
+    task_rebuild - Task.rebuild и построение фрагментов моделей для всех разделов kordat с очищенными кэшами;
+    write_kordat - запись kordat в файл.
+    Пиковая память (tracemalloc) измеряется отдельным проходом построения модели, задачи и записи kordat
+
+    Returns
+    ----------
+    result : dict
+        Имя и параметры сценария, размеры модели и результаты измерений
+    """
+    if directory is None:
+        directory = tempfile.gettempdir()
+    path = os.path.join(directory, "nlpy_benchmark_"+name+".kor")
+
+    t = time.perf_counter()
+    with NumberingScope():
+        model = build()
+    build_time = time.perf_counter()-t
+
+    hierarchy = _hierarchy(model)
+    elements = [el for m in hierarchy for el in m.all_elements]
+    inputs = dict(
+        elements = model.all_elements,
+        model_layout = model.model_layout,
+        boundary_layout = model.boundary_layout,
+        submodel_links_layout = model.submodel_links_layout,
+        sensors = model.sensors,
+        submodels = model.submodels,
+        events = model.events
+    )
+
+    result = {
+        "case": name,
+        "parameters": parameters,
+        "models": len(hierarchy),
+        "elements": len(elements),
+        "cells": int(sum(el.N for el in elements if el.el_type() in ("CH", "HCS"))),
+        "build_s": build_time,
+        "element_rebuild_s": _best(lambda: [el.rebuild() for el in elements], repeat),
+        "model_rebuild_s": _best(lambda: _render_model(model, inputs), repeat, lambda: _clear(model)),
+        "model_rebuild_noop_s": _best(lambda: _render_model(model, inputs), repeat),
+    }
+
+    task = Task("benchmark", [model], **TASK_KEYS)
+    result["task_rebuild_s"] = _best(lambda: _render(task), repeat, lambda: _clear(model))
+    result["write_kordat_s"] = _best(lambda: task.write_kordat(path), repeat)
+    result["kordat_bytes"] = os.path.getsize(path)
+    os.remove(path)
+
+    tracemalloc.start()
+    with NumberingScope():
+        model = build()
+    Task("benchmark", [model], **TASK_KEYS).write_kordat(path)
+    result["peak_memory_mb"] = tracemalloc.get_traced_memory()[1]/2**20
+    tracemalloc.stop()
+    os.remove(path)
+
+    return result
+
+
+def run(output: str = None, quick: bool = False, repeat: int = 3, select: List[str] = None, verbose: bool = True) -> dict:
+    """
+    Выполнить набор сценариев
+
+    Arguments
+    ----------
+    output : str (optional)
+        Путь к файлу JSON с результатами
+
+    quick : bool
+        Уменьшенные размеры сценариев
+
+    repeat : int
+        Количество повторов измерения времени
+
+    select : List[str] (optional)
+        Имена выполняемых сценариев. По умолчанию - все
+
+    verbose : bool
+        Печатать результаты сценариев
+
+    Returns
+    ----------
+    report : dict
+        Версии nlpy, numpy, Python, платформа, время запуска и результаты сценариев
+    """
+    report = {
+        "nlpy": nlpy.__version__,
+        "numpy": np.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": []
+    }
+    for name, parameters, build in cases(quick):
+        if not select is None and name not in select:
+            continue
+        result = run_case(name, parameters, build, repeat)
+        report["results"].append(result)
+        if verbose:
+            print(
+                name, parameters,
+                " ".join(k+"="+("%.4g" % v) for k, v in result.items() if k.endswith("_s") or k.endswith("_mb"))
+            )
+
+    if not output is None:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    return report
@@ -1,4 +1,17 @@
+__version__ = "0.0.1"
+
 from .model import Model
 from .task import Task
 from .event import Event
+from .numbering import NumberingScope
+from .batch import write_batch
+from .cache import BuildCache, set_build_cache
+from .profiling import Profiler
+from .tables import TimeTable, TableRegistry
+from .geometry import (
+    channel_geometry, network_geometry, geometry_totals, wall_structures, coupling_layout,
+    loss_coefficients, junction_resistances, link_resistances, resistance_layout
+)
+from .patch import patch_kordat
+from .reader import Kordat, parse_kordat, read_kordat
 from .service import*
\ No newline at end of file
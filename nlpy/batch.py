@@ -0,0 +1,126 @@
+import os
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+from typing import Callable, List, Union
+
+from .model import Model
+from .task import Task
+from .numbering import NumberingScope
+
+
+def _subclasses(cls) -> list:
+    """
+    Все наследники класса (включая наследников наследников)
+    """
+    out = []
+    for sub in cls.__subclasses__():
+        out.append(sub)
+        out.extend(_subclasses(sub))
+    return out
+
+
+def reset_numbering():
+    """
+    Сбросить нумерацию пользовательских моделей
+
+    Счетчики ID (атрибут ids) всех наследников Model начинаются заново с 1
+    """
+    for cls in _subclasses(Model):
+        if isinstance(cls.__dict__.get("ids"), count):
+            cls.ids = count(1)
+
+
+def file_hash(path: str) -> str:
+    """
+    SHA-256 содержимого файла
+
+    Arguments
+    ----------
+    path : str
+        Полный путь к файлу
+    """
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _write_variant(args: tuple) -> dict:
+    factory, parameters, task_name, path, task_keys = args
+
+    reset_numbering()
+
+    with NumberingScope():
+        models = factory(**parameters)
+    if isinstance(models, Model):
+        models = [models]
+
+    task = Task(task_name, models, **task_keys)
+    task.write_kordat(path)
+
+    return {
+        "task_name": task_name,
+        "path": path,
+        "sha256": file_hash(path),
+        "parameters": parameters
+    }
+
+
+def write_batch(
+        factory: Callable[..., Union[Model, List[Model]]],
+        parameters: List[dict],
+        directory: str,
+        task_name: str = "task",
+        max_workers: int = None,
+        **task_keys: dict
+    ) -> List[dict]:
+    """
+    Сгенерировать и записать набор вариантов задачи в пуле процессов
+
+    Каждый вариант строится в отдельном процессе в собственной области нумерации (см. NumberingScope)
+    и со сброшенной нумерацией моделей (см. reset_numbering), поэтому нумерация элементов в kordat не зависит от порядка и распределения вариантов по процессам
+
+    Arguments
+    ----------
+    factory : Callable[..., Model | List[Model]]
+        Функция, строящая модели задачи по набору параметров (factory(**parameters)).
+        Должна быть определена на уровне модуля (передается в процессы через pickle)
+
+    parameters : List[dict]
+        Наборы параметров вариантов
+
+    directory : str
+        Папка для файлов kordat
+
+    task_name : str
+        Имя задачи. Файл i-го варианта (нумерация с 1): ${directory}/${task_name}_${i}.kor
+
+    max_workers : int (optional)
+        Количество процессов. По умолчанию - количество ядер
+
+    task_keys : dict
+        Ключи задачи (см. Task)
+
+    Returns
+    ----------
+    manifest : List[dict]
+        Для каждого варианта (в порядке parameters): task_name, path, sha256, parameters
+    """
+    if not os.path.exists(os.path.abspath(directory)):
+        os.makedirs(os.path.abspath(directory))
+
+    jobs = []
+    for i, p in enumerate(parameters):
+        name = task_name+"_"+str(i+1)
+        jobs.append((factory, p, name, os.path.join(os.path.abspath(directory), name+".kor"), task_keys))
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    chunksize = max(1, len(jobs)//(4*max_workers))
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        manifest = list(executor.map(_write_variant, jobs, chunksize=chunksize))
+
+    return manifest
@@ -0,0 +1,176 @@
+import os
+import json
+import tempfile
+import threading
+from typing import Union, List
+
+from . import __version__
+
+# active build caches of the current thread
+_local = threading.local()
+
+# build cache of the process (see set_build_cache)
+_default = None
+
+
+def _caches() -> list:
+    if not hasattr(_local, "caches"):
+        _local.caches = []
+    return _local.caches
+
+
+class BuildCache:
+    """
+    Постоянный (между сеансами Python) кэш построения kordat
+    =====
+
+    В папке кэша хранятся блоки DATA элементов, фрагменты kordat моделей (CALLs, DATAs, LAYOUT, датчики, диагностика)
+    и блоки свойств материалов. Записи идентифицируются хэшем содержимого (см. fingerprint) и версией nlpy.
+    Фрагменты и блоки, построенные до включения кэша (хранящиеся в памяти моделей и в DATA_CACHE), 
+    записываются в кэш при первом использовании внутри него.
+
+    Кэш используется внутри блока with, при построении Task с аргументом cache или после вызова set_build_cache
+
+    Attributes
+    ----------
+    directory : str
+        Папка кэша. Записи версии nlpy хранятся в ${directory}/nlpy-${version}
+
+    Methods
+    ----------
+    get -> List
+        Возвращает запись кэша (или None)
+
+    contains -> bool
+        Сообщает, есть ли запись в кэше
+
+    put
+        Сохраняет запись в кэш
+
+    clear
+        Удаляет записи текущей версии nlpy
+    """
+    def __init__(self, directory: str):
+        self.directory = os.path.abspath(directory)
+        self.__root__ = os.path.join(self.directory, "nlpy-"+__version__)
+        # records, which are known to be stored in the cache: (kind, key)
+        self.__known__ = set()
+
+    def __enter__(self):
+        _caches().append(self)
+        return self
+
+    def __exit__(self, *args):
+        _caches().pop()
+
+    def __path__(self, kind: str, key: str) -> str:
+        return os.path.join(self.__root__, kind, key[:2], key+".json")
+
+    def get(self, kind: str, key: str) -> Union[List, None]:
+        """
+        Запись кэша
+
+        Arguments
+        ----------
+        kind : str
+            Тип записи (например, "element")
+
+        key : str
+            Хэш содержимого
+
+        Returns
+        ----------
+        value : List
+            Сохраненное значение (None, если записи нет)
+        """
+        try:
+            with open(self.__path__(kind, key), encoding="utf-8") as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self.__known__.add((kind, key))
+        return value
+
+    def contains(self, kind: str, key: str) -> bool:
+        """
+        Есть ли запись в кэше (файл записи проверяется один раз за сеанс)
+
+        Arguments
+        ----------
+        kind : str
+            Тип записи (например, "element")
+
+        key : str
+            Хэш содержимого
+        """
+        if (kind, key) in self.__known__:
+            return True
+        if os.path.exists(self.__path__(kind, key)):
+            self.__known__.add((kind, key))
+            return True
+        return False
+
+    def put(self, kind: str, key: str, value: List):
+        """
+        Сохранить запись в кэш
+
+        Запись сначала пишется во временный файл, поэтому кэш может одновременно использоваться несколькими процессами
+
+        Arguments
+        ----------
+        kind : str
+            Тип записи (например, "element")
+
+        key : str
+            Хэш содержимого
+
+        value : List
+            Значение (строки или списки строк)
+        """
+        path = self.__path__(kind, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp, path)
+            self.__known__.add((kind, key))
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def clear(self):
+        """
+        Удалить записи текущей версии nlpy
+        """
+        self.__known__ = set()
+        for root, dirs, files in os.walk(self.__root__, topdown=False):
+            for name in files:
+                os.remove(os.path.join(root, name))
+            for name in dirs:
+                os.rmdir(os.path.join(root, name))
+
+
+def set_build_cache(cache: Union[str, BuildCache, None]):
+    """
+    Включить кэш построения для всего процесса
+
+    Arguments
+    ----------
+    cache : str | BuildCache | None
+        Папка кэша или кэш. None - выключить кэш
+    """
+    global _default
+    if isinstance(cache, str):
+        cache = BuildCache(cache)
+    _default = cache
+
+
+def active_build_cache() -> Union[BuildCache, None]:
+    """
+    Активный кэш построения текущего потока (None, если кэш не используется)
+    """
+    caches = _caches()
+    if len(caches) > 0:
+        return caches[-1]
+    return _default
@@ -0,0 +1,306 @@
+from typing import List
+
+# diagnostics procedures are emitted once per task as shared events, which the monitors of the models
+# call with their index arrays (_chXXX, _chLayXXX, ...). False - each model has its own copy of the procedures
+SHARED_PROCEDURES = False
+
+# shared events: name, element type, diagnostics
+SHARED_EVENTS = (
+    ("_DiagGeomCH", "CH", "ch_geometry"),
+    ("_DiagGeomHCS", "HCS", "hcs_geometry"),
+    ("_DiagCalcCH", "CH", "ch_calculation"),
+    ("_DiagCalcHCS", "HCS", "hcs_calculation"),
+)
+
+# arguments of the shared events: element numbers in task and in model, number of elements
+SHARED_ARGUMENTS = ("_ids", "_lays", "_cnt")
+
+
+def ch_geometry(ids: str, lays: str, count: str, label: str, suffix: str = "") -> List[str]:
+    """
+    Цикл диагностики геометрии каналов (CH)
+
+    Arguments
+    ----------
+    ids : str
+        Массив номеров элементов в задаче
+
+    lays : str
+        Массив номеров элементов в модели
+
+    count : str
+        Количество элементов
+
+    label : str
+        Текст, печатаемый между номерами элемента в задаче и в модели
+
+    suffix : str
+        Суффикс имен вспомогательных переменных (имя модели)
+    """
+    return [
+        "\t\tDO _i=1,"+count+";",
+        "\t\t\t_m="+ids+"(_i);",
+        "\t\t\t_n="+lays+"(_i);",
+        "\t\t\tPRINT '- CH',_m,'"+label+"',_n;",
+        "\t\t\t! Геометрия каналов",
+        "\t\t\t_fullLen := 0.; _fullLen = 0.;  ! Full length\t ",
+        "\t\t\t_fullHgt := 0.; _fullHgt = 0.;  ! Full height dif",
+        "\t\t\t_fullVol := 0.; _fullVol = 0.;  ! Full volume\t ",
+        "\t\t\tPRINT 'Cl','----- DZ ------','----- DH ------','----- V -------',",
+        "\t\t\t\t'----- PR ------';",
+        "\t\t\tDO _j=1,N.CH(_m);",
+        "\t\t\t\t_fullLen = _fullLen + DZ.CH(_m)(_j);",
+        "\t\t\t\t_fullHgt = _fullHgt + DH.CH(_m)(_j);",
+        "\t\t\t\t_fullVol = _fullVol + V.CH(_m)(_j);",
+        "\t\t\t\tPRINT _j,DZ.CH(_m)(_j),DH.CH(_m)(_j),V.CH(_m)(_j),PR.CH(_m)(_j);",
+        "\t\t\tENDDO",
+        "\t\t\tPRINT 'Cl','----- S -------','----- D -------','---- Type -----',",
+        "\t\t\t\t'----- DэквS ---';",
+        "\t\t\tDO _j=1,N.CH(_m);",
+        "\t\t\t\tPRINT _j,S.CH(_m)(_j),D.CH(_m)(_j),TYPE.CH(_m)(_j),'\t\t\t\t ',",
+        "\t\t\t\t ((4*S.CH(_m)(_j))/_pi)**0.5;",
+        "\t\t\tENDDO",
+        "\t\t\tPRINT 'Jc','---- DZJ ------','---- SJ -------','---- JUN ------',",
+        "\t\t\t\t'---- DэквSJ ---';",
+        "\t\t\tDO _j=1,N.CH(_m)+1;",
+        "\t\t\t\tPRINT _j,DZJ.CH(_m)(_j),SJ.CH(_m)(_j),JUN.CH(_m)(_j),'\t\t\t\t ',",
+        "\t\t\t\t ((4*SJ.CH(_m)(_j))/_pi)**0.5;",
+        "\t\t\tENDDO",
+        "\t\t\tIF _diag > 1 THEN ! вывод исходных значений",
+        "\t\t\t\tPRINT 'Cl','----- P -------','----- T1 ------','---- T2 -------';",
+        "\t\t\t\tDO _j=1,N.CH(_m);",
+        "\t\t\t\t PRINT _j,P.CH(_m)(_j),T.CH(_m)(1,_j)-_tOffset,",
+        "\t\t\t\t\tT.CH(_m)(2,_j)-_tOffset;",
+        "\t\t\t\tENDDO",
+        "\t\t\t\tPRINT 'Cl','----- VOID ----','----- XNG3 ----','---- XNG4 -----';",
+        "\t\t\t\tDO _j=1,N.CH(_m);",
+        "\t\t\t\t\tPRINT _j,VOID.CH(_m)(_j),XNG.CH(_m)(3,_j),XNG.CH(_m)(4,_j);",
+        "\t\t\t\tENDDO",
+        "\t\t\t\tPRINT 'Cl','----- XNF3 ----','---- XNF4 -----','---------------';",
+        "\t\t\t\tDO _j=1,N.CH(_m);",
+        "\t\t\t\t\tPRINT _j,XNF.CH(_m)(3,_j),XNF.CH(_m)(4,_j);",
+        "\t\t\t\tENDDO",
+        "\t\t\tENDIF",
+        "\t\t\tPRINT '---------------------------------------------------';",
+        "\t\t\tPRINT 'Full length\t ',_fullLen;",
+        "\t\t\tPRINT 'Full height dif',_fullHgt;",
+        "\t\t\tPRINT 'Full volume\t ',_fullVol;",
+        "\t\tENDDO",
+        "\t\tPRINT ' ';"
+    ]
+
+
+def hcs_geometry(ids: str, lays: str, count: str, label: str, suffix: str = "") -> List[str]:
+    """
+    Цикл диагностики геометрии теплопроводящих структур (HCS)
+
+    Arguments
+    ----------
+    ids : str
+        Массив номеров элементов в задаче
+
+    lays : str
+        Массив номеров элементов в модели
+
+    count : str
+        Количество элементов
+
+    label : str
+        Текст, печатаемый между номерами элемента в задаче и в модели
+
+    suffix : str
+        Суффикс имен вспомогательных переменных (имя модели)
+    """
+    return [
+        "\t\tDO _i=1,"+count+";",
+        "\t\t\t_m="+ids+"(_i);",
+        "\t\t\t_n="+lays+"(_i);",
+        "\t\t\tPRINT '- HCS',_m,'"+label+"',_n;",
+        "\t\t\t! Геометрия ТК",
+        "\t\t\t_dzFullHcs"+suffix+" := 0.;",
+        "\t\t\t_f1FullHcs"+suffix+" := 0.;",
+        "\t\t\t_f2FullHcs"+suffix+" := 0.;",
+        "\t\t\tPRINT 'Cl','----- DFZ ----- ','----- DF1 ----- ','---- DF2 ------';",
+        "\t\t\t\tDO _j=1,N.HCS(_m);",
+        "\t\t\t\t\t_dzFullHcs"+suffix+" = _dzFullHcs"+suffix+" + DFZ.HCS(_m)(_j);",
+        "\t\t\t\t\t_f1FullHcs"+suffix+" = _f1FullHcs"+suffix+" + DF.HCS(_m)(1,_j);",
+        "\t\t\t\t\t_f2FullHcs"+suffix+" = _f2FullHcs"+suffix+" + DF.HCS(_m)(2,_j);",
+        "\t\t\t\t\tPRINT _j,DFZ.HCS(_m)(_j),DF.HCS(_m)(1,_j),DF.HCS(_m)(2,_j);",
+        "\t\t\t\tENDDO",
+        "\t\t\tPRINT '---------------------------------------------------';",
+        "\t\t\tPRINT 'Full length      ',_dzFullHcs"+suffix+";",
+        "\t\t\tPRINT 'Surf 1 area      ',_f1FullHcs"+suffix+";",
+        "\t\t\tPRINT 'Surf 2 area      ',_f2FullHcs"+suffix+";",
+        "\t\t\tPRINT 'Geom mult B      ',B.HCS(_m);",
+        "\t\t\tPRINT 'Coeff. ALM-1     ',ALM.HCS(_m)(1);",
+        "\t\t\tPRINT 'Coeff. ALM-2     ',ALM.HCS(_m)(2);",
+        "\t\tENDDO",
+        "\t\tPRINT ' ';"
+    ]
+
+
+def ch_calculation(ids: str, lays: str, count: str, label: str, suffix: str = "") -> List[str]:
+    """
+    Цикл диагностики расчета каналов (CH)
+
+    Arguments
+    ----------
+    ids : str
+        Массив номеров элементов в задаче
+
+    lays : str
+        Массив номеров элементов в модели
+
+    count : str
+        Количество элементов
+
+    label : str
+        Текст, печатаемый между номерами элемента в задаче и в модели
+
+    suffix : str
+        Суффикс имен вспомогательных переменных (имя модели)
+    """
+    return [
+        "\t\tDO _i=1,"+count+";",
+        "\t\t\t_k="+ids+"(_i);",
+        "\t\t\t_n="+lays+"(_i);",
+        "\t\t\tPRINT ' TAU = ',TAU,'\tDT = ',DT;",
+        "\t\t\tPRINT '- CH',_k,'"+label+"',_n;",
+        "\t\t\tPRINT 'Cl','----- P -------','---- VOID -----','---- T1 -------',",
+        "\t\t\t\t'---- DEN1 ------';",
+        "\t\t\t_mCh := 0.; _mCh = 0.;",
+        "\t\t\tDO _j=1,N.CH(_k);",
+        "\t\t\t\t! Расчет массы канала",
+        "\t\t\t\t_mCh = _mCh + ",
+        "\t\t\t\t\tV.CH(_k)(_j)*( VOID.CH(_k)(_j)*DEN.CH(_k)(2,_j) + ",
+        "\t\t\t\t\t(1.-VOID.CH(_k)(_j))*DEN.CH(_k)(1,_j) );",
+        "\t\t\t\tPRINT _j,P.CH(_k)(_j),VOID.CH(_k)(_j),T.CH(_k)(1,_j)-_tOffset,",
+        "\t\t\t\t\tDEN.CH(_k)(1,_j);",
+        "\t\t\tENDDO",
+        "\t\t\tPRINT 'Cl','---- T2 -------','---- DEN2 ------','---- XNG3 -----',",
+        "\t\t\t\t'---- XNG4 -----';",
+        "\t\t\tDO _j=1,N.CH(_k);",
+        "\t\t\t\tPRINT _j,T.CH(_k)(2,_j)-_tOffset,DEN.CH(_k)(2,_j),XNG.CH(_k)(3,_j),",
+        "\t\t\t\t\tXNG.CH(_k)(4,_j);",
+        "\t\t\tENDDO",
+        "\t\t\tPRINT 'Jc','---- CFLw -----','---- CFLs -----';",
+        "\t\t\tDO _j=1,N.CH(_k)+1;",
+        "\t\t\t\tIF(\"($W.CH(_k)(1,_j),1) < -1.e-13 | ",
+        "\t\t\t\t\t\"($W.CH(_k)(1,_j),1) > 1.e-13) THEN",
+        "\t\t\t\t\t_x = DT*W.CH(_k)(1,_j)/DZJ.CH(_k)(_j);",
+        "\t\t\t\tELSE",
+        "\t\t\t\t\t_x = -888.;",
+        "\t\t\t\tENDIF",
+        "\t\t\t\tIF(\"($W.CH(_k)(2,_j),2) < -1e-13 | ",
+        "\t\t\t\t\t\"($W.CH(_k)(2,_j),2) > 1e-13) THEN",
+        "\t\t\t\t\t_y = DT*W.CH(_k)(2,_j)/DZJ.CH(_k)(_j);",
+        "\t\t\t\tELSE",
+        "\t\t\t\t\t_y = -888.;",
+        "\t\t\t\tENDIF",
+        "\t\t\t\tPRINT _j,_x,_y;",
+        "\t\t\tENDDO",
+        "\t\t\tPRINT 'Jc','---- Gwater ---','---- Gsteam ---','---- Gmix -----',",
+        "\t\t\t\t'---- FRWw -----';",
+        "\t\t\tDO _j=1,N.CH(_k)+1;",
+        "\t\t\t\tPRINT _j,\"($W.CH(_k)(1,_j),1),\"($W.CH(_k)(2,_j),2),",
+        "\t\t\t\t\t\"($W.CH(_k)(1,_j),1) + \"($W.CH(_k)(2,_j),2),",
+        "\t\t\t\t\tW.CH(_k)(1,_j)*FRW.CH(_k)(1,_j);",
+        "\t\t\tENDDO",
+        "\t\t\tPRINT 'Jc','---- Wwater ---','---- Wsteam ---','---- MAPJ -----',",
+        "\t\t\t\t'---- FRWs -----';",
+        "\t\t\tDO _j=1,N.CH(_k)+1;",
+        "\t\t\t\tPRINT _j,W.CH(_k)(1,_j),W.CH(_k)(2,_j),MAPJ.CH(_k)(_j),",
+        "\t\t\t\t\t'\t\t\t\t\t\t\t',W.CH(_k)(2,_j)*FRW.CH(_k)(2,_j);",
+        "\t\t\tENDDO",
+        "\t\t\tPRINT '-- Mass CH = ',_mCh;",
+        "\t\tENDDO\t",
+        "\t\tPRINT ' ';"
+    ]
+
+
+def hcs_calculation(ids: str, lays: str, count: str, label: str, suffix: str = "") -> List[str]:
+    """
+    Цикл диагностики расчета теплопроводящих структур (HCS)
+
+    Arguments
+    ----------
+    ids : str
+        Массив номеров элементов в задаче
+
+    lays : str
+        Массив номеров элементов в модели
+
+    count : str
+        Количество элементов
+
+    label : str
+        Текст, печатаемый между номерами элемента в задаче и в модели
+
+    suffix : str
+        Суффикс имен вспомогательных переменных (имя модели)
+    """
+    return [
+        "\t\tDO _i=1,"+count+";",
+        "\t\t\t_k="+ids+"(_i);",
+        "\t\t\t_n="+lays+"(_i);",
+        "\t\t\tPRINT ' TAU = ',TAU,'\tDT = ',DT;",
+        "\t\t\tPRINT '- HCS',_k,'"+label+"',_n;",
+        "\t\t\tPRINT 'Cl','----- Tw1 -----','---- Tw2 ------','---- ALW1 -----';",
+        "\t\t\tDO _j=1,N.HCS(_k);",
+        "\t\t\t\tPRINT _j,TW.HCS(_k)(1,_j)-_tOffset,TW.HCS(_k)(2,_j)-_tOffset,",
+        "\t\t\t\t\tALW.HCS(_k)(1,_j);",
+        "\t\t\tENDDO",
+        "\t\t\tPRINT 'Cl','---- ALW2 -----','---- Qw1-1 ----','---- Qw1-2 ----';",
+        "\t\t\t_x = 0.;_y = 0.;  ! Мощности",
+        "\t\t\tDO _j=1,N.HCS(_k);",
+        "\t\t\t\t_x = _x + QW.HCS(_k)(1,_j)+QW.HCS(_k)(2,_j);",
+        "\t\t\t\t_y = _y + QW.HCS(_k)(3,_j)+QW.HCS(_k)(4,_j);",
+        "\t\t\t\tPRINT _j,ALW.HCS(_k)(2,_j),QW.HCS(_k)(1,_j),QW.HCS(_k)(2,_j);",
+        "\t\t\tENDDO",
+        "\t\t\tPRINT 'Cl','---- Qw2-1 ----','---- Qw2-2 ----','---- Mod1 -----';",
+        "\t\t\tDO _j=1,N.HCS(_k);",
+        "\t\t\t\tPRINT _j,QW.HCS(_k)(3,_j),QW.HCS(_k)(4,_j),MOD.HCS(_k)(1,_j);",
+        "\t\t\tENDDO",
+        "\t\t\tPRINT 'Cl','---- QR1 ------','---- QR2 ------','---- Mod2 -----';",
+        "\t\t\tDO _j=1,N.HCS(_k);",
+        "\t\t\t\tPRINT _j,QR.HCS(_k)(1,_j),QR.HCS(_k)(2,_j),MOD.HCS(_k)(2,_j);",
+        "\t\t\tENDDO",
+        "\t\t\tPRINT 'Total power Qw/1, Qw/2:',_x,_y;",
+        "\t\tENDDO",
+        "\t\tPRINT ' ';"
+    ]
+
+
+DIAGNOSTICS = {
+    "ch_geometry": ch_geometry,
+    "hcs_geometry": hcs_geometry,
+    "ch_calculation": ch_calculation,
+    "hcs_calculation": hcs_calculation,
+}
+
+
+def shared_call(event: str, ids: str, lays: str, count: int) -> str:
+    """
+    Вызов общего события диагностики для массивов номеров модели
+    """
+    return "\t\tCALL "+event+"("+ids+","+lays+","+str(count)+");"
+
+
+def shared_events() -> List[str]:
+    """
+    Общие события диагностики (SHARED_EVENTS) для kordat задачи
+
+    Каждое событие выполняет цикл диагностики по элементам, номера которых переданы в аргументах
+    (см. SHARED_ARGUMENTS)
+    """
+    ids, lays, count = SHARED_ARGUMENTS
+    out = []
+    for name, el_type, diagnostics in SHARED_EVENTS:
+        out.append("EVENT "+name+"("+",".join(SHARED_ARGUMENTS)+")")
+        out.extend([
+            "\treplace = 1;",
+            "\tturn_on = 1;"
+        ])
+        out.extend(DIAGNOSTICS[diagnostics](ids, lays, count, " in model "))
+        out.append("END")
+    return out
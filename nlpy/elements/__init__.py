@@ -5,4 +5,5 @@ from .bheat import BHEAT
 from .bljun import BLJUN
 from .ch import CH
 from .hcs import HCS
-from .lr import LR
\ No newline at end of file
+from .lr import LR
+from .table import ChannelTable, HeatStructureTable
@@ -1,5 +1,7 @@
 from ..service import*
 from .element import Element
+from ..numbering import next_id
+from ..tables import fill_table_or_float, fill_korsar_table
 from typing import List
 from itertools import count
 
@@ -10,15 +12,17 @@ class BHEAT(Element):
     Элемент заданное граничное условие по теплообмену
     =====
 
+    Параметры могут быть заданы таблицами от времени (см. TimeTable)
+
     Attributes
     ----------
     TYPE : int
         Тип ГУ
 
-    BCOND1 : float
+    BCOND1 : float | TimeTable
         ГУ 1
 
-    BCOND2 : float
+    BCOND2 : float | TimeTable
         ГУ 2
 
     Methods
@@ -30,6 +34,8 @@ class BHEAT(Element):
 
     _ids = count(1)
 
+    __fields__ = ("TYPE", "BCOND1", "BCOND2")
+
     def __init__(
         self,
         orig = None,
@@ -38,7 +44,7 @@ class BHEAT(Element):
     ):
         Element.__init__(self)
 
-        self.id = next(self._ids)
+        self.id = next_id("BHEAT", self._ids)
 
         self.__type__ = "BHEAT"
         self.typepp = self
@@ -72,9 +78,9 @@ class BHEAT(Element):
         BCOND2: float
     ):
         self.TYPE = np.array(fill_list_or_float(TYPE,1),dtype=int)
-        self.BCOND1 = np.array(fill_list_or_float(BCOND1,1),dtype=float)
-        self.BCOND2 = np.array(fill_list_or_float(BCOND2,1),dtype=float)
-        self.rebuild()
+        self.BCOND1 = fill_table_or_float(BCOND1,1)
+        self.BCOND2 = fill_table_or_float(BCOND2,1)
+        # DATA block is rendered on demand (see Element.refresh)
 
     def rebuild(self):
         self.__data__ = []
@@ -82,8 +88,8 @@ class BHEAT(Element):
         self.__data__.append("DATA "+self.__name__)
 
         self.__data__.extend(fill_korsar_array(self.TYPE, "TYPE"))
-        self.__data__.extend(fill_korsar_array(self.BCOND1, "BCOND(1)"))
-        self.__data__.extend(fill_korsar_array(self.BCOND2, "BCOND(2)"))
+        self.__data__.extend(fill_korsar_table(self.BCOND1, "BCOND(1)"))
+        self.__data__.extend(fill_korsar_table(self.BCOND2, "BCOND(2)"))
 
         self.__data__.append("END")
 
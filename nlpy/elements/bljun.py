@@ -1,5 +1,6 @@
 from ..service import*
 from .element import Element
+from ..numbering import next_id
 from typing import List
 from itertools import count
 
@@ -24,6 +25,8 @@ class BLJUN(Element):
 
     _ids = count(1)
 
+    __fields__ = ("TYPE",)
+
     def __init__(
         self,
         orig = None,
@@ -32,7 +35,7 @@ class BLJUN(Element):
     ):
         Element.__init__(self)
 
-        self.id = next(self._ids)
+        self.id = next_id("BLJUN", self._ids)
 
         self.__type__ = "BLJUN"
         self.typepp = self
@@ -60,7 +63,7 @@ class BLJUN(Element):
         TYPE: int
     ):
         self.TYPE = np.array(fill_list_or_float(TYPE,1),dtype=int)
-        self.rebuild()
+        # DATA block is rendered on demand (see Element.refresh)
 
     def rebuild(self):
         self.__data__ = []
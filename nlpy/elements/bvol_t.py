@@ -1,5 +1,7 @@
 from ..service import*
 from .element import Element
+from ..numbering import next_id
+from ..tables import fill_table_or_float, fill_korsar_table
 from typing import List
 from itertools import count
 
@@ -10,18 +12,20 @@ class BVOL_T(Element):
     Элемент граничная ячейка с заданным давлением
     =====
 
+    Параметры могут быть заданы таблицами от времени (см. TimeTable)
+
     Attributes
     ----------    
-    P : numpy.ndarray(dtype=float64)
+    P : numpy.ndarray(dtype=float64) | TimeTable
         Давления в РЯ, [Па]
     
-    T1 : numpy.ndarray(dtype=float64)
+    T1 : numpy.ndarray(dtype=float64) | TimeTable
         Температуры жидкой фазы в РЯ, [К]
     
-    T2 : numpy.ndarray(dtype=float64)
+    T2 : numpy.ndarray(dtype=float64) | TimeTable
         Температуры газовой фазы в РЯ, [К]
     
-    VOID : numpy.ndarray(dtype=float64)
+    VOID : numpy.ndarray(dtype=float64) | TimeTable
         Объемное паросодержание в РЯ, [-]
 
     Methods
@@ -33,6 +37,8 @@ class BVOL_T(Element):
 
     _ids = count(1)
 
+    __fields__ = ("P", "T1", "T2", "VOID")
+
     def __init__(
         self,
         orig = None,
@@ -41,7 +47,7 @@ class BVOL_T(Element):
     ):
         Element.__init__(self)
 
-        self.id = next(self._ids)
+        self.id = next_id("BVOL_T", self._ids)
 
         self.__type__ = "BVOL_T"
         self.typepp = self
@@ -77,21 +83,21 @@ class BVOL_T(Element):
         T2: Union[float, List[float], np.ndarray],
         VOID: Union[float, List[float], np.ndarray]
     ):
-        self.P = np.array(fill_list_or_float(P,1),dtype=float)
-        self.T1 = np.array(fill_list_or_float(T1,1),dtype=float)
-        self.T2 = np.array(fill_list_or_float(T2,1),dtype=float)
-        self.VOID = np.array(fill_list_or_float(VOID,1),dtype=float)
-        self.rebuild()
+        self.P = fill_table_or_float(P,1)
+        self.T1 = fill_table_or_float(T1,1)
+        self.T2 = fill_table_or_float(T2,1)
+        self.VOID = fill_table_or_float(VOID,1)
+        # DATA block is rendered on demand (see Element.refresh)
 
     def rebuild(self):
         self.__data__ = []
         
         self.__data__.append("DATA "+self.__name__)
 
-        self.__data__.extend(fill_korsar_array(self.P, "P"))
-        self.__data__.extend(fill_korsar_array(self.T1, "T(1)"))
-        self.__data__.extend(fill_korsar_array(self.T2, "T(2)"))
-        self.__data__.extend(fill_korsar_array(self.VOID, "VOID"))
+        self.__data__.extend(fill_korsar_table(self.P, "P"))
+        self.__data__.extend(fill_korsar_table(self.T1, "T(1)"))
+        self.__data__.extend(fill_korsar_table(self.T2, "T(2)"))
+        self.__data__.extend(fill_korsar_table(self.VOID, "VOID"))
 
         self.__data__.append("END")
 
@@ -1,5 +1,6 @@
 from ..service import*
 from .element import Element
+from ..numbering import next_id
 from typing import List
 from itertools import count
 
@@ -54,6 +55,8 @@ class CH(Element):
 
     _ids = count(1)
 
+    __fields__ = ("N", "S", "PR", "DZ", "DH", "P", "T1", "T2", "VOID", "TYPE", "ROU")
+
     def __init__(
         self,
         orig = None,
@@ -62,7 +65,7 @@ class CH(Element):
     ):
         Element.__init__(self)
 
-        self.id = next(self._ids)
+        self.id = next_id("CH", self._ids)
 
         self.__type__ = "CH"
         self.typepp = self
@@ -131,14 +134,14 @@ class CH(Element):
         self.TYPE = np.array(fill_list_or_float(TYPE,self.N),dtype=int)
         self.ROU = np.array(fill_list_or_float(ROU,self.N),dtype=float)
 
-        self.rebuild()
+        # DATA block is rendered on demand (see Element.refresh)
 
     def rebuild(self):
         self.__data__ = []
 
         self.__data__.append("DATA "+self.__name__)
 
-        self.__data__.append("\tN = "+str(self.N)+";")
+        self.__data__.append("\tN = "+format_array([self.N])[0]+";")
         self.__data__.extend(fill_korsar_array(self.S, "S"))
         self.__data__.extend(fill_korsar_array(self.PR, "PR"))
         self.__data__.extend(fill_korsar_array(self.DZ, "DZ"))
@@ -1,7 +1,11 @@
 import os
 from ..service import*
+from ..cache import active_build_cache
 
-class Element:
+# rendered DATA blocks (without the name line) of elements: (fingerprint, render settings) -> lines
+DATA_CACHE = LRUCache(4096)
+
+class Element(Generation):
     """
     Обобщенный элемент нодализационной схемы
     =====
@@ -33,8 +37,49 @@ class Element:
 
     is_enabled -> bool
         Возвращает True, если элемент включен в задачу и False, если выключен
+
+    refresh
+        Перестраивает блок DATA элемента, если элемент был изменен после последнего построения
+
+    renumber
+        Изменяет ID элемента (нумерация задачи)
+
+    fingerprint -> str
+        Возвращает хэш содержимого элемента (тип и параметры, без имени)
     """
 
+    # parameters of the element, which define its DATA block
+    __fields__ = ()
+
+    # attributes, which do not affect DATA block of the element
+    __untracked__ = frozenset([
+        "__data__", "__rendered_generation__", "id_model", "__model_name__", "__enable_in_task__", "__fingerprint__",
+        "__refreshing__"
+    ])
+
+    def __setattr__(self, name, value):
+        Generation.__setattr__(self, name, value)
+        if name == "__data__":
+            # DATA block assigned outside refresh (e.g. rebuild after changes of arrays "in place")
+            # is a change of the element for the models, which cache its DATA block
+            if not self.__dict__.get("__refreshing__", False):
+                self.touch()
+            # DATA block is always rendered from the current state of the element
+            self.__dict__["__rendered_generation__"] = self.generation()
+
+    @property
+    def __data__(self) -> List[str]:
+        """
+        Блок DATA элемента (строится при первом обращении после изменения элемента, см. refresh)
+        """
+        if not self.__dict__.get("__refreshing__", False):
+            self.refresh()
+        return self.__dict__["__data_lines__"]
+
+    @__data__.setter
+    def __data__(self, lines: List[str]):
+        self.__dict__["__data_lines__"] = lines
+
     def __init__(self):
         # element type
         self.__type__ = ""
@@ -69,6 +114,7 @@ class Element:
         if path == "":
             path = os.path.join("./"+self.__name__+".txt")
 
+        self.refresh()
         write_data(self.__data__,path)
 
     def __add__(self, other):
@@ -120,6 +166,64 @@ class Element:
     def rebuild(self):
         """
         Перестроить kordat элемента
+
+        Вызов после изменения массивов "на месте" (как и touch()) помечает элемент как измененный
         """
         raise NotImplementedError()
 
+    def renumber(self, id: int):
+        """
+        Изменить ID элемента (нумерация задачи)
+        """
+        if self.id != id:
+            self.id = id
+            self.__name__ = self.__type__+str(id)
+
+    def fingerprint(self) -> str:
+        """
+        Хэш содержимого элемента (тип и параметры, без имени)
+        """
+        generation = self.generation()
+        cached = self.__dict__.get("__fingerprint__")
+        if cached is None or cached[0] != generation:
+            cached = (generation, fingerprint(self.__type__, [(f, getattr(self, f)) for f in self.__fields__]))
+            self.__dict__["__fingerprint__"] = cached
+        return cached[1]
+
+    def refresh(self):
+        """
+        Перестроить kordat элемента, если элемент был изменен
+
+        Блок DATA одинаковых элементов берется из DATA_CACHE (или из активного кэша построения, см. BuildCache), 
+        в нем заменяется только имя элемента
+        """
+        if self.__dict__.get("__rendered_generation__") == self.generation():
+            return
+
+        self.__dict__["__refreshing__"] = True
+        try:
+            self.__refresh__()
+        finally:
+            self.__dict__["__refreshing__"] = False
+
+    def __refresh__(self):
+        key = (self.fingerprint(), render_settings())
+        cache = active_build_cache()
+        content_key = None if cache is None else fingerprint(*key)
+        body = DATA_CACHE.get(key)
+        if body is None:
+            stored = None if cache is None else cache.get("element", content_key)
+            if stored is None:
+                self.rebuild()
+                DATA_CACHE.put(key, tuple(self.__data__[1:]))
+                if not cache is None:
+                    cache.put("element", content_key, self.__data__[1:])
+                return
+            body = tuple(stored)
+            DATA_CACHE.put(key, body)
+        elif not cache is None and not cache.contains("element", content_key):
+            # block could be rendered before the build cache was enabled
+            cache.put("element", content_key, list(body))
+
+        self.__data__ = ["DATA "+self.__name__]
+        self.__data__.extend(body)
@@ -1,5 +1,6 @@
 from ..service import*
 from .element import Element
+from ..numbering import next_id
 from ..materials.material import Material
 
 from typing import List
@@ -26,6 +27,8 @@ class HCS(Element):
 
     _ids = count(1)
 
+    __fields__ = ("N", "KL", "K", "TYPE", "COOR", "XL", "X", "MAT", "DFZ", "B", "NGE", "KIND")
+
     def __init__(
         self,
         orig = None,
@@ -34,7 +37,7 @@ class HCS(Element):
     ):
         Element.__init__(self)
 
-        self.id = next(self._ids)
+        self.id = next_id("HCS", self._ids)
 
         self.__type__ = "HCS"
         self.typepp = self
@@ -107,18 +110,18 @@ class HCS(Element):
         self.NGE = NGE
         self.KIND = KIND
         
-        self.rebuild()
+        # DATA block is rendered on demand (see Element.refresh)
 
     def rebuild(self):
         self.__data__ = []
         
         self.__data__.append("DATA "+self.__name__)
 
-        self.__data__.append("\tN = "+str(self.N)+";")
-        self.__data__.append("\tKL = "+str(self.KL)+";")
-        self.__data__.append("\tK = "+str(self.K)+";")
-        self.__data__.append("\tTYPE = "+str(self.TYPE)+";")
-        self.__data__.append("\tCOOR = "+str(self.COOR)+";")
+        self.__data__.append("\tN = "+format_array([self.N])[0]+";")
+        self.__data__.append("\tKL = "+format_array([self.KL])[0]+";")
+        self.__data__.append("\tK = "+format_array([self.K])[0]+";")
+        self.__data__.append("\tTYPE = "+format_array([self.TYPE])[0]+";")
+        self.__data__.append("\tCOOR = "+format_array([self.COOR])[0]+";")
         self.__data__.extend(fill_korsar_array(self.XL, "XL","(1:KL+1)"))
         self.__data__.extend(fill_korsar_array(self.X, "X","(1:K)",))
 
@@ -135,8 +138,8 @@ class HCS(Element):
         self.__data__[-1] = "\t\t$"+self.MAT[-1].tro+";"
 
         self.__data__.extend(fill_korsar_array(self.DFZ, "DFZ"))
-        self.__data__.append("\tB = "+str(self.B)+";")
-        self.__data__.append("\tNGE = "+str(self.NGE)+";")
+        self.__data__.append("\tB = "+format_array([self.B])[0]+";")
+        self.__data__.append("\tNGE = "+format_array([self.NGE])[0]+";")
         self.__data__.extend(fill_korsar_array(self.KIND, "KIND", ""))
 
         self.__data__.append("END")
@@ -1,5 +1,6 @@
 from ..service import*
 from .element import Element
+from ..numbering import next_id
 from typing import List
 from itertools import count
 
@@ -27,6 +28,8 @@ class LR(Element):
 
     _ids = count(1)
 
+    __fields__ = ("CSI1", "CSI2")
+
     def __init__(
         self,
         orig = None,
@@ -35,7 +38,7 @@ class LR(Element):
     ):
         Element.__init__(self)
 
-        self.id = next(self._ids)
+        self.id = next_id("LR", self._ids)
 
         self.__type__ = "LR"
         self.typepp = self
@@ -67,7 +70,7 @@ class LR(Element):
     ):
         self.CSI1 = np.array(fill_list_or_float(CSI1,1),dtype=float)
         self.CSI2 = np.array(fill_list_or_float(CSI2,1),dtype=float)
-        self.rebuild()
+        # DATA block is rendered on demand (see Element.refresh)
 
     def rebuild(self):
         self.__data__ = []
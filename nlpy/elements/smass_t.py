@@ -1,5 +1,7 @@
 from ..service import*
 from .element import Element
+from ..numbering import next_id
+from ..tables import fill_table_or_float, fill_korsar_table
 from typing import List
 from itertools import count
 
@@ -10,21 +12,23 @@ class SMASS_T(Element):
     Элемент заданное граничное условие по расходу
     =====
 
+    Параметры могут быть заданы таблицами от времени (см. TimeTable)
+
     Attributes
     ----------
-    GIN1 : float
+    GIN1 : float | TimeTable
         Заданный расход жидкой фазы (если > 0, расход поступает В ячейку, если < 0, расход поступает Из ячейки) [кг/с]
 
-    GIN2 : float
+    GIN2 : float | TimeTable
         Заданный расход газовой фазы (если > 0, расход поступает В ячейку, если < 0, расход поступает Из ячейки) [кг/с]
 
-    GMOUT : float
+    GMOUT : float | TimeTable
         Заданный расход смеси, покидающей ячейку [кг/с]
     
-    EHIN1 : float
+    EHIN1 : float | TimeTable
         Энтальпия жидкой фазы, поступающей в соответствии с ключом GIN1, [Дж/кг]
 
-    EHIN2 : float
+    EHIN2 : float | TimeTable
         Энтальпия газовой фазы, поступающей в соответствии с ключом GIN1, [Дж/кг]
 
     Methods
@@ -36,6 +40,8 @@ class SMASS_T(Element):
 
     _ids = count(1)
 
+    __fields__ = ("GIN1", "GIN2", "GMOUT", "EHIN1", "EHIN2")
+
     def __init__(
         self,
         orig = None,
@@ -44,7 +50,7 @@ class SMASS_T(Element):
     ):
         Element.__init__(self)
 
-        self.id = next(self._ids)
+        self.id = next_id("SMASS_T", self._ids)
 
         self.__type__ = "SMASS_T"
         self.typepp = self
@@ -83,23 +89,23 @@ class SMASS_T(Element):
         EHIN1: float,
         EHIN2: float,
     ):
-        self.GIN1 = np.array(fill_list_or_float(GIN1,1),dtype=float)
-        self.GIN2 = np.array(fill_list_or_float(GIN2,1),dtype=float)
-        self.GMOUT = np.array(fill_list_or_float(GMOUT,1),dtype=float)
-        self.EHIN1 = np.array(fill_list_or_float(EHIN1,1),dtype=float)
-        self.EHIN2 = np.array(fill_list_or_float(EHIN2,1),dtype=float)
-        self.rebuild()
+        self.GIN1 = fill_table_or_float(GIN1,1)
+        self.GIN2 = fill_table_or_float(GIN2,1)
+        self.GMOUT = fill_table_or_float(GMOUT,1)
+        self.EHIN1 = fill_table_or_float(EHIN1,1)
+        self.EHIN2 = fill_table_or_float(EHIN2,1)
+        # DATA block is rendered on demand (see Element.refresh)
 
     def rebuild(self):
         self.__data__ = []
         
         self.__data__.append("DATA "+self.__name__)
 
-        self.__data__.extend(fill_korsar_array(self.GIN1, "GIN(1)"))
-        self.__data__.extend(fill_korsar_array(self.GIN2, "GIN(2)"))
-        self.__data__.extend(fill_korsar_array(self.GMOUT, "GMOUT"))
-        self.__data__.extend(fill_korsar_array(self.EHIN1, "EHIN(1)"))
-        self.__data__.extend(fill_korsar_array(self.EHIN2, "EHIN(2)"))
+        self.__data__.extend(fill_korsar_table(self.GIN1, "GIN(1)"))
+        self.__data__.extend(fill_korsar_table(self.GIN2, "GIN(2)"))
+        self.__data__.extend(fill_korsar_table(self.GMOUT, "GMOUT"))
+        self.__data__.extend(fill_korsar_table(self.EHIN1, "EHIN(1)"))
+        self.__data__.extend(fill_korsar_table(self.EHIN2, "EHIN(2)"))
 
         self.__data__.append("END")
 
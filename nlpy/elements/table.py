@@ -0,0 +1,337 @@
+from ..service import*
+from ..numbering import next_id
+from ..materials.material import Material
+from .element import Element
+from .ch import CH
+from .hcs import HCS
+
+from typing import List
+
+import numpy as np
+
+
+def _scalars(var: Union[float, List[float], np.ndarray], n: int, name: str, dtype = int) -> np.ndarray:
+    """
+    Скалярный параметр элементов таблицы: скаляр (одинаковое значение) или массив значений элементов
+    """
+    if np.ndim(var) == 0:
+        return np.full(n, var, dtype=dtype)
+    values = np.array(var, dtype=dtype)
+    if values.ndim != 1 or len(values) != n:
+        raise ValueError(
+            "Количество значений параметра "+name+" ("+str(values.size)+") не совпадает с количеством элементов ("+
+            str(n)+")"
+        )
+    return values
+
+
+def _ragged(var, lengths: np.ndarray, dtype) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Сформировать столбец таблицы (непрерывный массив значений всех элементов и индекс смещений)
+
+    Arguments
+    ----------
+    var : float | np.ndarray | List
+        Значения. Скаляр - одинаковое значение во всех ячейках всех элементов;
+        одномерный массив - одинаковый профиль для всех элементов;
+        двумерный массив - строка i содержит профиль элемента i (используются первые lengths[i] значений);
+        список длины n - значения элементов (скаляр или массив для каждого элемента)
+
+    lengths : np.ndarray
+        Количество значений у каждого элемента
+
+    dtype : type
+        Тип значений
+
+    Returns
+    ----------
+    values : np.ndarray
+        Значения всех элементов подряд
+
+    offsets : np.ndarray
+        Смещения: значения элемента i - values[offsets[i]:offsets[i+1]]
+    """
+    n = len(lengths)
+    offsets = np.zeros(n+1, dtype=int)
+    np.cumsum(lengths, out=offsets[1:])
+
+    if isinstance(var, (list, tuple)):
+        if len(var) != n:
+            raise ValueError("Количество значений ("+str(len(var))+") не совпадает с количеством элементов ("+str(n)+")")
+        if all(np.ndim(v) == 0 for v in var):
+            return np.repeat(np.array(var, dtype=dtype), lengths), offsets
+        values = np.concatenate([
+            np.array(fill_list_or_float(v, int(l)), dtype=dtype).ravel() for v, l in zip(var, lengths)
+        ]) if n > 0 else np.zeros(0, dtype=dtype)
+        if len(values) != offsets[-1]:
+            raise ValueError("Длины массивов элементов не совпадают с заданным количеством значений")
+        return values, offsets
+
+    var = np.asarray(var, dtype=dtype)
+    if var.ndim == 0:
+        return np.full(offsets[-1], var, dtype=dtype), offsets
+    if var.ndim == 1:
+        if np.any(lengths != len(var)):
+            raise ValueError("Длина профиля ("+str(len(var))+") не совпадает с длиной массивов элементов")
+        return np.tile(var, n), offsets
+    if var.ndim == 2:
+        if var.shape[0] != n or var.shape[1] < lengths.max(initial=0):
+            raise ValueError("Размерность массива "+str(var.shape)+" не соответствует элементам таблицы")
+        return var[np.arange(var.shape[1]) < lengths[:, None]], offsets
+
+    raise ValueError("Массив размерности "+str(var.ndim)+" не поддерживается")
+
+
+def _column(name: str) -> property:
+    """
+    Свойство представления элемента: массив элемента в столбце таблицы
+    """
+    def fget(self):
+        offsets = self.table.offsets[name]
+        return self.table.columns[name][offsets[self.index]:offsets[self.index+1]]
+
+    def fset(self, value):
+        fget(self)[...] = value
+
+    return property(fget, fset)
+
+
+def _scalar(name: str) -> property:
+    """
+    Свойство представления элемента: значение элемента в таблице
+    """
+    def fget(self):
+        return self.table.scalars[name][self.index].item()
+
+    def fset(self, value):
+        self.table.scalars[name][self.index] = value
+
+    return property(fget, fset)
+
+
+class ElementTable(Generation):
+    """
+    Столбцовое хранилище однотипных элементов
+    =====
+
+    Массивы всех элементов хранятся подряд в общих массивах (столбцах) с индексом смещений,
+    элементы модели - легкие представления, которые ссылаются на свою часть столбцов.
+
+    Изменения столбцов "на месте" (например, table.P[:] = 1.e6) необходимо завершать вызовом touch()
+
+    Attributes
+    ----------
+    columns : Dict[str, np.ndarray]
+        Столбцы (значения всех элементов подряд)
+
+    offsets : Dict[str, np.ndarray]
+        Смещения элементов в столбцах
+
+    scalars : Dict[str, np.ndarray]
+        Скалярные параметры элементов
+
+    elements : List[Element]
+        Представления элементов
+    """
+    def __init__(self):
+        self.columns = {}
+        self.offsets = {}
+        self.scalars = {}
+        self.elements = []
+
+    def __getattr__(self, name):
+        for store in ("columns", "scalars"):
+            values = self.__dict__.get(store, {})
+            if name in values:
+                return values[name]
+        raise AttributeError(name)
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def __getitem__(self, i: int) -> Element:
+        return self.elements[i]
+
+    def __iter__(self):
+        return iter(self.elements)
+
+
+class CHView(CH):
+    """
+    Элемент канал, данные которого хранятся в таблице ChannelTable
+    """
+    N = _scalar("N")
+    S = _column("S")
+    PR = _column("PR")
+    DZ = _column("DZ")
+    DH = _column("DH")
+    P = _column("P")
+    T1 = _column("T1")
+    T2 = _column("T2")
+    VOID = _column("VOID")
+    TYPE = _column("TYPE")
+    ROU = _column("ROU")
+
+    def __init__(self, table: ElementTable, index: int, model_name: str = ""):
+        self.table = table
+        self.index = index
+
+        Element.__init__(self)
+
+        self.id = next_id("CH", CH._ids)
+
+        self.__type__ = "CH"
+        self.typepp = self
+        self.__name__ = "CH"+str(self.id)
+        self.__model_name__ = model_name
+
+        # DATA block is rendered on demand (see Element.refresh)
+
+    def generation(self) -> int:
+        return Generation.generation(self)+self.table.generation()
+
+
+class HCSView(HCS):
+    """
+    Элемент теплопроводящая структура, данные которой хранятся в таблице HeatStructureTable
+    """
+    N = _scalar("N")
+    KL = _scalar("KL")
+    K = _scalar("K")
+    TYPE = _scalar("TYPE")
+    COOR = _scalar("COOR")
+    B = _scalar("B")
+    NGE = _scalar("NGE")
+    XL = _column("XL")
+    X = _column("X")
+    DFZ = _column("DFZ")
+    KIND = _column("KIND")
+
+    def __init__(self, table: ElementTable, index: int, model_name: str = ""):
+        self.table = table
+        self.index = index
+
+        Element.__init__(self)
+
+        self.id = next_id("HCS", HCS._ids)
+
+        self.__type__ = "HCS"
+        self.typepp = self
+        self.__name__ = "HCS"+str(self.id)
+        self.__model_name__ = model_name
+
+        # DATA block is rendered on demand (see Element.refresh)
+
+    @property
+    def MAT(self) -> List[Material]:
+        return self.table.materials[self.index]
+
+    def generation(self) -> int:
+        return Generation.generation(self)+self.table.generation()
+
+
+class ChannelTable(ElementTable):
+    """
+    Таблица каналов
+    =====
+
+    Создает n каналов одним вызовом. Значения задаются так же, как в конструкторе CH, либо для всех каналов сразу:
+    скаляр - одинаковое значение во всех РЯ всех каналов; одномерный массив - одинаковый профиль всех каналов;
+    двумерный массив (n, max(N)) - строка i содержит профиль канала i; список длины n - значения каждого канала
+
+    Attributes
+    ----------
+    N : np.ndarray
+        Количество РЯ каналов
+
+    channels : List[CH]
+        Каналы таблицы (представления CHView)
+
+    Methods
+    ----------
+    __getitem__ -> CH
+        Возвращает канал таблицы
+    """
+    def __init__(
+        self,
+        n: int,
+        model_name = "",
+        **kwargs
+    ):
+        ElementTable.__init__(self)
+
+        lengths = _scalars(kwargs['N'], n, 'N')
+        self.scalars['N'] = lengths
+
+        T = kwargs['T']
+        for name, var, dtype in [
+            ('S', kwargs['S'], float),
+            ('PR', kwargs['PR'], float),
+            ('DZ', kwargs['DZ'], float),
+            ('DH', kwargs['DH'], float),
+            ('P', kwargs['P'], float),
+            ('T1', T[0], float),
+            ('T2', T[1], float),
+            ('VOID', kwargs['VOID'], float),
+            ('TYPE', kwargs['TYPE'], int),
+            ('ROU', kwargs['ROU'], float)
+        ]:
+            self.columns[name], self.offsets[name] = _ragged(var, lengths, dtype)
+
+        self.elements = [CHView(self, i, model_name) for i in range(n)]
+        self.channels = self.elements
+
+
+class HeatStructureTable(ElementTable):
+    """
+    Таблица теплопроводящих структур
+    =====
+
+    Создает n структур одним вызовом. Массивы XL, X, DFZ, KIND задаются так же, как в ChannelTable;
+    N, KL, K, TYPE, COOR, B, NGE - скаляр (одинаковое значение) или массив значений структур;
+    MAT - список материалов (одинаковый для всех структур) или список списков материалов структур
+
+    Attributes
+    ----------
+    structures : List[HCS]
+        Структуры таблицы (представления HCSView)
+
+    Methods
+    ----------
+    __getitem__ -> HCS
+        Возвращает структуру таблицы
+    """
+    def __init__(
+        self,
+        n: int,
+        model_name = "",
+        **kwargs
+    ):
+        ElementTable.__init__(self)
+
+        for name, dtype in [
+            ('N', int), ('KL', int), ('K', int), ('TYPE', int), ('COOR', int), ('B', float), ('NGE', int)
+        ]:
+            self.scalars[name] = _scalars(kwargs[name], n, name, dtype)
+
+        KIND = kwargs['KIND']
+        if isinstance(KIND, (list, tuple)):
+            kind_lengths = np.array([np.size(k) for k in KIND], dtype=int)
+        else:
+            kind_lengths = np.full(n, np.shape(KIND)[-1] if np.ndim(KIND) > 0 else 1, dtype=int)
+        for name, var, lengths, dtype in [
+            ('XL', kwargs['XL'], self.scalars['KL']+1, float),
+            ('X', kwargs['X'], self.scalars['K'], float),
+            ('DFZ', kwargs['DFZ'], self.scalars['N'], float),
+            ('KIND', KIND, kind_lengths, int)
+        ]:
+            self.columns[name], self.offsets[name] = _ragged(var, lengths, dtype)
+
+        MAT = kwargs['MAT']
+        if len(MAT) > 0 and isinstance(MAT[0], Material):
+            self.materials = [MAT]*n
+        else:
+            self.materials = list(MAT)
+
+        self.elements = [HCSView(self, i, model_name) for i in range(n)]
+        self.structures = self.elements
@@ -1,12 +1,28 @@
 from .model import Model
 from .task import Task
+from .service import Generation, parse_layout_line, resolve_layout_line
+from .numbering import next_id
 
 from typing import List, Union
 from itertools import count
-import copy
 
-class Event:
+class Event(Generation):
+    """
+    Событие (EVENT) kordat
+    =====
+
+    Тело события хранится разобранным на текст и ссылки на элементы (см. parse_layout_line). Ссылки 
+    разрешаются при построении модели-владельца (см. Model.render) по словарю имен иерархии моделей события, 
+    поэтому kordat события соответствует текущей нумерации задачи
+
+    Ссылки: в нумерации модели ("T.BVOL_T1" - только для события одной модели) или с именем модели 
+    в задаче ("P.Tube2.BVOL_T1" - для любой модели события и ее подмоделей). Строки, ссылающиеся 
+    на выключенные элементы, комментируются
+    """
     ids = count(1)
+    # kordat of the event is rendered by the owner model
+    __untracked__ = frozenset(["task_name", "task_layout", "task_arguments"])
+
     def __init__(
             self,
             name: str,
@@ -17,32 +33,71 @@ class Event:
             arguments: List[str] = []
 
     ):
-        self.id=next(self.ids)
+        self.id=next_id("EVENT", self.ids)
         self.name = name
-        self.task_name = name+str(self.id)
         self.TYPE = TYPE
         self.TURN_ON = TURN_ON
         self.arguments = arguments
         self.init_layout = layout
 
-        self.task_layout = []
-        self.task_arguments = []
-
         self.__enable_in_task__ = True
 
         if type(parent) == Task:
             self.models = parent.models
         if type(parent) == list:
             self.models = parent
-        
+
+        self.task_name = ""
+        self.task_layout = []
+        self.task_arguments = []
+
+    def template(self) -> tuple:
+        """
+        Строки тела события, разобранные на текст и ссылки на элементы
+        """
+        return tuple(parse_layout_line(line) for line in self.init_layout)
+
+    def __name_index__(self) -> dict:
+        """
+        Словарь ссылка -> элемент: полные имена ("Tube1.CH1") элементов моделей события и их подмоделей,
+        для события одной модели - также имена в нумерации этой модели
+        """
+        index = {}
+        for model in self.models:
+            for m in model.__hierarchy__():
+                index.update(m.__element_index__(m.model_name_task+"."))
         if len(self.models) == 1:
-            self.task_name = name+self.models[0].model_name_task
+            index.update(self.models[0].__element_index__())
+        return index
+
+    def __state__(self) -> tuple:
+        """
+        Входные данные kordat события: поколение, включение и имена элементов иерархии моделей события
+        """
+        return (
+            self.generation(), self.is_enabled(),
+            tuple(
+                (m.model_name_task, tuple((el.name(), el.id_model, el.is_enabled()) for el in m.all_elements))
+                for model in self.models for m in model.__hierarchy__()
+            )
+        )
 
+    def rebuild(self):
+        """
+        Перестроить kordat события (имена элементов - в текущей нумерации задачи)
+        """
+        # suffix of the names of the event and its arguments in the task
+        suffix = str(self.id)
+        if len(self.models) == 1:
+            suffix = self.models[0].model_name_task
+        self.task_name = self.name+suffix
+        self.task_layout = []
+        self.task_arguments = []
 
         if len(self.arguments) > 0:
             self.task_layout.append("EVENT "+self.task_name+"(")
             for a in self.arguments:
-                self.task_arguments.append(a+str(id))
+                self.task_arguments.append(a+suffix)
                 self.task_layout[-1] = self.task_layout[-1]+self.task_arguments[-1]+","
             self.task_layout[-1] = self.task_layout[-1][0:-1]+")"
         else:
@@ -56,31 +111,14 @@ class Event:
             "\tturn_on = "+str(self.TURN_ON)+";"
         ])
         
-        layout = copy.deepcopy(self.init_layout)
-        if len(layout) > 0:
-            if len(self.models) > 1:
-                for line in layout:
-                    self.task_layout.append(line)
-                    for m in self.models:
-                        disabled_elements = 0
-                        for el in m.all_elements:
-                            if m.model_name_task+"."+el.el_type()+str(el.id_model) in line:
-                                self.task_layout[-1] = self.task_layout[-1].replace(m.model_name_task+"."+el.el_type()+str(el.id_model), el.name())
-                                if not el.is_enabled():
-                                    disabled_elements+=1
-                        if disabled_elements > 0:
-                            self.task_layout[-1] = "! "+self.task_layout[-1]
-            if len(self.models) == 1:
-                for line in layout:
-                    self.task_layout.append(line)
-                    disabled_elements = 0
-                    for el in self.models[0].all_elements:
-                        if el.el_type()+str(el.id_model) in line:
-                            self.task_layout[-1] = self.task_layout[-1].replace(el.el_type()+str(el.id_model), el.name())
-                            if not el.is_enabled():
-                                disabled_elements+=1
-                    if disabled_elements > 0:
-                        self.task_layout[-1] = "! "+self.task_layout[-1]
+        template = self.template()
+        if len(template) > 0:
+            index = self.__name_index__()
+            for tokens in template:
+                task_line, disabled_elements = resolve_layout_line(tokens, index)
+                if disabled_elements > 0:
+                    task_line = "! "+task_line
+                self.task_layout.append(task_line)
             
         self.task_layout.append("END")
 
@@ -0,0 +1,456 @@
+import numpy as np
+from typing import Union, List, Dict, Tuple
+
+from .elements import Element, CH, HCS, LR, HeatStructureTable
+from .materials import Material
+
+
+def _per_segment(var, m: int, name: str) -> np.ndarray:
+    """
+    Значения параметра на участках трассы (скаляр - одинаковое значение на всех участках)
+    """
+    var = np.asarray(var, dtype=float)
+    if var.ndim == 0:
+        return np.full(m, float(var))
+    if var.shape != (m,):
+        raise ValueError("Количество значений "+name+" ("+str(var.size)+") не совпадает с количеством участков ("+str(m)+")")
+    return var
+
+
+def route_segments(
+        points: np.ndarray = None,
+        lengths: Union[float, List[float], np.ndarray] = None,
+        heights: Union[float, List[float], np.ndarray] = 0.,
+        diameters: Union[float, List[float], np.ndarray] = None,
+        areas: Union[float, List[float], np.ndarray] = None,
+        perimeters: Union[float, List[float], np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Участки трассы трубопровода: длины, перепады высот, площади проходного сечения и смоченные периметры
+
+    Трасса задается ломаной points или длинами и перепадами высот участков. Сечение участков -
+    диаметрами (круглая труба) или площадями и периметрами
+
+    Arguments
+    ----------
+    points : np.ndarray (optional)
+        Точки ломаной (M+1, 3) [м], ось z (столбец 2) направлена вверх
+
+    lengths : np.ndarray (optional)
+        Длины участков (M) [м]
+
+    heights : np.ndarray
+        Перепады высот участков (M) [м]
+
+    diameters : np.ndarray (optional)
+        Внутренние диаметры участков [м]
+
+    areas, perimeters : np.ndarray (optional)
+        Площади проходного сечения [м2] и смоченные периметры [м] участков
+
+    Returns
+    ----------
+    L, H, S, PR : np.ndarray
+        Длины, перепады высот, площади и периметры участков (M)
+    """
+    if not points is None:
+        points = np.asarray(points, dtype=float)
+        if points.ndim != 2 or points.shape[1] != 3 or len(points) < 2:
+            raise ValueError("Трасса должна задаваться массивом точек размерности (M+1, 3)")
+        delta = np.diff(points, axis=0)
+        L = np.sqrt(np.einsum("ij,ij->i", delta, delta))
+        H = delta[:, 2]
+    elif not lengths is None:
+        L = np.atleast_1d(np.asarray(lengths, dtype=float))
+        H = _per_segment(heights, len(L), "heights")
+    else:
+        raise ValueError("Трасса должна задаваться точками points или длинами участков lengths")
+
+    m = len(L)
+    if np.any(L <= 0.):
+        raise ValueError("Длины участков трассы должны быть положительными")
+    if np.any(np.abs(H) > L*(1.+1.e-12)):
+        raise ValueError("Перепад высот участка трассы больше его длины")
+
+    if not diameters is None:
+        D = _per_segment(diameters, m, "diameters")
+        S = np.pi*D**2/4.
+        PR = np.pi*D
+    elif not areas is None and not perimeters is None:
+        S = _per_segment(areas, m, "areas")
+        PR = _per_segment(perimeters, m, "perimeters")
+    else:
+        raise ValueError("Сечение участков должно задаваться диаметрами diameters или площадями areas и периметрами perimeters")
+
+    return L, H, S, PR
+
+
+def discretize_segments(
+        L: np.ndarray, H: np.ndarray, S: np.ndarray, PR: np.ndarray, cell_length: float
+    ) -> Dict[str, np.ndarray]:
+    """
+    Разбить участки на РЯ длиной, близкой к cell_length
+
+    Участок длины L делится на max(1, round(L/cell_length)) одинаковых РЯ длиной L/n (одинаковые значения 
+    записываются в kordat одним присваиванием, см. fill_korsar_array), суммарные длина и перепад высот 
+    участка совпадают с L и H с точностью до погрешности округления
+
+    Returns
+    ----------
+    geometry : dict
+        segment - номер участка РЯ; DZ, DH, S, PR - массивы РЯ
+    """
+    if cell_length <= 0.:
+        raise ValueError("Длина РЯ должна быть положительной")
+    n = np.maximum(1, np.rint(L/cell_length)).astype(int)
+    segment = np.repeat(np.arange(len(L)), n)
+
+    DZ = (L/n)[segment]
+    DH = (H/n)[segment]
+
+    return dict(segment=segment, DZ=DZ, DH=DH, S=S[segment], PR=PR[segment])
+
+
+def channel_geometry(cell_length: float, **route) -> Dict[str, Union[int, np.ndarray]]:
+    """
+    Геометрия канала CH по трассе трубопровода
+
+    Пример:
+    ch = CH(
+        **channel_geometry(0.1, points = [[0., 0., 0.], [2., 0., 0.], [2., 0., 3.]], diameters = 0.05),
+        P = 1.e6, T = [293., 453.15], VOID = 0., TYPE = 0, ROU = 2.e-5
+    )
+
+    Arguments
+    ----------
+    cell_length : float
+        Желаемая длина РЯ [м]
+
+    route : dict
+        Трасса: points или lengths и heights, diameters или areas и perimeters (см. route_segments)
+
+    Returns
+    ----------
+    geometry : dict
+        N, S, PR, DZ, DH - параметры конструктора CH
+    """
+    cells = discretize_segments(*route_segments(**route), cell_length)
+    return dict(N=len(cells["DZ"]), S=cells["S"], PR=cells["PR"], DZ=cells["DZ"], DH=cells["DH"])
+
+
+def network_geometry(cell_length: float, routes: List[dict]) -> Dict[str, Union[np.ndarray, List[np.ndarray]]]:
+    """
+    Геометрия каналов сети трубопроводов (все трассы разбиваются одним вызовом)
+
+    Arguments
+    ----------
+    cell_length : float
+        Желаемая длина РЯ [м]
+
+    routes : List[dict]
+        Трассы каналов (см. route_segments)
+
+    Returns
+    ----------
+    geometry : dict
+        N - количество РЯ каналов; S, PR, DZ, DH - списки массивов каналов (параметры ChannelTable)
+    """
+    segments = [route_segments(**route) for route in routes]
+    counts = np.array([len(s[0]) for s in segments], dtype=int)
+    cells = discretize_segments(*(np.concatenate([s[i] for s in segments]) for i in range(4)), cell_length)
+
+    # channel of each cell: channel of its segment
+    channel = np.repeat(np.arange(len(routes)), counts)[cells["segment"]]
+    N = np.bincount(channel, minlength=len(routes))
+    bounds = np.cumsum(N)[:-1]
+    out = {"N": N}
+    for name in ("S", "PR", "DZ", "DH"):
+        out[name] = np.split(cells[name], bounds)
+    return out
+
+
+def geometry_totals(DZ: np.ndarray, DH: np.ndarray, S: np.ndarray) -> Dict[str, float]:
+    """
+    Суммарные длина [м], перепад высот [м] и объем [м3] канала
+    """
+    DZ = np.asarray(DZ, dtype=float)
+    return dict(length=float(np.sum(DZ)), height=float(np.sum(DH)), volume=float(np.sum(np.asarray(S)*DZ)))
+
+
+def _model_numbers(elements: List[Element]) -> Dict[int, int]:
+    """
+    Номера элементов в модели (по порядку среди элементов того же типа, как в Model.render)
+    """
+    numbers = {}
+    counters = {}
+    for el in elements:
+        counters[el.el_type()] = counters.get(el.el_type(), 0)+1
+        numbers[id(el)] = counters[el.el_type()]
+    return numbers
+
+
+def wall_structures(
+        channels: List[CH],
+        thickness: Union[float, List[float]],
+        materials: List[Material],
+        radial_cells: Union[int, List[int]] = 4,
+        COOR: int = 1,
+        TYPE: int = 0,
+        NGE: int = 0,
+        KIND: np.ndarray = np.array([6, 4]),
+        model_name: str = ""
+    ) -> HeatStructureTable:
+    """
+    Стенки каналов: теплопроводящие структуры HCS, согласованные с геометрией каналов (одним вызовом для всех каналов)
+
+    Структура i имеет N и DFZ канала i. Внутренний радиус стенки (COOR = 1) - половина эквивалентного диаметра канала 
+    4V/F (V - объем, F - площадь смоченной поверхности канала), множитель B выбирается так, чтобы площадь 
+    внутренней поверхности структуры была равна F. Для плоской стенки (COOR = 0) B = F/L (L - длина канала)
+
+    Arguments
+    ----------
+    channels : List[CH]
+        Каналы
+
+    thickness : float | List[float]
+        Толщины слоев стенки [м] (KL слоев)
+
+    materials : List[Material]
+        Материалы слоев
+
+    radial_cells : int | List[int]
+        Количество радиальных интервалов сетки X в каждом слое
+
+    COOR, TYPE, NGE, KIND
+        Параметры конструктора HCS (одинаковые для всех структур)
+
+    Returns
+    ----------
+    structures : HeatStructureTable
+        Таблица структур (структура i - стенка канала i)
+    """
+    thickness = np.atleast_1d(np.asarray(thickness, dtype=float))
+    KL = len(thickness)
+    if np.any(thickness <= 0.):
+        raise ValueError("Толщины слоев стенки должны быть положительными")
+    if len(materials) != KL:
+        raise ValueError("Количество материалов ("+str(len(materials))+") не совпадает с количеством слоев ("+str(KL)+")")
+    intervals = np.broadcast_to(np.asarray(radial_cells, dtype=int), (KL,))
+    if np.any(intervals < 1):
+        raise ValueError("Количество радиальных интервалов слоя должно быть не меньше 1")
+
+    n = len(channels)
+    N = np.array([ch.N for ch in channels], dtype=int)
+    starts = np.zeros(n, dtype=int)
+    np.cumsum(N[:-1], out=starts[1:])
+    DZ = np.concatenate([np.asarray(ch.DZ, dtype=float) for ch in channels])
+    S = np.concatenate([np.asarray(ch.S, dtype=float) for ch in channels])
+    PR = np.concatenate([np.asarray(ch.PR, dtype=float) for ch in channels])
+
+    length = np.add.reduceat(DZ, starts)
+    wetted = np.add.reduceat(PR*DZ, starts)
+    volume = np.add.reduceat(S*DZ, starts)
+
+    if COOR == 1:
+        inner = 2.*volume/wetted
+        B = wetted/(2.*np.pi*inner*length)
+    elif COOR == 0:
+        inner = np.zeros(n)
+        B = wetted/length
+    else:
+        raise ValueError("Стенки строятся для COOR = 0 (плоская) и COOR = 1 (цилиндрическая)")
+
+    # layer bounds and radial mesh (layer bounds are mesh points)
+    XL = inner[:, None]+np.concatenate(([0.], np.cumsum(thickness)))[None, :]
+    fractions = np.concatenate(
+        [[0.]]+[j+np.arange(1, m+1)/m for j, m in enumerate(intervals)]
+    )
+    layer = np.minimum(fractions.astype(int), KL-1)
+    X = XL[:, layer]+(fractions-layer)[None, :]*(XL[:, layer+1]-XL[:, layer])
+
+    return HeatStructureTable(
+        n,
+        model_name,
+        N = N,
+        KL = KL,
+        K = X.shape[1],
+        TYPE = TYPE,
+        COOR = COOR,
+        XL = XL,
+        X = X,
+        MAT = list(materials),
+        DFZ = np.split(DZ, starts[1:]),
+        B = B,
+        NGE = NGE,
+        KIND = np.asarray(KIND)
+    )
+
+
+def coupling_layout(
+        channels: List[CH], structures: List[HCS], elements: List[Element], outer: str = None
+    ) -> List[str]:
+    """
+    Строки структуры модели, соединяющие РЯ каналов с внутренней поверхностью их стенок 
+    ("CHk(1:N) - HCSm(1:N)/1;"), и при заданном outer - внешнюю поверхность стенок с outer ("HCSm(1:N)/2 - BHEAT1;")
+
+    Номера элементов - в нумерации модели, элементами которой будут elements (см. Model.rebuild)
+
+    Arguments
+    ----------
+    channels : List[CH]
+        Каналы
+
+    structures : List[HCS]
+        Стенки каналов (например, wall_structures(channels, ...))
+
+    elements : List[Element]
+        Элементы модели в порядке передачи в Model.rebuild
+
+    outer : str (optional)
+        Элемент модели, с которым соединяется внешняя поверхность стенок (например, "BHEAT1")
+    """
+    numbers = _model_numbers(elements)
+
+    out = []
+    for ch, hcs in zip(channels, structures):
+        if ch.N != hcs.N:
+            raise ValueError("Количество РЯ канала "+ch.name()+" и структуры "+hcs.name()+" не совпадает")
+        cells = "(1:"+str(ch.N)+")"
+        wall = "HCS"+str(numbers[id(hcs)])+cells
+        out.append("CH"+str(numbers[id(ch)])+cells+" - "+wall+"/1;")
+        if not outer is None:
+            out.append(wall+"/2 - "+outer+";")
+    return out
+
+
+# local loss correlations (referred to velocity in the smaller area, r - ratio of smaller area to larger one):
+# expansion - expansion*(1-r)**2, contraction - contraction*(1-r)**power.
+# Other types of junctions (diffusers, confusers) are added with coefficients for their geometry, e.g.
+# JUNCTION_TYPES["diffuser"] = dict(expansion = ..., contraction = ..., power = ...)
+JUNCTION_TYPES = {
+    # sudden change of area: expansion - Borda - Carnot formula (1-r)**2, contraction - 0.5*(1-r)**0.75
+    # (Idelchik I.E. Handbook of hydraulic resistance, sudden contraction at large Reynolds numbers)
+    "sudden": dict(expansion = 1., contraction = 0.5, power = 0.75),
+}
+
+
+def loss_coefficients(
+        S1: np.ndarray, S2: np.ndarray, kind: Union[str, List[str]] = "sudden"
+    ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    КГС соединений при изменении площади проходного сечения (см. JUNCTION_TYPES), отнесенные к скорости
+    в меньшем сечении
+
+    Arguments
+    ----------
+    S1 : np.ndarray
+        Площади сечения перед соединениями (по направлению потока) [м2]
+
+    S2 : np.ndarray
+        Площади сечения за соединениями [м2]
+
+    kind : str | List[str]
+        Тип соединений (одинаковый или для каждого соединения, см. JUNCTION_TYPES)
+
+    Returns
+    ----------
+    CSI1 : np.ndarray
+        КГС при прямом направлении потока (S1 -> S2)
+
+    CSI2 : np.ndarray
+        КГС при обратном направлении потока (S2 -> S1)
+    """
+    S1, S2 = np.broadcast_arrays(np.asarray(S1, dtype=float), np.asarray(S2, dtype=float))
+    if np.any(S1 <= 0.) or np.any(S2 <= 0.):
+        raise ValueError("Площади сечения должны быть положительными")
+
+    names, index = np.unique(np.broadcast_to(np.asarray(kind, dtype=str), S1.shape), return_inverse=True)
+    index = index.reshape(S1.shape)
+    unknown = [str(name) for name in names if not name in JUNCTION_TYPES]
+    if len(unknown) > 0:
+        raise ValueError("Тип соединения "+", ".join(unknown)+" не поддерживается")
+    expansion, contraction, power = (
+        np.array([JUNCTION_TYPES[name][c] for name in names])[index] 
+        for c in ("expansion", "contraction", "power")
+    )
+
+    r = 1.-np.minimum(S1, S2)/np.maximum(S1, S2)
+    widening = expansion*r**2
+    narrowing = contraction*r**power
+    CSI1 = np.where(S2 >= S1, widening, narrowing)
+    CSI2 = np.where(S1 >= S2, widening, narrowing)
+    return CSI1, CSI2
+
+
+def junction_resistances(
+        channel: CH,
+        junctions: Union[List[int], np.ndarray] = None,
+        kind: Union[str, List[str]] = "sudden",
+        tolerance: float = 1.e-6,
+        model_name: str = ""
+    ) -> Tuple[np.ndarray, List[LR]]:
+    """
+    Гидравлические сопротивления LR внутренних соединений канала, вычисленные по площадям соседних РЯ 
+    (см. loss_coefficients)
+
+    Arguments
+    ----------
+    channel : CH
+        Канал
+
+    junctions : List[int] (optional)
+        Номера соединений канала (2..N, соединение j - между РЯ j-1 и j). По умолчанию - все соединения, 
+        на которых площадь сечения меняется более чем на tolerance (относительно)
+
+    kind : str | List[str]
+        Тип соединений
+
+    tolerance : float
+        Относительное изменение площади, начиная с которого соединение получает сопротивление
+
+    Returns
+    ----------
+    junctions : np.ndarray
+        Номера соединений
+
+    resistances : List[LR]
+        Сопротивления соединений
+    """
+    S = np.asarray(channel.S, dtype=float)
+    if junctions is None:
+        junctions = 2+np.flatnonzero(np.abs(S[1:]-S[:-1]) > tolerance*np.maximum(S[1:], S[:-1]))
+    else:
+        junctions = np.asarray(junctions, dtype=int)
+        if np.any(junctions < 2) or np.any(junctions > channel.N):
+            raise ValueError("Номера внутренних соединений канала должны быть от 2 до "+str(channel.N))
+    CSI1, CSI2 = loss_coefficients(S[junctions-2], S[junctions-1], kind)
+    resistances = [LR(model_name = model_name, CSI1 = a, CSI2 = b) for a, b in zip(CSI1.tolist(), CSI2.tolist())]
+    return junctions, resistances
+
+
+def link_resistances(
+        upstream: List[CH], downstream: List[CH], kind: Union[str, List[str]] = "sudden", model_name: str = ""
+    ) -> List[LR]:
+    """
+    Гидравлические сопротивления соединений выхода каналов upstream со входом каналов downstream 
+    (по последней и первой РЯ, см. loss_coefficients)
+    """
+    S1 = np.array([np.asarray(ch.S, dtype=float)[-1] for ch in upstream])
+    S2 = np.array([np.asarray(ch.S, dtype=float)[0] for ch in downstream])
+    CSI1, CSI2 = loss_coefficients(S1, S2, kind)
+    return [LR(model_name = model_name, CSI1 = a, CSI2 = b) for a, b in zip(CSI1.tolist(), CSI2.tolist())]
+
+
+def resistance_layout(
+        channel: CH, junctions: np.ndarray, resistances: List[LR], elements: List[Element]
+    ) -> List[str]:
+    """
+    Строки структуры модели, подключающие сопротивления к соединениям канала ("CHk(j) - LRm;")
+
+    Номера элементов - в нумерации модели, элементами которой будут elements (см. Model.rebuild)
+    """
+    numbers = _model_numbers(elements)
+    ch = "CH"+str(numbers[id(channel)])
+    return [
+        ch+"("+str(j)+") - LR"+str(numbers[id(lr)])+";" for j, lr in zip(np.asarray(junctions).tolist(), resistances)
+    ]
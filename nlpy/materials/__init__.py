@@ -1,4 +1,5 @@
 from .material import Material
+from .registry import MaterialRegistry
 import numpy as np
 
 """Свойства стали 08Х18Н10Т"""
@@ -1,6 +1,11 @@
 import numpy as np
 import os
+from typing import Tuple
 from ..service import*
+from ..cache import active_build_cache
+
+# suffix of the name of the compacted material (see Material.compact)
+COMPACT_SUFFIX = "_c"
 
 class Material:
     """
@@ -41,6 +46,12 @@ class Material:
     rebuild_data
         Перестраивает блок переменных материала для kordat
 
+    fingerprint -> str
+        Возвращает хэш свойств материала
+
+    compact -> Tuple[Material, dict]
+        Возвращает материал с сокращенными таблицами свойств и достигнутую погрешность
+
     """
     def __init__(
         self,
@@ -78,27 +89,89 @@ class Material:
 
         write_data(self.__globals__,path)
 
+    def fingerprint(self) -> str:
+        """
+        Хэш свойств материала (имя и таблицы свойств)
+        """
+        return fingerprint(self.name, np.asarray(self.T), np.asarray(self.LAM), np.asarray(self.HC), np.asarray(self.RO))
+
+    def compact(self, tolerance: float = 1.e-3, relative: bool = True, name: str = None) -> Tuple["Material", dict]:
+        """
+        Сократить таблицы свойств до точек излома, воспроизводящих LAM, HC и RO линейной интерполяцией 
+        по температуре с погрешностью не более tolerance (см. simplify_table)
+
+        Arguments
+        ----------
+        tolerance : float
+            Допустимая погрешность свойств
+
+        relative : bool
+            Допуск относительно значения свойства (иначе - абсолютный)
+
+        name : str (optional)
+            Имя сокращенного материала. По умолчанию - имя материала с суффиксом COMPACT_SUFFIX: материалы 
+            с одинаковым именем и разными свойствами не могут использоваться в одной задаче (см. MaterialRegistry)
+
+        Returns
+        ----------
+        material : Material
+            Материал с сокращенными таблицами
+
+        error : dict
+            Достигнутая погрешность свойств {"LAM": ..., "HC": ..., "RO": ...}
+        """
+        T = np.asarray(self.T)
+        properties = np.vstack([np.asarray(self.LAM), np.asarray(self.HC), np.asarray(self.RO)])
+        keep, error = simplify_table(T, properties, tolerance, relative)
+        if name is None:
+            name = self.name+COMPACT_SUFFIX
+        material = Material(
+            name, 
+            T[keep], 
+            np.asarray(self.LAM)[keep], 
+            np.asarray(self.HC)[keep], 
+            np.asarray(self.RO)[keep]
+        )
+        return material, dict(zip(("LAM", "HC", "RO"), error.tolist()))
+
     def rebuild_data(self):
         self.tlam = "_tlam_"+self.name
         self.thc = "_thc_"+self.name
         self.tro = "_tro_"+self.name
 
+        # properties and render settings, for which the block is rendered (see Registry)
+        key = self.fingerprint()
+        self.__rendered__ = (key, render_settings())
+
+        cache = active_build_cache()
+        if not cache is None:
+            stored = cache.get("material", fingerprint(*self.__rendered__))
+            if not stored is None:
+                self.__globals__ = stored
+                return
+
         self.__globals__ = []        
 
+        # temperatures and properties are formatted as the arrays of elements (see format_array)
+        T = format_array(self.T)
+
         # tlam
         self.__globals__.append(self.tlam+"(1:2,1:"+str(len(self.LAM))+") =")
-        [self.__globals__.append('\t'+str(t)+","+str(var)+",") for t,var in zip(self.T,self.LAM)]
-        self.__globals__[-1] = '\t'+str(self.T[-1])+","+str(self.LAM[-1])+";"
+        [self.__globals__.append('\t'+t+","+var+",") for t,var in zip(T,format_array(self.LAM))]
+        self.__globals__[-1] = self.__globals__[-1][:-1]+";"
         
         # thc
         self.__globals__.append(self.thc+"(1:2,1:"+str(len(self.HC))+") =")
-        [self.__globals__.append('\t'+str(t)+","+str(var)+",") for t,var in zip(self.T,self.HC)]
-        self.__globals__[-1] = '\t'+str(self.T[-1])+","+str(self.HC[-1])+";"
+        [self.__globals__.append('\t'+t+","+var+",") for t,var in zip(T,format_array(self.HC))]
+        self.__globals__[-1] = self.__globals__[-1][:-1]+";"
         
         # tro
         self.__globals__.append(self.tro+"(1:2,1:"+str(len(self.RO))+") =")
-        [self.__globals__.append('\t'+str(t)+","+str(var)+",") for t,var in zip(self.T,self.RO)]
-        self.__globals__[-1] = '\t'+str(self.T[-1])+","+str(self.RO[-1])+";"
+        [self.__globals__.append('\t'+t+","+var+",") for t,var in zip(T,format_array(self.RO))]
+        self.__globals__[-1] = self.__globals__[-1][:-1]+";"
 
         self.__globals__.insert(0, "!!bb Properties "+self.name)
         self.__globals__.append("!!eb Properties "+self.name)
+
+        if not cache is None:
+            cache.put("material", fingerprint(*self.__rendered__), self.__globals__)
@@ -0,0 +1,12 @@
+from ..registry import Registry
+
+
+class MaterialRegistry(Registry):
+    """
+    Реестр материалов задачи
+    =====
+
+    Материалы с одинаковыми свойствами (см. Material.fingerprint) хранятся один раз - как первый добавленный объект,
+    блок переменных материала (__globals__) перестраивается, только если изменились его свойства (см. Registry)
+    """
+    __kind__ = "Материалы"
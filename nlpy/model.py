@@ -1,9 +1,13 @@
 import numpy as np
-from typing import List
+from typing import List, Iterator
 from itertools import count
 import copy
+import time
 
 from .service import*
+from .cache import active_build_cache
+from .profiling import active_profiler
+from . import diagnostics
 from .elements import Element
 from .elements import CH
 from .elements import HCS
@@ -12,6 +16,23 @@ from .elements import SMASS_T
 from .elements import BHEAT
 from .elements import BLJUN
 from .elements import LR
+from .tables import element_tables
+
+# types of boundary conditions, which parameters could be time tables (see TimeTable)
+TABLE_ELEMENTS = ("BVOL_T", "SMASS_T", "BHEAT")
+
+# fragments of the model kordat: part -> attributes with the own lines of the model (without submodels)
+MODEL_PARTS = {
+    "elements": ("__calls__", "__data__"),
+    "layout": ("task_layout",),
+    "sensors": ("task_sensors_def", "task_sensors_eval"),
+    "diagnostics": ("__diagnostics__",),
+    "procedures": ("__sets__", "__monitors__", "__events__", "__outputs__"),
+    "materials": ("__materials__", "__tables__")
+}
+
+# attributes with the kordat lines of the model fragments (see Profiler)
+FRAGMENT_LINES = dict((part, a) for part, a in MODEL_PARTS.items() if part != "materials")
 
 class Model:
     """
@@ -57,9 +78,15 @@ class Model:
     ----------
     rebuild
         Перестраивает блок DATA элемента
+
+    render
+        Перестраивает зону задания модели и ее подмоделей (каждую модель - один раз за проход построения)
     """
 
-    class Sensor:
+    # build passes (each model is rendered once per pass)
+    _builds = count(1)
+
+    class Sensor(Generation):
         """
         Датчик модели
         =====
@@ -75,7 +102,7 @@ class Model:
             Возвращает имя датчика
 
         id -> int
-            Возвращает ID датчика
+            Возвращает ID датчика (порядковый номер в модели, назначается при построении модели)
 
         enable
             Включает учет элемента в задаче
@@ -85,8 +112,13 @@ class Model:
 
         is_enabled -> bool
             Возвращает True, если элемент включен в задачу и False, если выключен
+
+        template -> tuple
+            Возвращает разобранное выражение (см. parse_layout_line)
         """
-        _ids = count(1)
+        # id is assigned by model
+        __untracked__ = frozenset(["__id__"])
+
         def __init__(
                 self,
                 name: str,
@@ -94,7 +126,7 @@ class Model:
             ):
             self.__name__ = name
             self.expression = expression
-            self.__id__ = next(self._ids)
+            self.__id__ = 0
 
             # enable (True) or disable (False) this sensor to the task
             self.__enable_in_task__ = True
@@ -129,6 +161,12 @@ class Model:
             """
             return self.__enable_in_task__
 
+        def template(self) -> tuple:
+            """
+            Выражение датчика, разобранное на текст и ссылки на элементы (разбирается один раз для каждого выражения)
+            """
+            return parse_layout_line(self.expression)
+
     def __init__(
         self,
         # orig = None,
@@ -164,8 +202,6 @@ class Model:
             Активные датчики модели (в нумерации задачи)
 
         """
-        
-        self.Sensor._ids = count(1)
 
         self.mon_per = None
 
@@ -179,6 +215,7 @@ class Model:
         self.task_sensors_eval = []
 
         self.sensors = []
+        self.submodels = []
         self.events = []
         self.active_sensors = []
 
@@ -188,6 +225,14 @@ class Model:
         self.__sensors__ = []
         self.__sens_eval__ = []
         self.__events__ = []
+        self.__materials__ = []
+        self.__tables__ = []
+
+        # cached kordat fragments: part -> (inputs key, attributes, roots of build caches with the fragment)
+        self.__fragments__ = {}
+        # last build pass, in which the model was numbered, and parts rendered in this pass
+        self.__build__ = 0
+        self.__rendered__ = set()
 
         self.id = kwargs['id']
         if kwargs['name'] == "":
@@ -254,83 +299,122 @@ class Model:
     #             'submodels': orig.submodels
     #         })
 
+    def __element_index__(self, prefix: str = "") -> dict:
+        """
+        Словарь имя элемента (в нумерации модели) -> элемент
+
+        Arguments
+        ----------
+        prefix : str
+            Префикс имени (например, "Tube1." для ссылок из надмодели)
+        """
+        return {prefix+el.el_type()+str(el.id_model): el for el in self.all_elements}
+
+    def __hierarchy__(self) -> list:
+        """
+        Модель и все ее подмодели (в глубину)
+        """
+        out = [self]
+        for m in self.submodels:
+            out.extend(m.__hierarchy__())
+        return out
+
+    def __deck__(self) -> list:
+        """
+        Модель и все ее подмодели в порядке следования их фрагментов в kordat (подмодели, затем модель)
+        """
+        out = []
+        for m in reversed(self.submodels):
+            out.extend(m.__deck__())
+        out.append(self)
+        return out
+
+    def __lines__(self, attribute: str) -> Iterator[str]:
+        """
+        Строки фрагмента kordat (для фрагмента materials - материалы и таблицы) модели и ее подмоделей 
+        (атрибут attribute, см. MODEL_PARTS) в порядке kordat
+
+        Фрагменты подмоделей не копируются в модель: каждая модель хранит только свои строки
+        """
+        for m in self.__deck__():
+            yield from getattr(m, attribute)
+
+    def fingerprint(self) -> str:
+        """
+        Хэш содержимого модели без учета ее имени и нумерации в задаче
+
+        Учитываются элементы (см. Element.fingerprint) и их включение в задачу, структура модели, датчики,
+        события и подмодели. Одинаковые модели (например, экземпляры одного класса с одинаковыми параметрами)
+        имеют одинаковый хэш
+        """
+        return fingerprint(
+            [(el.fingerprint(), el.is_enabled()) for el in self.all_elements],
+            self.model_layout, self.boundary_layout, getattr(self, "submodel_links_layout", []),
+            [(sens.name(), sens.expression, sens.is_enabled()) for sens in self.sensors],
+            [(e.name, e.TYPE, e.TURN_ON, e.arguments, e.init_layout, e.is_enabled()) for e in self.events],
+            self.mon_per,
+            [m.fingerprint() for m in self.submodels]
+        )
+
     def __layout__(self, model_layout: List[str], boundary_layout: List[str], submodel_links_layout: List[str]):
         """
         Сгенерировать структуру модели для kordat
         """
         self.task_layout = []
-        self.boundary_layout = boundary_layout
-        self.model_layout = model_layout
-        self.submodel_links_layout = submodel_links_layout
 
         # read links between submodels
-        links = copy.deepcopy(submodel_links_layout)
-        if len(links) > 0:
-            for line in links:
-                self.task_layout.append(line)
-                for sm in self.submodels:
-                    disabled_elements = 0
-                    for el in sm.all_elements:
-                        if sm.model_name_task+"."+el.el_type()+str(el.id_model) in line:
-                            self.task_layout[-1] = self.task_layout[-1].replace(sm.model_name_task+"."+el.el_type()+str(el.id_model), el.name())
-                            if not el.is_enabled():
-                                disabled_elements+=1
-                    if disabled_elements > 0:
-                        self.task_layout[-1] = "! "+self.task_layout[-1]
+        links_index = {}
+        for sm in self.submodels:
+            links_index.update(sm.__element_index__(sm.model_name_task+"."))
+        for line in submodel_links_layout:
+            task_line, disabled_elements = resolve_layout_line(parse_layout_line(line), links_index)
+            if disabled_elements > 0:
+                task_line = "! "+task_line
+            self.task_layout.append(task_line)
 
         self.task_layout.insert(0,"!!bb link submodels")
         self.task_layout.append("!!eb link submodels")
 
-        layout = copy.deepcopy(boundary_layout)
+        layout = copy.copy(boundary_layout)
         layout.insert(0, "!!bb boundaries")
         layout.append("!!eb boundaries")
         layout.append("!!bb model")
         layout.extend(model_layout)
         layout.append("!!eb model")
 
-        if len(layout) > 0:
-            for line in layout:
-                self.task_layout.append(line)
-                disabled_elements = 0
-                for el in self.all_elements:
-                    if el.el_type()+str(el.id_model) in line:
-                        self.task_layout[-1] = self.task_layout[-1].replace(el.el_type()+str(el.id_model), el.name())
-                        if not el.is_enabled():
-                            disabled_elements+=1
-                if disabled_elements > 0:
-                    self.task_layout[-1] = "! "+self.task_layout[-1]
+        index = self.__element_index__()
+        for line in layout:
+            task_line, disabled_elements = resolve_layout_line(parse_layout_line(line), index)
+            if disabled_elements > 0:
+                task_line = "! "+task_line
+            self.task_layout.append(task_line)
 
         self.task_layout.insert(0, "!!bb Lay "+self.model_name_task)
         self.task_layout.append("!!eb Lay "+self.model_name_task)
     
     def __set_sensors__(self, sensors: List[Sensor]):
-        self.sensors = sensors
         self.active_sensors = []
         self.task_sensors_eval = []
         self.task_sensors_def = []
         self.__sensors__ = []
         self.__sens_eval__ = []
 
-        if len(self.sensors) > 0:
-            # fill sensor's array
-            for sens in self.sensors:
-                self.__sensors__.append("_sens_"+self.model_name_task+"("+str(sens.id())+")=")
+        if len(sensors) > 0:
+            # replace model numeration by task numeration in the parsed expressions
+            index = self.__element_index__()
+            prefix = "_sens_"+self.model_name_task+"("
+            for sens in sensors:
+                head = prefix+str(sens.id())+")="
                 if sens.is_enabled():
                     self.active_sensors.append(sens)
-                    self.__sensors__[-1]+=sens.expression
+                    self.__sensors__.append(head+sens.expression)
+                    expression, disabled_elements = resolve_layout_line(sens.template(), index)
+                    if disabled_elements > 0:
+                        expression = "0.;"
                 else:
-                    self.__sensors__[-1]+="0.;"
-            # replace model numeration by task numeration
-            for line in self.__sensors__:
-                self.__sens_eval__.append(line)
-                disabled_elements = 0
-                for el in self.all_elements:
-                    if el.el_type()+str(el.id_model) in line:
-                        self.__sens_eval__[-1] = self.__sens_eval__[-1].replace(el.el_type()+str(el.id_model), el.name())
-                        if not el.is_enabled():
-                            disabled_elements+=1
-                if disabled_elements > 0:
-                    self.__sens_eval__[-1] = "_sens_"+self.model_name_task+"("+str(sens.id())+")=0.;"
+                    self.__sensors__.append(head+"0.;")
+                    expression = "0.;"
+                self.__sens_eval__.append(head+expression)
 
             self.task_sensors_eval = []
             self.task_sensors_eval.extend(self.__sens_eval__)
@@ -339,251 +423,75 @@ class Model:
 
             self.task_sensors_def = []
             self.task_sensors_def.append("!!bb Sensors "+self.model_name_task)
-            self.task_sensors_def.append("_sens_"+self.model_name_task+"(1:"+str(next(copy.copy(self.Sensor._ids))-1)+")=0.;")
+            self.task_sensors_def.append("_sens_"+self.model_name_task+"(1:"+str(len(sensors))+")=0.;")
             self.task_sensors_def.append("!!eb Sensors "+self.model_name_task)
 
-    def __ch_compiletime_diag__(self):
-        if len(self.ch) > 0:
-            task_ch_nums = []
-            model_ch_nums = []
-            ch_cells_nums = []
-            for ch in self.ch:
-                model_ch_nums.append(ch.id_model)
-                task_ch_nums.append(ch.id)
-                ch_cells_nums.append(ch.N)
-
-            self.__compiletime_diagnostics__.extend(fill_korsar_array(
-                task_ch_nums, 
-                "_ch"+self.model_name_task,
-                "(1:"+str(len(task_ch_nums))+")",
-                ":=",
-                "\t\t"
-            ))
-            self.__compiletime_diagnostics__.extend(fill_korsar_array(
-                model_ch_nums, 
-                "_chLay"+self.model_name_task,
-                "(1:"+str(len(model_ch_nums))+")",
-                ":=",
-                "\t\t"
-            ))
+    def __index_arrays__(self, elements: list, prefix: str):
+        """
+        Массивы номеров элементов в задаче, в модели и количества ячеек (prefix+имя модели, prefix+"Lay"+имя модели, 
+        prefix+"N"+имя модели)
+        """
+        task_nums = []
+        model_nums = []
+        cells_nums = []
+        for el in elements:
+            model_nums.append(el.id_model)
+            task_nums.append(el.id)
+            cells_nums.append(el.N)
+
+        for nums, name in (
+            (task_nums, prefix), 
+            (model_nums, prefix+"Lay"), 
+            (cells_nums, prefix+"N")
+        ):
             self.__compiletime_diagnostics__.extend(fill_korsar_array(
-                ch_cells_nums, 
-                "_chN"+self.model_name_task,
-                "(1:"+str(len(ch_cells_nums))+")",
+                nums, 
+                name+self.model_name_task,
+                "(1:"+str(len(nums))+")",
                 ":=",
                 "\t\t"
             ))
 
-            self.__compiletime_diagnostics__.extend(
-                [
-                    "\t\tPRINT '*** CH DATA "+self.model_name_task+" ***';",
-                    "\t\tDO _i=1,"+str(len(self.ch))+";",
-                    "\t\t\t_m=_ch"+self.model_name_task+"(_i);",
-                    "\t\t\t_n=_chLay"+self.model_name_task+"(_i);",
-                    "\t\t\tPRINT '- CH',_m,' in model "+self.model_name_task+" ',_n;",
-                    "\t\t\t! Геометрия каналов",
-                    "\t\t\t_fullLen := 0.; _fullLen = 0.;  ! Full length\t ",
-                    "\t\t\t_fullHgt := 0.; _fullHgt = 0.;  ! Full height dif",
-                    "\t\t\t_fullVol := 0.; _fullVol = 0.;  ! Full volume\t ",
-                    "\t\t\tPRINT 'Cl','----- DZ ------','----- DH ------','----- V -------',",
-                    "\t\t\t\t'----- PR ------';",
-                    "\t\t\tDO _j=1,N.CH(_m);",
-                    "\t\t\t\t_fullLen = _fullLen + DZ.CH(_m)(_j);",
-                    "\t\t\t\t_fullHgt = _fullHgt + DH.CH(_m)(_j);",
-                    "\t\t\t\t_fullVol = _fullVol + V.CH(_m)(_j);",
-                    "\t\t\t\tPRINT _j,DZ.CH(_m)(_j),DH.CH(_m)(_j),V.CH(_m)(_j),PR.CH(_m)(_j);",
-                    "\t\t\tENDDO",
-                    "\t\t\tPRINT 'Cl','----- S -------','----- D -------','---- Type -----',",
-                    "\t\t\t\t'----- DэквS ---';",
-                    "\t\t\tDO _j=1,N.CH(_m);",
-                    "\t\t\t\tPRINT _j,S.CH(_m)(_j),D.CH(_m)(_j),TYPE.CH(_m)(_j),'\t\t\t\t ',",
-                    "\t\t\t\t ((4*S.CH(_m)(_j))/_pi)**0.5;",
-                    "\t\t\tENDDO",
-                    "\t\t\tPRINT 'Jc','---- DZJ ------','---- SJ -------','---- JUN ------',",
-                    "\t\t\t\t'---- DэквSJ ---';",
-                    "\t\t\tDO _j=1,N.CH(_m)+1;",
-                    "\t\t\t\tPRINT _j,DZJ.CH(_m)(_j),SJ.CH(_m)(_j),JUN.CH(_m)(_j),'\t\t\t\t ',",
-                    "\t\t\t\t ((4*SJ.CH(_m)(_j))/_pi)**0.5;",
-                    "\t\t\tENDDO",
-                    "\t\t\tIF _diag > 1 THEN ! вывод исходных значений",
-                    "\t\t\t\tPRINT 'Cl','----- P -------','----- T1 ------','---- T2 -------';",
-                    "\t\t\t\tDO _j=1,N.CH(_m);",
-                    "\t\t\t\t PRINT _j,P.CH(_m)(_j),T.CH(_m)(1,_j)-_tOffset,",
-                    "\t\t\t\t\tT.CH(_m)(2,_j)-_tOffset;",
-                    "\t\t\t\tENDDO",
-                    "\t\t\t\tPRINT 'Cl','----- VOID ----','----- XNG3 ----','---- XNG4 -----';",
-                    "\t\t\t\tDO _j=1,N.CH(_m);",
-                    "\t\t\t\t\tPRINT _j,VOID.CH(_m)(_j),XNG.CH(_m)(3,_j),XNG.CH(_m)(4,_j);",
-                    "\t\t\t\tENDDO",
-                    "\t\t\t\tPRINT 'Cl','----- XNF3 ----','---- XNF4 -----','---------------';",
-                    "\t\t\t\tDO _j=1,N.CH(_m);",
-                    "\t\t\t\t\tPRINT _j,XNF.CH(_m)(3,_j),XNF.CH(_m)(4,_j);",
-                    "\t\t\t\tENDDO",
-                    "\t\t\tENDIF",
-                    "\t\t\tPRINT '---------------------------------------------------';",
-                    "\t\t\tPRINT 'Full length\t ',_fullLen;",
-                    "\t\t\tPRINT 'Full height dif',_fullHgt;",
-                    "\t\t\tPRINT 'Full volume\t ',_fullVol;",
-                    "\t\tENDDO",
-                    "\t\tPRINT ' ';"
-                ]
-            )
+    def __diagnostics_loop__(self, elements: list, prefix: str, event: str, loop, label: str) -> List[str]:
+        """
+        Цикл диагностики элементов модели: вызов общего события event (см. diagnostics.SHARED_PROCEDURES) 
+        или собственная копия цикла
+        """
+        ids = prefix+self.model_name_task
+        lays = prefix+"Lay"+self.model_name_task
+        if diagnostics.SHARED_PROCEDURES:
+            return [diagnostics.shared_call(event, ids, lays, len(elements))]
+        return loop(ids, lays, str(len(elements)), label, self.model_name_task)
+
+    def __ch_compiletime_diag__(self):
+        if len(self.ch) > 0:
+            self.__index_arrays__(self.ch, "_ch")
+            self.__compiletime_diagnostics__.append("\t\tPRINT '*** CH DATA "+self.model_name_task+" ***';")
+            self.__compiletime_diagnostics__.extend(self.__diagnostics_loop__(
+                self.ch, "_ch", "_DiagGeomCH", diagnostics.ch_geometry, " in model "+self.model_name_task+" "
+            ))
 
     def __hcs_compiletime_diag__(self):
         if len(self.hcs) > 0:
-            task_hcs_nums = []
-            model_hcs_nums = []
-            hcs_cells_nums = []
-            for hcs in self.hcs:
-                model_hcs_nums.append(hcs.id_model)
-                task_hcs_nums.append(hcs.id)
-                hcs_cells_nums.append(hcs.N)
-
-            self.__compiletime_diagnostics__.extend(fill_korsar_array(
-                task_hcs_nums, 
-                "_hcs"+self.model_name_task,
-                "(1:"+str(len(task_hcs_nums))+")",
-                ":=",
-                "\t\t"
+            self.__index_arrays__(self.hcs, "_hcs")
+            self.__compiletime_diagnostics__.append("\t\tPRINT '*** HCS DATA "+self.model_name_task+" ***';")
+            self.__compiletime_diagnostics__.extend(self.__diagnostics_loop__(
+                self.hcs, "_hcs", "_DiagGeomHCS", diagnostics.hcs_geometry, " in model "+self.model_name_task+" "
             ))
-            self.__compiletime_diagnostics__.extend(fill_korsar_array(
-                model_hcs_nums, 
-                "_hcsLay"+self.model_name_task,
-                "(1:"+str(len(model_hcs_nums))+")",
-                ":=",
-                "\t\t"
-            ))
-            self.__compiletime_diagnostics__.extend(fill_korsar_array(
-                hcs_cells_nums, 
-                "_hcsN"+self.model_name_task,
-                "(1:"+str(len(hcs_cells_nums))+")",
-                ":=",
-                "\t\t"
-            ))
-
-            self.__compiletime_diagnostics__.extend(
-                [
-                    "\t\tPRINT '*** HCS DATA "+self.model_name_task+" ***';",
-                    "\t\tDO _i=1,"+str(len(self.hcs))+";",
-                    "\t\t\t_m=_hcs"+self.model_name_task+"(_i);",
-                    "\t\t\t_n=_hcsLay"+self.model_name_task+"(_i);",
-                    "\t\t\tPRINT '- HCS',_m,' in model "+self.model_name_task+" ',_n;",
-                    "\t\t\t! Геометрия ТК",
-                    "\t\t\t_dzFullHcs"+self.model_name_task+" := 0.;",
-                    "\t\t\t_f1FullHcs"+self.model_name_task+" := 0.;",
-                    "\t\t\t_f2FullHcs"+self.model_name_task+" := 0.;",
-                    "\t\t\tPRINT 'Cl','----- DFZ ----- ','----- DF1 ----- ','---- DF2 ------';",
-                    "\t\t\t\tDO _j=1,N.HCS(_m);",
-                    "\t\t\t\t\t_dzFullHcs"+self.model_name_task+" = _dzFullHcs"+self.model_name_task+" + DFZ.HCS(_m)(_j);",
-                    "\t\t\t\t\t_f1FullHcs"+self.model_name_task+" = _f1FullHcs"+self.model_name_task+" + DF.HCS(_m)(1,_j);",
-                    "\t\t\t\t\t_f2FullHcs"+self.model_name_task+" = _f2FullHcs"+self.model_name_task+" + DF.HCS(_m)(2,_j);",
-                    "\t\t\t\t\tPRINT _j,DFZ.HCS(_m)(_j),DF.HCS(_m)(1,_j),DF.HCS(_m)(2,_j);",
-                    "\t\t\t\tENDDO",
-                    "\t\t\tPRINT '---------------------------------------------------';",
-                    "\t\t\tPRINT 'Full length      ',_dzFullHcs"+self.model_name_task+";",
-                    "\t\t\tPRINT 'Surf 1 area      ',_f1FullHcs"+self.model_name_task+";",
-                    "\t\t\tPRINT 'Surf 2 area      ',_f2FullHcs"+self.model_name_task+";",
-                    "\t\t\tPRINT 'Geom mult B      ',B.HCS(_m);",
-                    "\t\t\tPRINT 'Coeff. ALM-1     ',ALM.HCS(_m)(1);",
-                    "\t\t\tPRINT 'Coeff. ALM-2     ',ALM.HCS(_m)(2);",
-                    "\t\tENDDO",
-                    "\t\tPRINT ' ';",
-                ]
-            )
 
     def __ch_runtime_diag__(self):
         if len(self.ch) > 0:
-            self.__runtime_diagnostics__.extend([
-                "\t\tPRINT '=== CH DATA "+self.model_name_task+" ===';",
-                "\t\tDO _i=1,"+str(len(self.ch))+";",
-                "\t\t\t_k=_ch"+self.model_name_task+"(_i);",
-                "\t\t\t_n=_chLay"+self.model_name_task+"(_i);",
-                "\t\t\tPRINT ' TAU = ',TAU,'\tDT = ',DT;",
-                "\t\t\tPRINT '- CH',_k,' in model "+self.model_name_task+"',_n;",
-                "\t\t\tPRINT 'Cl','----- P -------','---- VOID -----','---- T1 -------',",
-                "\t\t\t\t'---- DEN1 ------';",
-                "\t\t\t_mCh := 0.; _mCh = 0.;",
-                "\t\t\tDO _j=1,N.CH(_k);",
-                "\t\t\t\t! Расчет массы канала",
-                "\t\t\t\t_mCh = _mCh + ",
-                "\t\t\t\t\tV.CH(_k)(_j)*( VOID.CH(_k)(_j)*DEN.CH(_k)(2,_j) + ",
-                "\t\t\t\t\t(1.-VOID.CH(_k)(_j))*DEN.CH(_k)(1,_j) );",
-                "\t\t\t\tPRINT _j,P.CH(_k)(_j),VOID.CH(_k)(_j),T.CH(_k)(1,_j)-_tOffset,",
-                "\t\t\t\t\tDEN.CH(_k)(1,_j);",
-                "\t\t\tENDDO",
-                "\t\t\tPRINT 'Cl','---- T2 -------','---- DEN2 ------','---- XNG3 -----',",
-                "\t\t\t\t'---- XNG4 -----';",
-                "\t\t\tDO _j=1,N.CH(_k);",
-                "\t\t\t\tPRINT _j,T.CH(_k)(2,_j)-_tOffset,DEN.CH(_k)(2,_j),XNG.CH(_k)(3,_j),",
-                "\t\t\t\t\tXNG.CH(_k)(4,_j);",
-                "\t\t\tENDDO",
-                "\t\t\tPRINT 'Jc','---- CFLw -----','---- CFLs -----';",
-                "\t\t\tDO _j=1,N.CH(_k)+1;",
-                "\t\t\t\tIF(\"($W.CH(_k)(1,_j),1) < -1.e-13 | ",
-                "\t\t\t\t\t\"($W.CH(_k)(1,_j),1) > 1.e-13) THEN",
-                "\t\t\t\t\t_x = DT*W.CH(_k)(1,_j)/DZJ.CH(_k)(_j);",
-                "\t\t\t\tELSE",
-                "\t\t\t\t\t_x = -888.;",
-                "\t\t\t\tENDIF",
-                "\t\t\t\tIF(\"($W.CH(_k)(2,_j),2) < -1e-13 | ",
-                "\t\t\t\t\t\"($W.CH(_k)(2,_j),2) > 1e-13) THEN",
-                "\t\t\t\t\t_y = DT*W.CH(_k)(2,_j)/DZJ.CH(_k)(_j);",
-                "\t\t\t\tELSE",
-                "\t\t\t\t\t_y = -888.;",
-                "\t\t\t\tENDIF",
-                "\t\t\t\tPRINT _j,_x,_y;",
-                "\t\t\tENDDO",
-                "\t\t\tPRINT 'Jc','---- Gwater ---','---- Gsteam ---','---- Gmix -----',",
-                "\t\t\t\t'---- FRWw -----';",
-                "\t\t\tDO _j=1,N.CH(_k)+1;",
-                "\t\t\t\tPRINT _j,\"($W.CH(_k)(1,_j),1),\"($W.CH(_k)(2,_j),2),",
-                "\t\t\t\t\t\"($W.CH(_k)(1,_j),1) + \"($W.CH(_k)(2,_j),2),",
-                "\t\t\t\t\tW.CH(_k)(1,_j)*FRW.CH(_k)(1,_j);",
-                "\t\t\tENDDO",
-                "\t\t\tPRINT 'Jc','---- Wwater ---','---- Wsteam ---','---- MAPJ -----',",
-                "\t\t\t\t'---- FRWs -----';",
-                "\t\t\tDO _j=1,N.CH(_k)+1;",
-                "\t\t\t\tPRINT _j,W.CH(_k)(1,_j),W.CH(_k)(2,_j),MAPJ.CH(_k)(_j),",
-                "\t\t\t\t\t'\t\t\t\t\t\t\t',W.CH(_k)(2,_j)*FRW.CH(_k)(2,_j);",
-                "\t\t\tENDDO",
-                "\t\t\tPRINT '-- Mass CH = ',_mCh;",
-                "\t\tENDDO\t",
-                "\t\tPRINT ' ';"
-            ])
+            self.__runtime_diagnostics__.append("\t\tPRINT '=== CH DATA "+self.model_name_task+" ===';")
+            self.__runtime_diagnostics__.extend(self.__diagnostics_loop__(
+                self.ch, "_ch", "_DiagCalcCH", diagnostics.ch_calculation, " in model "+self.model_name_task
+            ))
 
     def __hcs_runtime_diag__(self):
         if len(self.hcs) > 0:
-            self.__runtime_diagnostics__.extend([
-                "\t\tPRINT '=== HCS DATA "+self.model_name_task+" ===';",
-                "\t\tDO _i=1,"+str(len(self.hcs))+";",
-                "\t\t\t_k=_hcs"+self.model_name_task+"(_i);",
-                "\t\t\t_n=_hcsLay"+self.model_name_task+"(_i);",
-                "\t\t\tPRINT ' TAU = ',TAU,'\tDT = ',DT;",
-                "\t\t\tPRINT '- HCS',_k,' in model "+self.model_name_task+"',_n;",
-                "\t\t\tPRINT 'Cl','----- Tw1 -----','---- Tw2 ------','---- ALW1 -----';",
-                "\t\t\tDO _j=1,N.HCS(_k);",
-                "\t\t\t\tPRINT _j,TW.HCS(_k)(1,_j)-_tOffset,TW.HCS(_k)(2,_j)-_tOffset,",
-                "\t\t\t\t\tALW.HCS(_k)(1,_j);",
-                "\t\t\tENDDO",
-                "\t\t\tPRINT 'Cl','---- ALW2 -----','---- Qw1-1 ----','---- Qw1-2 ----';",
-                "\t\t\t_x = 0.;_y = 0.;  ! Мощности",
-                "\t\t\tDO _j=1,N.HCS(_k);",
-                "\t\t\t\t_x = _x + QW.HCS(_k)(1,_j)+QW.HCS(_k)(2,_j);",
-                "\t\t\t\t_y = _y + QW.HCS(_k)(3,_j)+QW.HCS(_k)(4,_j);",
-                "\t\t\t\tPRINT _j,ALW.HCS(_k)(2,_j),QW.HCS(_k)(1,_j),QW.HCS(_k)(2,_j);",
-                "\t\t\tENDDO",
-                "\t\t\tPRINT 'Cl','---- Qw2-1 ----','---- Qw2-2 ----','---- Mod1 -----';",
-                "\t\t\tDO _j=1,N.HCS(_k);",
-                "\t\t\t\tPRINT _j,QW.HCS(_k)(3,_j),QW.HCS(_k)(4,_j),MOD.HCS(_k)(1,_j);",
-                "\t\t\tENDDO",
-                "\t\t\tPRINT 'Cl','---- QR1 ------','---- QR2 ------','---- Mod2 -----';",
-                "\t\t\tDO _j=1,N.HCS(_k);",
-                "\t\t\t\tPRINT _j,QR.HCS(_k)(1,_j),QR.HCS(_k)(2,_j),MOD.HCS(_k)(2,_j);",
-                "\t\t\tENDDO",
-                "\t\t\tPRINT 'Total power Qw/1, Qw/2:',_x,_y;",
-                "\t\tENDDO",
-                "\t\tPRINT ' ';"
-            ])
+            self.__runtime_diagnostics__.append("\t\tPRINT '=== HCS DATA "+self.model_name_task+" ===';")
+            self.__runtime_diagnostics__.extend(self.__diagnostics_loop__(
+                self.hcs, "_hcs", "_DiagCalcHCS", diagnostics.hcs_calculation, " in model "+self.model_name_task
+            ))
 
     def __set__compiletime_diagnostics__(self):
 
@@ -624,15 +532,10 @@ class Model:
 
         self.__runtime_diagnostics__.append("\tENDIF")
 
-    def __set_diagnostics__(self):
-        self.__sets__.append("SET "+"_Monitor"+self.model_name_task+";")
-
-        self.__diagnostics__ = [            
-            "EVENT _Monitor"+self.model_name_task+"(_dt"+self.model_name_task+")",
-            "\treplace = 1;",
-            "\tturn_on = 1;"
-        ]
-
+    def __group_elements__(self):
+        """
+        Сгруппировать включенные элементы модели, для которых строится диагностика (CH, HCS, LR)
+        """
         self.ch = []
         self.hcs = []
         self.lr = []
@@ -644,6 +547,15 @@ class Model:
             if el.el_type() == "LR":
                 self.lr.append(el)
 
+    def __set_diagnostics__(self):
+        self.__diagnostics__ = [            
+            "EVENT _Monitor"+self.model_name_task+"(_dt"+self.model_name_task+")",
+            "\treplace = 1;",
+            "\tturn_on = 1;"
+        ]
+
+        self.__group_elements__()
+
         self.__set__compiletime_diagnostics__()
 
         self.__diagnostics__.extend(self.__compiletime_diagnostics__)
@@ -655,12 +567,167 @@ class Model:
         self.__diagnostics__.extend(["END"])
 
 
+    def __set_elements__(self):
+        """
+        Сгенерировать блоки CALLs и DATAs модели
+        """
+        self.__calls__ = []
+        self.__data__ = []
+        for el in self.elements:
+            el.refresh()
+            self.__calls__.append("CALL "+el.name()+";")
+            self.__data__.extend(el.__data__)
+
+        self.__calls__.insert(0, "!!bb CALLs "+self.model_name_task)
+        self.__calls__.append("!!eb CALLs "+self.model_name_task)
+
+        self.__data__.insert(0, "!!bb DATAs "+self.model_name_task)
+        self.__data__.append("!!eb DATAs "+self.model_name_task)
+
+    def __set_materials__(self):
+        """
+        Собрать материалы включенных HCS и таблицы от времени граничных условий модели 
+        (без повторов, в порядке появления)
+        """
+        self.__materials__ = []
+        self.__tables__ = []
+        seen = set()
+        for el in self.elements:
+            if el.el_type() == "HCS":
+                for mat in el.MAT:
+                    if not id(mat) in seen:
+                        seen.add(id(mat))
+                        self.__materials__.append(mat)
+            elif el.el_type() in TABLE_ELEMENTS:
+                for table in element_tables(el):
+                    if not id(table) in seen:
+                        seen.add(id(table))
+                        self.__tables__.append(table)
+
+    def __set_procedures__(self):
+        """
+        Сгенерировать блоки SETs, EVENTs, OUTPUTs и вызов монитора модели
+        """
+        self.__sets__ = []
+        self.__monitors__ = []
+        self.__events__ = []
+        self.__outputs__ = []
+
+        if len(self.sensors)>0:
+            self.__outputs__.append("\t,"+"_sens_"+self.model_name_task)
+        if not self.mon_per is None:
+            self.__monitors__.append("\tCALL _Monitor"+self.model_name_task+"("+str(self.mon_per)+");")
+        else:
+            self.__monitors__.append("\tCALL _Monitor"+self.model_name_task+"(_monPer);")
+
+        self.__sets__.append("SET "+"_Monitor"+self.model_name_task+";")
+        self.__sets__.insert(0, "!!bb SETs "+self.model_name_task)
+
+        for e in self.events:
+            if e.is_enabled():
+                e.rebuild()
+                self.__events__.extend(e.task_layout)
+                self.__sets__.append("SET "+e.task_name+";")
+
+        self.__events__.insert(0, "!!bb EVENTs "+self.model_name_task)
+        self.__events__.append("!!eb EVENTs "+self.model_name_task)
+
+        self.__sets__.append("!!eb SETs "+self.model_name_task)
+
+    def __cached__(
+            self, part: str, key: tuple, build, attributes: tuple, 
+            content = None, persistent: tuple = (), derive = None
+        ) -> bool:
+        """
+        Восстановить фрагмент kordat модели из кэша или перестроить его, если изменились входные данные
+
+        Arguments
+        ----------
+        part : str
+            Имя фрагмента
+
+        key : tuple
+            Входные данные фрагмента
+
+        build : Callable
+            Метод, строящий фрагмент
+
+        attributes : tuple
+            Атрибуты модели, которые заполняет метод build
+
+        content : Callable (optional)
+            Функция, возвращающая хэш содержимого входных данных фрагмента. Если задана и активен кэш построения 
+            (см. BuildCache), фрагмент ищется в кэше построения, а фрагмент из памяти модели сохраняется 
+            в кэш построения (один раз для каждого кэша)
+
+        persistent : tuple (optional)
+            Атрибуты (списки строк), которые хранятся в кэше построения
+
+        derive : Callable (optional)
+            Метод, заполняющий остальные атрибуты фрагмента при восстановлении из кэша построения
+
+        Returns
+        ----------
+        rebuilt : bool
+            True, если фрагмент был перестроен
+        """
+        profiler = active_profiler()
+        cache = None if content is None else active_build_cache()
+        cached = self.__fragments__.get(part)
+        if cached is not None and cached[0] == key:
+            for a, value in zip(attributes, cached[1]):
+                setattr(self, a, value)
+            # fragment could be built before the build cache was enabled
+            if not cache is None and not cache.__root__ in cached[2]:
+                content_key = content()
+                if not cache.contains("model-"+part, content_key):
+                    cache.put("model-"+part, content_key, [getattr(self, a) for a in persistent])
+                cached[2].add(cache.__root__)
+            if not profiler is None:
+                profiler.record(self.model_name_task, part, cached=True)
+            return False
+
+        if not profiler is None:
+            start = time.perf_counter()
+
+        built = True
+        # build caches, which contain the fragment
+        stored_in = set()
+        if cache is None:
+            build()
+        else:
+            content_key = content()
+            stored = cache.get("model-"+part, content_key)
+            if stored is None:
+                build()
+                cache.put("model-"+part, content_key, [getattr(self, a) for a in persistent])
+            else:
+                built = False
+                for a, value in zip(persistent, stored):
+                    setattr(self, a, value)
+                if not derive is None:
+                    derive()
+            stored_in.add(cache.__root__)
+
+        self.__fragments__[part] = (key, tuple(getattr(self, a) for a in attributes), stored_in)
+
+        if not profiler is None:
+            profiler.record(
+                self.model_name_task, part, time.perf_counter()-start,
+                sum(len(getattr(self, a)) for a in FRAGMENT_LINES.get(part, ())), not built
+            )
+        return True
+
     def rebuild(
             self,
             **kwargs
         ):
         """
-        Перестроить зону задания модели (блоки DATAs, CALLs, LAYOUT, OUTPUTs, а также сенсоры и процедуры)
+        Задать входные данные зоны задания модели (блоки DATAs, CALLs, LAYOUT, OUTPUTs, а также сенсоры и процедуры)
+
+        Элементы модели нумеруются (нумерация модели), фрагменты kordat не строятся: они строятся при обращении 
+        к разделам kordat задачи (см. render, Sections). Перестраиваются только те фрагменты, входные данные 
+        которых изменились с момента предыдущего построения (см. Generation), остальные берутся из кэша модели
 
         Arguments
         ----------
@@ -684,120 +751,174 @@ class Model:
 
         """
         
-        elements = kwargs['elements']
-        model_layout = kwargs['model_layout']
-        boundary_layout = kwargs['boundary_layout']
-        submodel_links_layout = kwargs['submodel_links_layout']
-        sensors = kwargs['sensors']
-        submodels = kwargs['submodels']
-        events = kwargs['events']
-
-        self.events = events
-        
-        
-        self.submodels = submodels
+        self.all_elements = list(kwargs['elements'])
+        self.model_layout = kwargs['model_layout']
+        self.boundary_layout = kwargs['boundary_layout']
+        self.submodel_links_layout = kwargs['submodel_links_layout']
+        self.sensors = kwargs['sensors']
+        self.submodels = kwargs['submodels']
+        self.events = kwargs['events']
+
+        self.render(parts=())
+
+    def render(self, build: int = None, parts: tuple = None):
+        """
+        Перестроить зону задания модели и ее подмоделей по текущим входным данным
+
+        За один проход построения нумерация элементов модели и каждый фрагмент kordat (см. MODEL_PARTS) 
+        перестраиваются ровно один раз. Фрагменты, не перечисленные в parts, строятся при следующих вызовах 
+        render с тем же проходом (например, при обращении к разделу kordat задачи, см. Sections)
+
+        Arguments
+        ----------
+        build : int (optional)
+            Номер прохода построения. Если не задан, начинается новый проход
+
+        parts : tuple (optional)
+            Перестраиваемые фрагменты (см. MODEL_PARTS). По умолчанию - все фрагменты
+        """
+        if build is None:
+            build = next(Model._builds)
+        if self.__build__ != build:
+            self.__build__ = build
+            self.__number__(build)
+
+        for part in (MODEL_PARTS if parts is None else parts):
+            self.__render_part__(part)
+
+    def __number__(self, build: int):
+        """
+        Пронумеровать элементы модели и ее подмоделей (нумерация модели) в начале прохода построения
+        """
+        # parts of kordat, which are rendered in the current pass
+        self.__rendered__ = set()
+
         self.elements = []
-        self.all_elements = []
 
-        self.__calls__ = []
-        self.__data__ = []
-        self.__sets__ = []
-        self.__monitors__ = []
-        self.__events__ = []
-        self.__outputs__ = []
+        i_el = {}
+        for el in self.all_elements:
+            el.id_model = i_el.get(el.el_type(), 1)
+            i_el[el.el_type()] = el.id_model+1
+            if el.is_enabled():
+                self.elements.append(el)
+                el.__model_name__ = self.model_name_task
 
-        if len([elements]) > 0:
-            i_ch = 1
-            i_hcs = 1
-            i_lr = 1
-            i_bv = 1
-            i_sm = 1
-            i_bh = 1
-            i_blj = 1
-            for el in elements:
-                self.all_elements.append(el)
-                if (el.el_type() == "HCS"):
-                    el.id_model = i_hcs
-                    i_hcs += 1
-                if (el.el_type() == "CH"):
-                    el.id_model = i_ch
-                    i_ch += 1
-                if (el.el_type() == "LR"):
-                    el.id_model = i_lr
-                    i_lr += 1
-                if (el.el_type() == "BVOL_T"):
-                    el.id_model = i_bv
-                    i_bv += 1
-                if (el.el_type() == "SMASS_T"):
-                    el.id_model = i_sm
-                    i_sm += 1
-                if (el.el_type() == "BHEAT"):
-                    el.id_model = i_bh
-                    i_bh += 1
-                if (el.el_type() == "BLJUN"):
-                    el.id_model = i_blj
-                    i_blj += 1
-                if el.is_enabled():
-                    self.elements.append(el)
-
-                    el.__model_name__ = self.model_name_task
-
-                    self.__calls__.append("CALL "+el.name()+";")
-                    self.__data__.extend(el.__data__)
+        for i, sens in enumerate(self.sensors):
+            sens.__id__ = i+1
 
         self.elements_submodels = self.elements
+        for m in self.submodels:
+            m.render(build, ())
+            self.elements_submodels = m.elements_submodels + self.elements_submodels
 
-        self.__calls__.insert(0, "!!bb CALLs "+self.model_name_task)
-        self.__calls__.append("!!eb CALLs "+self.model_name_task)
+    def __render_part__(self, part: str):
+        """
+        Перестроить фрагмент kordat модели и ее подмоделей (один раз за проход построения)
+        """
+        if part in self.__rendered__:
+            return
+        self.__rendered__.add(part)
 
-        self.__data__.insert(0, "!!bb DATAs "+self.model_name_task)
-        self.__data__.append("!!eb DATAs "+self.model_name_task)
+        for m in self.submodels:
+            m.__render_part__(part)
 
-        self.__layout__(model_layout, boundary_layout, submodel_links_layout)
+        getattr(self, "__render_"+part+"__")()
 
-        self.__set_sensors__(sensors)
-        if len(sensors)>0:
-            self.__outputs__.append("\t,"+"_sens_"+self.model_name_task)
-        if not self.mon_per is None:
-            self.__monitors__.append("\tCALL _Monitor"+self.model_name_task+"("+str(self.mon_per)+");")
-        else:
-            self.__monitors__.append("\tCALL _Monitor"+self.model_name_task+"(_monPer);")
+    def __names__(self) -> tuple:
+        """
+        Входные данные фрагментов, зависящих от имен элементов модели
+        """
+        return tuple((el, el.name(), el.id_model, el.is_enabled()) for el in self.all_elements)
 
-        self.__set_diagnostics__()
-        self.__sets__.insert(0, "!!bb SETs "+self.model_name_task)
+    def __content_names__(self) -> list:
+        """
+        Содержимое имен элементов модели (см. BuildCache)
+        """
+        return [(el.el_type(), el.id_model, el.name(), el.is_enabled()) for el in self.all_elements]
+
+    def __elements_state__(self) -> tuple:
+        """
+        Входные данные фрагментов, зависящих от содержимого элементов модели
+        """
+        return tuple((el, el.generation(), el.is_enabled()) for el in self.all_elements)
+
+    def __render_elements__(self) -> bool:
+        return self.__cached__(
+            "elements",
+            (self.model_name_task, self.__elements_state__()),
+            self.__set_elements__,
+            ("__calls__", "__data__"),
+            lambda: fingerprint(
+                self.model_name_task, [(el.name(), el.fingerprint()) for el in self.elements], render_settings()
+            ),
+            ("__calls__", "__data__")
+        )
 
-        if len(events) > 0:
-            for e in events:
-                if e.is_enabled():
-                    self.__events__.extend(e.task_layout)
-                    self.__sets__.append("SET "+e.task_name+";")
+    def __render_layout__(self) -> bool:
+        return self.__cached__(
+            "layout",
+            (
+                self.model_name_task, self.__names__(), 
+                tuple((m.model_name_task, m.__names__()) for m in self.submodels), 
+                tuple(self.model_layout), tuple(self.boundary_layout), tuple(self.submodel_links_layout)
+            ),
+            lambda: self.__layout__(self.model_layout, self.boundary_layout, self.submodel_links_layout),
+            ("task_layout",),
+            lambda: fingerprint(
+                self.model_name_task, self.__content_names__(), 
+                [(m.model_name_task, m.__content_names__()) for m in self.submodels],
+                self.model_layout, self.boundary_layout, self.submodel_links_layout
+            ),
+            ("task_layout",)
+        )
 
-        self.__events__.insert(0, "!!bb EVENTs "+self.model_name_task)
-        self.__events__.append("!!eb EVENTs "+self.model_name_task)
+    def __render_sensors__(self) -> bool:
+        return self.__cached__(
+            "sensors",
+            (
+                self.model_name_task, self.__names__(), tuple((sens, sens.generation()) for sens in self.sensors)
+            ),
+            lambda: self.__set_sensors__(self.sensors),
+            ("active_sensors", "task_sensors_eval", "task_sensors_def", "__sensors__", "__sens_eval__"),
+            lambda: fingerprint(
+                self.model_name_task, self.__content_names__(), 
+                [(sens.name(), sens.expression, sens.is_enabled()) for sens in self.sensors]
+            ),
+            ("task_sensors_eval", "task_sensors_def", "__sensors__", "__sens_eval__"),
+            lambda: setattr(self, "active_sensors", [sens for sens in self.sensors if sens.is_enabled()])
+        )
 
-        self.__sets__.append("!!eb SETs "+self.model_name_task)
+    def __render_diagnostics__(self) -> bool:
+        diag_elements = tuple(
+            (el, el.id, el.id_model, el.N if el.el_type() in ("CH", "HCS") else None) for el in self.elements
+        )
+        return self.__cached__(
+            "diagnostics",
+            (self.model_name_task, diag_elements, diagnostics.SHARED_PROCEDURES),
+            self.__set_diagnostics__,
+            ("ch", "hcs", "lr", "__diagnostics__", "__compiletime_diagnostics__", "__runtime_diagnostics__"),
+            lambda: fingerprint(
+                self.model_name_task, [(d[0].el_type(),)+d[1:] for d in diag_elements], diagnostics.SHARED_PROCEDURES
+            ),
+            ("__diagnostics__", "__compiletime_diagnostics__", "__runtime_diagnostics__"),
+            self.__group_elements__
+        )
 
-        if len(submodels) > 0:
-            for m in submodels:
-                m.rebuild(
-                    elements=copy.copy(m.all_elements), 
-                    model_layout=copy.copy(m.model_layout), 
-                    boundary_layout=copy.copy(m.boundary_layout), 
-                    sensors=copy.copy(m.sensors), 
-                    submodels=copy.copy(m.submodels),
-                    submodel_links_layout=copy.copy(m.submodel_links_layout),
-                    events=copy.copy(m.events)
-                )
-                self.__calls__ = m.__calls__ + self.__calls__
-                self.__data__ = m.__data__ + self.__data__
-                self.__sets__ = m.__sets__ + self.__sets__
-                self.__diagnostics__ = m.__diagnostics__ + self.__diagnostics__
-                self.elements_submodels = m.elements_submodels + self.elements_submodels
-                self.task_layout = m.task_layout + self.task_layout
-                self.task_sensors_def = m.task_sensors_def + self.task_sensors_def
-                self.task_sensors_eval = m.task_sensors_eval + self.task_sensors_eval
-                self.__outputs__ = m.__outputs__ + self.__outputs__
-                self.__monitors__ = m.__monitors__ + self.__monitors__
-                self.__events__ = m.__events__ + self.__events__
-
-    
\ No newline at end of file
+    def __render_procedures__(self) -> bool:
+        return self.__cached__(
+            "procedures",
+            (
+                self.model_name_task, self.mon_per, len(self.sensors) > 0,
+                tuple((e, e.__state__()) for e in self.events)
+            ),
+            self.__set_procedures__,
+            ("__sets__", "__monitors__", "__events__", "__outputs__")
+        )
+
+    def __render_materials__(self) -> bool:
+        return self.__cached__(
+            "materials",
+            (self.__elements_state__(),),
+            self.__set_materials__,
+            ("__materials__", "__tables__")
+        )
@@ -0,0 +1,116 @@
+import threading
+from itertools import count
+
+# active numbering scopes of the current thread
+_local = threading.local()
+
+
+def _scopes() -> list:
+    if not hasattr(_local, "scopes"):
+        _local.scopes = []
+    return _local.scopes
+
+
+def next_id(kind: str, ids: count) -> int:
+    """
+    ID нового объекта
+
+    Arguments
+    ----------
+    kind : str
+        Тип объекта (например, "CH" или "EVENT")
+
+    ids : count
+        Счетчик класса, который используется вне области нумерации
+
+    Returns
+    ----------
+    id : int
+        ID из активной области нумерации текущего потока (если она есть) или из счетчика класса
+    """
+    scopes = _scopes()
+    if len(scopes) > 0:
+        return scopes[-1].next(kind)
+    return next(ids)
+
+
+class NumberingScope:
+    """
+    Область нумерации элементов и событий
+    =====
+
+    Внутри блока with элементы и события, созданные в текущем потоке, нумеруются счетчиками области,
+    а не общими счетчиками классов. Области разных потоков независимы.
+
+    Область, переданная в Task (аргумент numbering), перенумеровывает все элементы и события задачи
+    при каждом построении kordat, поэтому нумерация не зависит от порядка создания моделей
+
+    Methods
+    ----------
+    next -> int
+        Возвращает следующий ID объекта заданного типа
+
+    reset
+        Сбрасывает счетчики области
+
+    number
+        Перенумеровывает элементы и события моделей (нумерация задачи)
+    """
+    def __init__(self):
+        self.__counters__ = {}
+
+    def __enter__(self):
+        _scopes().append(self)
+        return self
+
+    def __exit__(self, *args):
+        _scopes().pop()
+
+    def next(self, kind: str) -> int:
+        """
+        Следующий ID объекта типа kind
+        """
+        if kind not in self.__counters__:
+            self.__counters__[kind] = count(1)
+        return next(self.__counters__[kind])
+
+    def reset(self):
+        """
+        Сбросить счетчики области
+        """
+        self.__counters__ = {}
+
+    def number(self, models: list):
+        """
+        Перенумеровать элементы и события моделей
+
+        Элементы нумеруются в порядке их следования в kordat (подмодели, затем элементы модели),
+        после чего перестраиваются события, номер которых изменился (как и в Element.renumber, 
+        неизмененные номера не присваиваются заново)
+
+        Arguments
+        ----------
+        models : List[Model]
+            Модели задачи
+        """
+        self.reset()
+        events = []
+        visited = set()
+        for m in models:
+            self.__number_model__(m, events, visited)
+        for e in events:
+            event_id = self.next("EVENT")
+            if e.id != event_id:
+                e.id = event_id
+                e.rebuild()
+
+    def __number_model__(self, model, events: list, visited: set):
+        if id(model) in visited:
+            return
+        visited.add(id(model))
+
+        for sm in reversed(model.submodels):
+            self.__number_model__(sm, events, visited)
+        for el in model.all_elements:
+            el.renumber(self.next(el.el_type()))
+        events.extend(model.events)
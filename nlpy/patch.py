@@ -0,0 +1,298 @@
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import locale
+from typing import Iterable, Iterator, List, Tuple
+
+from .service import WRITE_BUFFER
+
+# reserved space after each rewritten section (fraction of its size), which allows in-place patching of grown sections
+PATCH_SLACK = 0.1
+
+# starts of kordat sections: block markers and DATA blocks of elements
+_MARKERS = ("!!bb ", "!!eb ", "DATA ")
+
+
+def _padding(n: int, newline: bytes) -> bytes:
+    """
+    Строка-заполнитель длиной n байт (комментарий "!" и пробелы)
+    """
+    if n == 0:
+        return b""
+    return b"!"+b" "*(n-1-len(newline))+newline
+
+
+def _fits(length: int, capacity: int, newline: bytes) -> bool:
+    """
+    Помещается ли раздел длиной length байт в место размером capacity байт
+    """
+    gap = capacity-length
+    return gap == 0 or gap >= 1+len(newline)
+
+
+def _sections(lines: Iterable[str], newline: str, encoding: str) -> Iterator[Tuple[str, bytes]]:
+    """
+    Разбить строки kordat на разделы по маркерам !!bb/!!eb и блокам DATA элементов
+
+    Returns
+    ----------
+    sections : Iterator[Tuple[str, bytes]]
+        Маркер раздела (первая строка раздела, "" для строк до первого маркера) и текст раздела
+    """
+    key = ""
+    section = []
+    for line in lines:
+        if line.startswith(_MARKERS):
+            if len(section) > 0:
+                yield key, (newline.join(section)+newline).encode(encoding)
+            key = line
+            section = []
+        section.append(line)
+    if len(section) > 0:
+        yield key, (newline.join(section)+newline).encode(encoding)
+
+
+def _hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def index_kordat(path: str, encoding: str = None) -> List[list]:
+    """
+    Проиндексировать разделы файла kordat
+
+    Разделы начинаются строками-маркерами !!bb/!!eb и строками DATA элементов. Строки-заполнители ("!" и пробелы) в конце раздела
+    считаются резервом места раздела
+
+    Arguments
+    ----------
+    path : str
+        Полный путь к файлу
+
+    encoding : str (optional)
+        Кодировка файла. По умолчанию - кодировка open()
+
+    Returns
+    ----------
+    sections : List[list]
+        Для каждого раздела: маркер, смещение [байт], длина текста [байт], размер места с резервом [байт], хэш текста
+    """
+    if encoding is None:
+        encoding = locale.getpreferredencoding(False)
+    markers = tuple(m.encode(encoding) for m in _MARKERS)
+
+    sections = []
+    key = ""
+    start = 0
+    length = 0
+    padding = []
+    h = hashlib.blake2b(digest_size=16)
+    offset = 0
+    with open(path, "rb", buffering=WRITE_BUFFER) as f:
+        for line in f:
+            if line.startswith(markers):
+                if offset > 0:
+                    sections.append([key, start, length, offset-start, h.hexdigest()])
+                key = line.rstrip(b"\r\n").decode(encoding)
+                start = offset
+                length = 0
+                padding = []
+                h = hashlib.blake2b(digest_size=16)
+            if line.rstrip(b"\r\n").rstrip(b" ") == b"!":
+                padding.append(line)
+            else:
+                for p in padding:
+                    h.update(p)
+                    length += len(p)
+                padding = []
+                h.update(line)
+                length += len(line)
+            offset += len(line)
+    if offset > 0:
+        sections.append([key, start, length, offset-start, h.hexdigest()])
+    return sections
+
+
+def _index_path(path: str) -> str:
+    return path+".idx"
+
+
+def _load_index(path: str, encoding: str) -> List[list]:
+    """
+    Индекс разделов файла: из файла индекса, если он соответствует файлу kordat, иначе - по содержимому файла
+    """
+    if not os.path.exists(path):
+        return []
+    stat = os.stat(path)
+    try:
+        with open(_index_path(path), encoding="utf-8") as f:
+            index = json.load(f)
+        if index["size"] == stat.st_size and index["mtime_ns"] == stat.st_mtime_ns and index["encoding"] == encoding:
+            return index["sections"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return index_kordat(path, encoding)
+
+
+def _save_index(path: str, encoding: str, sections: List[list]):
+    stat = os.stat(path)
+    try:
+        with open(_index_path(path), "w", encoding="utf-8") as f:
+            json.dump(
+                {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "encoding": encoding, "sections": sections}, f
+            )
+    except OSError:
+        pass
+
+
+def _place(window: list, sections: List[list], newline: bytes) -> Tuple[int, bytes]:
+    """
+    Разместить измененные разделы на месте старых разделов
+
+    Returns
+    ----------
+    offset : int
+        Смещение места [байт]
+
+    data : bytes
+        Текст разделов с заполнителем до размера места
+    """
+    start, capacity, length, items = window
+    offset = start
+    for key, data, digest in items[:-1]:
+        sections.append([key, offset, len(data), len(data), digest])
+        offset += len(data)
+    key, data, digest = items[-1]
+    sections.append([key, offset, len(data), start+capacity-offset, digest])
+    return start, b"".join(d for _, d, _ in items)+_padding(capacity-length, newline)
+
+
+def _append(f, offset: int, item: tuple, sections: List[list], slack: float, newline: bytes) -> int:
+    """
+    Дописать раздел с резервом места в файл f
+
+    Returns
+    ----------
+    size : int
+        Размер записанного места [байт]
+    """
+    key, data, digest = item
+    reserve = int(len(data)*slack)
+    if reserve > 0 and reserve < 1+len(newline):
+        reserve = 1+len(newline)
+    f.write(data)
+    f.write(_padding(reserve, newline))
+    sections.append([key, offset, len(data), len(data)+reserve, digest])
+    return len(data)+reserve
+
+
+def patch_kordat(lines: Iterable[str], path: str, slack: float = None, encoding: str = None) -> dict:
+    """
+    Записать kordat, перезаписав в существующем файле только измененные разделы
+
+    Существующий файл индексируется по маркерам разделов !!bb/!!eb и блокам DATA элементов (индекс сохраняется в файле ${path}.idx),
+    хэши разделов сравниваются с новыми. Измененный раздел записывается на свое место, если помещается в него
+    (с учетом резерва) или на место следующих за ним разделов, иначе файл перезаписывается начиная с этого раздела. После каждого записанного раздела
+    резервируется место (строка-комментарий из "!" и пробелов) размером slack от размера раздела
+
+    Arguments
+    ----------
+    lines : Iterable[str]
+        Строки kordat (без символа перевода строки)
+
+    path : str
+        Полный путь к файлу
+
+    slack : float (optional)
+        Резерв места после записанных разделов (доля от размера раздела). По умолчанию PATCH_SLACK
+
+    encoding : str (optional)
+        Кодировка файла. По умолчанию - кодировка open()
+
+    Returns
+    ----------
+    report : dict
+        sections - количество разделов, rewritten - количество записанных разделов, written - количество записанных байт
+    """
+    if slack is None:
+        slack = PATCH_SLACK
+    if encoding is None:
+        encoding = locale.getpreferredencoding(False)
+    newline = os.linesep.encode(encoding)
+
+    old = _load_index(path, encoding)
+
+    sections = []
+    inplace = []
+    rewritten = 0
+    # changed sections, which are written to the place of old sections: start, capacity, length, (key, data, digest)
+    window = None
+    tail = None
+    tail_start = 0
+    tail_length = 0
+    for i, (key, data) in enumerate(_sections(lines, os.linesep, encoding)):
+        digest = _hash(data)
+        if tail is None:
+            o = old[i] if i < len(old) else None
+            if not o is None and o[0] == key:
+                if window is None:
+                    if o[4] == digest:
+                        sections.append(o)
+                        continue
+                    window = [o[1], 0, 0, []]
+                # grown section takes the place of the following sections
+                window[1] += o[3]
+                window[2] += len(data)
+                window[3].append((key, data, digest))
+                if _fits(window[2], window[1], newline):
+                    inplace.append(_place(window, sections, newline))
+                    rewritten += len(window[3])
+                    window = None
+                continue
+
+            if not window is None:
+                tail_start = window[0]
+            elif not o is None:
+                tail_start = o[1]
+            elif len(old) > 0:
+                tail_start = old[-1][1]+old[-1][3]
+            tail = tempfile.TemporaryFile()
+            if not window is None:
+                for w in window[3]:
+                    tail_length += _append(tail, tail_start+tail_length, w, sections, slack, newline)
+                    rewritten += 1
+                window = None
+
+        tail_length += _append(tail, tail_start+tail_length, (key, data, digest), sections, slack, newline)
+        rewritten += 1
+
+    if tail is None and (not window is None or len(sections) < len(old)):
+        tail_start = window[0] if not window is None else old[len(sections)][1]
+        tail = tempfile.TemporaryFile()
+        if not window is None:
+            for w in window[3]:
+                tail_length += _append(tail, tail_start+tail_length, w, sections, slack, newline)
+                rewritten += 1
+
+    written = sum(len(data) for _, data in inplace)
+    mode = "r+b" if os.path.exists(path) else "w+b"
+    with open(path, mode, buffering=WRITE_BUFFER) as f:
+        for offset, data in inplace:
+            f.seek(offset)
+            f.write(data)
+        if not tail is None:
+            tail.seek(0)
+            f.seek(tail_start)
+            shutil.copyfileobj(tail, f, WRITE_BUFFER)
+            f.truncate(tail_start+tail_length)
+            tail.close()
+            written += tail_length
+
+    _save_index(path, encoding, sections)
+
+    return {
+        "sections": len(sections),
+        "rewritten": rewritten,
+        "written": written
+    }
@@ -0,0 +1,164 @@
+import csv
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Union
+
+# active profilers of the current thread
+_local = threading.local()
+
+# columns of the profile table
+COLUMNS = ("model", "phase", "calls", "cached", "seconds", "lines")
+
+
+def _profilers() -> list:
+    if not hasattr(_local, "profilers"):
+        _local.profilers = []
+    return _local.profilers
+
+
+def active_profiler() -> Union["Profiler", None]:
+    """
+    Активный профилировщик текущего потока (None, если профилирование выключено)
+    """
+    profilers = _profilers()
+    if len(profilers) > 0:
+        return profilers[-1]
+    return None
+
+
+class Profiler:
+    """
+    Профилировщик построения kordat
+    =====
+
+    Внутри блока with для каждой модели и этапа построения записываются количество построений (calls),
+    количество восстановлений из кэша (cached), время построения [с] и количество строк kordat.
+
+    Этапы модели (фрагменты Model.render): elements (блоки CALLs и DATAs), layout (__layout__), 
+    sensors (__set_sensors__), diagnostics (__set_diagnostics__), procedures (SETs, EVENTs, OUTPUTs), 
+    materials (материалы и таблицы элементов). Этап задачи (модель - имя задачи): materials (сбор материалов).
+    Для материалов строками считается количество материалов задачи. Вне блока with профилирование не выполняется.
+    Task.rebuild собирает только материалы: фрагменты моделей строятся при обращении к разделам kordat 
+    (см. Sections), поэтому в блоке with записывается kordat (или вызываются task.rebuild() и task.kordat)
+
+    Пример:
+    with Profiler() as profiler:
+        task.write_kordat("kordat")
+    profiler.write_csv("profile.csv")
+
+    Methods
+    ----------
+    record
+        Добавляет измерение этапа
+
+    phase
+        Контекстный менеджер, измеряющий время этапа
+
+    rows -> List[dict]
+        Возвращает таблицу измерений
+
+    totals -> Dict[str, dict]
+        Возвращает суммарные измерения по этапам
+
+    write_csv
+        Записывает таблицу измерений в файл CSV
+
+    clear
+        Удаляет измерения
+    """
+    def __init__(self):
+        self.__records__ = {}
+
+    def __enter__(self):
+        _profilers().append(self)
+        return self
+
+    def __exit__(self, *args):
+        _profilers().pop()
+
+    def record(self, model: str, phase: str, seconds: float = 0., lines: int = 0, cached: bool = False):
+        """
+        Добавить измерение этапа phase модели model
+
+        Arguments
+        ----------
+        model : str
+            Имя модели (в нумерации задачи)
+
+        phase : str
+            Этап построения
+
+        seconds : float
+            Время построения [с]
+
+        lines : int
+            Количество построенных строк kordat
+
+        cached : bool
+            True, если фрагмент восстановлен из кэша (не строился)
+        """
+        r = self.__records__.get((model, phase))
+        if r is None:
+            r = self.__records__[(model, phase)] = [0, 0, 0., 0]
+        if cached:
+            r[1] += 1
+        else:
+            r[0] += 1
+            r[2] += seconds
+            r[3] += lines
+
+    @contextmanager
+    def phase(self, model: str, phase: str):
+        """
+        Измерить время этапа phase модели model (количество строк задается атрибутом lines результата)
+
+        Пример:
+        with profiler.phase("Tube1", "custom") as p:
+            lines = build()
+            p["lines"] = len(lines)
+        """
+        out = {"lines": 0}
+        start = time.perf_counter()
+        yield out
+        self.record(model, phase, time.perf_counter()-start, out["lines"])
+
+    def rows(self) -> List[dict]:
+        """
+        Таблица измерений: строка на каждую пару модель - этап (столбцы COLUMNS)
+        """
+        return [
+            dict(zip(COLUMNS, (model, phase, r[0], r[1], r[2], r[3])))
+            for (model, phase), r in self.__records__.items()
+        ]
+
+    def totals(self) -> Dict[str, dict]:
+        """
+        Суммарные измерения по этапам (по всем моделям)
+        """
+        out = {}
+        for row in self.rows():
+            t = out.setdefault(row["phase"], {"calls": 0, "cached": 0, "seconds": 0., "lines": 0})
+            for c in ("calls", "cached", "seconds", "lines"):
+                t[c] += row[c]
+        return out
+
+    def write_csv(self, path: str):
+        """
+        Записать таблицу измерений в файл CSV
+
+        Arguments
+        ----------
+        path : str
+            Полный путь к файлу
+        """
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(self.rows())
+
+    def clear(self):
+        """
+        Удалить измерения
+        """
+        self.__records__ = {}
@@ -0,0 +1,608 @@
+import re
+from typing import Dict, Iterable, List, Tuple, Union
+
+import numpy as np
+
+from .materials.material import Material
+from .tables import TimeTable, TABLE_PREFIX
+from .elements import Element, CH, HCS, LR, BVOL_T, SMASS_T, BHEAT, BLJUN
+
+# left part of assignment: variable name and optional index in brackets
+_VARIABLE = re.compile(r"^\s*(\w+)\s*(?:\((.*)\))?\s*$")
+
+# element name: type and number
+_ELEMENT_NAME = re.compile(r"^([A-Z][A-Z_]*?)(\d+)$")
+
+# characters of real numbers, which are absent in integers
+_REAL = frozenset(".eEnNiI")
+
+# parser states
+_HEAD, _MAIN, _LAYOUT, _BODY, _DATA, _BLOCK = range(6)
+
+
+def _strip_comment(line: str) -> str:
+    """
+    Удалить комментарий (! и текст до конца строки) вне строковых констант
+    """
+    if "'" not in line:
+        return line[:line.index("!")]
+    quoted = False
+    for i, c in enumerate(line):
+        if c == "'":
+            quoted = not quoted
+        elif c == "!" and not quoted:
+            return line[:i]
+    return line
+
+
+def _scalar(text: str) -> Union[int, float, str]:
+    """
+    Значение скалярной переменной: целое, вещественное число или текст выражения
+    """
+    text = text.strip()
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def _values(text: str) -> Union[np.ndarray, List[str], str]:
+    """
+    Значения массива: массив numpy (целый или вещественный), список ссылок ($name) или текст выражения
+    """
+    if "$" in text:
+        return [t.strip().lstrip("$") for t in text.split(",")]
+    dtype = float if not _REAL.isdisjoint(text) else int
+    try:
+        return np.array(text.split(","), dtype=dtype)
+    except ValueError:
+        return text.strip()
+
+
+def _bounds(index: str) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Разобрать индекс переменной на постоянные индексы и диапазоны (например, "1,1:N" -> "1", [("1", "N")])
+    """
+    fixed = []
+    ranges = []
+    for part in index.split(","):
+        part = part.strip()
+        if ":" in part:
+            lo, hi = part.split(":", 1)
+            ranges.append((lo.strip(), hi.strip()))
+        else:
+            fixed.append(part)
+    return ",".join(fixed), ranges
+
+
+class Assignments:
+    """
+    Присваивания переменных блока kordat
+    =====
+
+    Скалярные присваивания (S=0.1;) сохраняются как числа (или текст выражения), присваивания диапазонам
+    (PR(1:N)= ...; S(6:25)=0.0053;) собираются в массивы numpy. Постоянные индексы входят в имя переменной:
+    T(1,1:N) -> "T(1)"
+
+    Attributes
+    ----------
+    values : Dict[str, np.ndarray | int | float | str | List[str]]
+        Значения переменных
+    """
+    def __init__(self):
+        self.values = {}
+        self.__pieces__ = {}
+
+    def assign(self, statement: str):
+        """
+        Добавить присваивание (текст без завершающего ";")
+        """
+        i = statement.index("=")
+        lhs = statement[:i].rstrip(":")
+        rhs = statement[i+1:]
+
+        match = _VARIABLE.match(lhs)
+        if match is None:
+            raise ValueError("Некорректное присваивание: "+statement.strip())
+        name, index = match.groups()
+        if index is None:
+            # list of values without index range (e.g. KIND=6,4;)
+            self.values[name] = _values(rhs) if "$" in rhs or "," in rhs else _scalar(rhs)
+            return
+
+        fixed, ranges = _bounds(index)
+        key = name+"("+fixed+")" if fixed != "" else name
+        values = _values(rhs)
+        if len(ranges) == 0:
+            self.values[key] = _scalar(rhs)
+            return
+        if not isinstance(values, np.ndarray):
+            self.values[key] = values
+            return
+
+        # table (1:a,1:b): values are listed by columns
+        if len(ranges) == 2 and all(lo.isdigit() and hi.isdigit() for lo, hi in ranges):
+            rows = int(ranges[0][1])-int(ranges[0][0])+1
+            self.values[key] = values.reshape((-1, rows)).T
+            return
+
+        lo, hi = ranges[-1]
+        lo = int(lo) if lo.isdigit() else 1
+        hi = int(hi) if hi.isdigit() else lo+len(values)-1
+        if len(values) == 1 and hi > lo:
+            values = np.full(hi-lo+1, values[0])
+        self.__pieces__.setdefault(key, []).append((lo, hi, values))
+
+    def close(self):
+        """
+        Собрать массивы из присваиваний диапазонам
+        """
+        for key, pieces in self.__pieces__.items():
+            if len(pieces) == 1 and pieces[0][0] == 1:
+                self.values[key] = pieces[0][2]
+                continue
+            out = np.zeros(max(hi for _, hi, _ in pieces), dtype=np.result_type(*(v for _, _, v in pieces)))
+            for lo, hi, v in pieces:
+                out[lo-1:hi] = v
+            self.values[key] = out
+        self.__pieces__ = {}
+
+
+class DataBlock(Assignments):
+    """
+    Блок DATA элемента
+    =====
+
+    Attributes
+    ----------
+    name : str
+        Имя элемента (например, CH5)
+
+    type : str
+        Тип элемента (например, CH)
+
+    id : int
+        ID элемента
+
+    values : Dict[str, np.ndarray | int | float | str | List[str]]
+        Значения переменных блока (см. Assignments)
+    """
+    def __init__(self, name: str):
+        Assignments.__init__(self)
+        self.name = name
+        match = _ELEMENT_NAME.match(name)
+        if match is None:
+            self.type, self.id = name, 0
+        else:
+            self.type, self.id = match.group(1), int(match.group(2))
+
+
+def _array(value, dtype) -> Union[np.ndarray, int, float]:
+    if isinstance(value, np.ndarray):
+        return value.astype(dtype)
+    return dtype(value)
+
+
+def _table_or_array(value, tables: dict) -> Union[np.ndarray, float, TimeTable]:
+    """
+    Значение параметра граничного условия: таблица от времени по ссылке ($_ttab_name) или массив значений
+    """
+    if not isinstance(value, list):
+        return _array(value, float)
+    name = value[0][len(TABLE_PREFIX):]
+    if tables is None or name not in tables:
+        raise ValueError("Таблица "+name+" не найдена в глобальных переменных")
+    return tables[name]
+
+
+def _ch(v: dict, materials: dict) -> CH:
+    return CH(
+        N=int(v["N"]), S=_array(v["S"], float), PR=_array(v["PR"], float), DZ=_array(v["DZ"], float),
+        DH=_array(v["DH"], float), P=_array(v["P"], float), T=[_array(v["T(1)"], float), _array(v["T(2)"], float)],
+        VOID=_array(v["VOID"], float), TYPE=_array(v["TYPE"], int), ROU=_array(v["ROU"], float)
+    )
+
+
+def _hcs(v: dict, materials: dict) -> HCS:
+    MAT = []
+    for tlam in v["TLAM"]:
+        name = tlam[len("_tlam_"):]
+        if name not in materials:
+            raise ValueError("Материал "+name+" не найден в глобальных переменных")
+        MAT.append(materials[name])
+    return HCS(
+        N=int(v["N"]), KL=int(v["KL"]), K=int(v["K"]), TYPE=v["TYPE"], COOR=v["COOR"],
+        XL=_array(v["XL"], float), X=_array(v["X"], float), MAT=MAT, DFZ=_array(v["DFZ"], float),
+        B=v["B"], NGE=v["NGE"], KIND=np.atleast_1d(v["KIND"])
+    )
+
+
+def _lr(v: dict, materials: dict) -> LR:
+    return LR(CSI1=_array(v["CSI1"], float), CSI2=_array(v["CSI2"], float))
+
+
+def _bvol_t(v: dict, tables: dict) -> BVOL_T:
+    return BVOL_T(
+        P=_table_or_array(v["P"], tables), T=[_table_or_array(v["T(1)"], tables), _table_or_array(v["T(2)"], tables)], 
+        VOID=_table_or_array(v["VOID"], tables)
+    )
+
+
+def _smass_t(v: dict, tables: dict) -> SMASS_T:
+    return SMASS_T(
+        GIN=[_table_or_array(v["GIN(1)"], tables), _table_or_array(v["GIN(2)"], tables)], 
+        GMOUT=_table_or_array(v["GMOUT"], tables),
+        EHIN=[_table_or_array(v["EHIN(1)"], tables), _table_or_array(v["EHIN(2)"], tables)]
+    )
+
+
+def _bheat(v: dict, tables: dict) -> BHEAT:
+    return BHEAT(
+        TYPE=_array(v["TYPE"], int), BCOND=[_table_or_array(v["BCOND(1)"], tables), _table_or_array(v["BCOND(2)"], tables)]
+    )
+
+
+def _bljun(v: dict, materials: dict) -> BLJUN:
+    return BLJUN(TYPE=_array(v["TYPE"], int))
+
+
+# constructors of elements from DATA blocks
+ELEMENT_READERS = {
+    "CH": _ch,
+    "HCS": _hcs,
+    "LR": _lr,
+    "BVOL_T": _bvol_t,
+    "SMASS_T": _smass_t,
+    "BHEAT": _bheat,
+    "BLJUN": _bljun
+}
+
+
+class Kordat:
+    """
+    Структурное представление зоны задания kordat
+    =====
+
+    Attributes
+    ----------
+    task_keys : Dict[str, int | float | str]
+        Ключи задачи
+
+    globals : Dict[str, np.ndarray | int | float | str]
+        Глобальные переменные (таблицы свойств материалов - массивы numpy (2, n))
+
+    layout : List[str]
+        Строки блока LAYOUT (без маркеров разделов)
+
+    calls : List[str]
+        Имена вызываемых элементов (CALL)
+
+    sets : List[str]
+        Имена включаемых событий (SET)
+
+    outs : List[str]
+        Имена выводов (OUT)
+
+    data : Dict[str, DataBlock]
+        Блоки DATA элементов (в порядке следования в kordat)
+
+    events : Dict[str, List[str]]
+        Строки событий (от строки EVENT до строки END включительно)
+
+    outputs : Dict[str, List[str]]
+        Строки выводов (от строки OUTPUT до строки END включительно)
+
+    markers : List[Tuple[int, str, str]]
+        Маркеры разделов: номер строки, "bb" или "eb", имя раздела
+
+    Methods
+    ----------
+    materials -> Dict[str, Material]
+        Возвращает материалы, свойства которых заданы в глобальных переменных
+
+    tables -> Dict[str, TimeTable]
+        Возвращает таблицы граничных условий, заданные в глобальных переменных
+
+    element -> Element
+        Возвращает элемент, восстановленный по блоку DATA
+
+    elements -> List[Element]
+        Возвращает все элементы, восстановленные по блокам DATA
+    """
+    def __init__(self):
+        self.task_keys = {}
+        self.globals = {}
+        self.layout = []
+        self.calls = []
+        self.sets = []
+        self.outs = []
+        self.data = {}
+        self.events = {}
+        self.outputs = {}
+        self.markers = []
+
+    def materials(self) -> Dict[str, Material]:
+        """
+        Материалы, свойства которых заданы в глобальных переменных (_tlam_, _thc_, _tro_)
+        """
+        out = {}
+        for key, tlam in self.globals.items():
+            if not key.startswith("_tlam_"):
+                continue
+            name = key[len("_tlam_"):]
+            thc = self.globals.get("_thc_"+name)
+            tro = self.globals.get("_tro_"+name)
+            if thc is None or tro is None:
+                continue
+            out[name] = Material(name, tlam[0], tlam[1], thc[1], tro[1])
+        return out
+
+    def tables(self) -> Dict[str, TimeTable]:
+        """
+        Таблицы граничных условий от времени, заданные в глобальных переменных (_ttab_)
+        """
+        out = {}
+        for key, table in self.globals.items():
+            if key.startswith(TABLE_PREFIX) and isinstance(table, np.ndarray) and table.ndim == 2:
+                name = key[len(TABLE_PREFIX):]
+                out[name] = TimeTable(name, table[0], table[1])
+        return out
+
+    def element(self, name: str, materials: Dict[str, Material] = None) -> Element:
+        """
+        Элемент, восстановленный по блоку DATA
+
+        Arguments
+        ----------
+        name : str
+            Имя элемента (например, CH5)
+
+        materials : Dict[str, Material | TimeTable] (optional)
+            Материалы структур или таблицы граничных условий. По умолчанию - материалы или таблицы 
+            из глобальных переменных
+
+        Returns
+        ----------
+        element : Element
+            Элемент с ID из имени блока
+        """
+        block = self.data[name]
+        if block.type not in ELEMENT_READERS:
+            raise ValueError("Тип элемента "+block.type+" не поддерживается")
+        if materials is None and block.type == "HCS":
+            materials = self.materials()
+        elif materials is None and any(isinstance(v, list) for v in block.values.values()):
+            materials = self.tables()
+        el = ELEMENT_READERS[block.type](block.values, materials)
+        el.renumber(block.id)
+        el.id_model = block.id
+        return el
+
+    def elements(self) -> List[Element]:
+        """
+        Все элементы поддерживаемых типов, восстановленные по блокам DATA (в порядке следования в kordat)
+        """
+        materials = self.materials()
+        tables = self.tables()
+        return [
+            self.element(name, materials if b.type == "HCS" else tables) 
+            for name, b in self.data.items() if b.type in ELEMENT_READERS
+        ]
+
+
+class _Parser:
+    """
+    Потоковый разбор текста kordat
+
+    Текст подается фрагментами (feed), которые обрабатываются построчно. Многострочные присваивания
+    (массивы) выделяются целиком до завершающего ";" без разбора отдельных строк
+    """
+    def __init__(self):
+        self.kordat = Kordat()
+        self.keys = Assignments()
+        self.global_vars = Assignments()
+        self.state = _HEAD
+        self.sections = []
+        self.target = None
+        self.block = None
+        self.line = 0
+
+    def feed(self, text: str) -> str:
+        """
+        Обработать полные строки текста
+
+        Returns
+        ----------
+        rest : str
+            Необработанный остаток текста (неполная строка или незавершенное присваивание)
+        """
+        pos = 0
+        while True:
+            end = text.find("\n", pos)
+            if end < 0:
+                return text[pos:]
+            line = text[pos:end]
+            if line.endswith("\r"):
+                line = line[:-1]
+
+            if (self.state == _DATA or self.state == _HEAD) and not line.startswith("!!"):
+                statement = _strip_comment(line) if "!" in line else line
+                stripped = statement.strip()
+                if stripped != "" and not stripped.endswith(";") and stripped != "END" and stripped != "MAIN:":
+                    # multi-line assignment: values up to ";"
+                    stop = text.find(";", end)
+                    if stop < 0:
+                        return text[pos:]
+                    next_line = text.find("\n", stop)
+                    if next_line < 0:
+                        return text[pos:]
+                    statement = text[pos:stop]
+                    if "!" in statement:
+                        statement = "\n".join(_strip_comment(l) if "!" in l else l for l in statement.split("\n"))
+                    if self.state == _HEAD:
+                        self.target = self.keys if "Task keys" in self.sections else self.global_vars
+                    self.target.assign(statement)
+                    self.line += 1+text.count("\n", end+1, next_line+1)
+                    pos = next_line+1
+                    continue
+
+            self.line += 1
+            self.__line__(line)
+            pos = end+1
+
+    def __line__(self, line: str):
+        k = self.kordat
+
+        if line.startswith("!!"):
+            if line.startswith("!!bb "):
+                k.markers.append((self.line, "bb", line[5:]))
+                self.sections.append(line[5:])
+            elif line.startswith("!!eb "):
+                k.markers.append((self.line, "eb", line[5:]))
+                if len(self.sections) > 0 and self.sections[-1] == line[5:]:
+                    self.sections.pop()
+            if self.state == _BLOCK:
+                self.block.append(line)
+            return
+
+        state = self.state
+        if state == _BLOCK:
+            self.block.append(line)
+            if line == "END":
+                self.state = _BODY
+            return
+
+        if state == _HEAD or state == _DATA:
+            if "!" in line:
+                line = _strip_comment(line)
+            stripped = line.strip()
+            if stripped == "":
+                return
+            if state == _DATA and stripped == "END":
+                self.target.close()
+                self.state = _BODY
+            elif state == _HEAD and stripped == "MAIN:":
+                self.state = _MAIN
+            else:
+                if state == _HEAD:
+                    self.target = self.keys if "Task keys" in self.sections else self.global_vars
+                self.target.assign(stripped[:-1])
+            return
+
+        if state == _LAYOUT:
+            if line == "END":
+                self.state = _MAIN
+            elif line.rstrip(" ") != "!":
+                k.layout.append(line)
+            return
+
+        stripped = line.strip()
+        if state == _MAIN:
+            if stripped == "LAYOUT":
+                self.state = _LAYOUT
+            elif stripped == "END":
+                self.state = _BODY
+            elif stripped.startswith("CALL "):
+                k.calls.append(stripped[5:].rstrip(";").strip())
+            elif stripped.startswith("SET "):
+                k.sets.append(stripped[4:].rstrip(";").strip())
+            elif stripped.startswith("OUT "):
+                k.outs.append(stripped[4:].rstrip(";").strip())
+            return
+
+        # state == _BODY
+        if stripped.startswith("DATA "):
+            self.target = DataBlock(stripped[5:].strip())
+            k.data[self.target.name] = self.target
+            self.state = _DATA
+        elif stripped.startswith("EVENT "):
+            self.block = [line]
+            k.events[stripped[6:].split("(")[0].strip()] = self.block
+            self.state = _BLOCK
+        elif stripped.startswith("OUTPUT "):
+            self.block = [line]
+            k.outputs[stripped[7:].strip()] = self.block
+            self.state = _BLOCK
+
+    def close(self, rest: str = "") -> Kordat:
+        """
+        Обработать остаток текста и завершить разбор
+        """
+        if rest != "":
+            rest = self.feed(rest+"\n")
+            if rest.strip() != "":
+                raise ValueError("Незавершенное присваивание в конце kordat: "+rest.strip()[:80])
+        if self.state == _DATA:
+            self.target.close()
+        self.keys.close()
+        self.global_vars.close()
+        self.kordat.task_keys = self.keys.values
+        self.kordat.globals = self.global_vars.values
+        return self.kordat
+
+
+# size of text fragments of the parser
+READ_CHUNK = 1 << 23
+
+
+def parse_kordat(lines: Iterable[str]) -> Kordat:
+    """
+    Разобрать строки kordat
+
+    Строки обрабатываются потоком за один проход, значения массивов преобразуются в массивы numpy целиком
+
+    Arguments
+    ----------
+    lines : Iterable[str]
+        Строки kordat (символы перевода строки допускаются)
+
+    Returns
+    ----------
+    kordat : Kordat
+        Структурное представление зоны задания
+    """
+    parser = _Parser()
+    rest = ""
+    chunk = []
+    size = 0
+    for line in lines:
+        if not line.endswith("\n"):
+            line += "\n"
+        chunk.append(line)
+        size += len(line)
+        if size >= READ_CHUNK:
+            rest = parser.feed(rest+"".join(chunk))
+            chunk = []
+            size = 0
+    return parser.close(rest+"".join(chunk))
+
+
+def read_kordat(path: str, encoding: str = None) -> Kordat:
+    """
+    Прочитать файл kordat
+
+    Файл читается фрагментами по READ_CHUNK символов (см. parse_kordat)
+
+    Arguments
+    ----------
+    path : str
+        Полный путь к файлу
+
+    encoding : str (optional)
+        Кодировка файла. По умолчанию - кодировка open()
+
+    Returns
+    ----------
+    kordat : Kordat
+        Структурное представление зоны задания
+    """
+    parser = _Parser()
+    rest = ""
+    with open(path, encoding=encoding, newline="") as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK), ""):
+            rest = parser.feed(rest+chunk)
+    return parser.close(rest)
@@ -0,0 +1,98 @@
+from typing import List, Iterable
+
+from .service import render_settings
+
+
+class Registry:
+    """
+    Реестр объектов глобальных переменных задачи (материалов, таблиц)
+    =====
+
+    Объекты реестра имеют имя (name), хэш содержимого (fingerprint), блок переменных kordat (__globals__), 
+    который перестраивается методом rebuild_data, и хэш содержимого и настройки записи (render_settings), 
+    для которых построен блок (__rendered__).
+
+    Объекты с одинаковым содержимым хранятся один раз - как первый добавленный объект.
+    Порядок объектов - порядок первого появления, поэтому блоки переменных в kordat не меняют порядок между запусками.
+    Блок переменных объекта перестраивается, только если изменилось его содержимое или настройки записи
+
+    Methods
+    ----------
+    intern
+        Возвращает объект реестра с таким же содержимым
+
+    collect -> List
+        Возвращает объекты задачи (без повторов, в порядке появления)
+
+    clear
+        Удаляет объекты из реестра
+    """
+    # objects of the registry (in error messages)
+    __kind__ = "Объекты"
+
+    def __init__(self):
+        # fingerprint -> object
+        self.__objects__ = {}
+        # last collected objects (see collect)
+        self.__collected__ = []
+
+    def __len__(self) -> int:
+        return len(self.__objects__)
+
+    def __iter__(self):
+        return iter(self.__objects__.values())
+
+    def intern(self, obj):
+        """
+        Объект реестра с таким же содержимым, как у obj (obj добавляется, если такого нет)
+        """
+        key = obj.fingerprint()
+        interned = self.__objects__.get(key)
+        # interned object could be changed after interning
+        if interned is None or (not interned is obj and interned.fingerprint() != key):
+            interned = self.__objects__[key] = obj
+        # objects (e.g. materials of nlpy.materials) could be rendered before the render settings were changed
+        if interned.__dict__.get("__rendered__") != (key, render_settings()):
+            interned.rebuild_data()
+        return interned
+
+    def collect(self, objects: Iterable) -> List:
+        """
+        Объекты задачи без повторов в порядке появления
+
+        Если набор объектов не изменился, возвращается тот же список, что и при предыдущем вызове
+
+        Arguments
+        ----------
+        objects : Iterable
+            Объекты (с повторами)
+
+        Returns
+        ----------
+        objects : List
+            Объекты реестра
+        """
+        out = []
+        seen = set()
+        names = {}
+        for obj in objects:
+            obj = self.intern(obj)
+            if id(obj) in seen:
+                continue
+            seen.add(id(obj))
+            if obj.name in names:
+                raise ValueError(self.__kind__+" с именем "+obj.name+" имеют разное содержимое")
+            names[obj.name] = obj
+            out.append(obj)
+
+        if len(out) == len(self.__collected__) and all(a is b for a, b in zip(out, self.__collected__)):
+            return self.__collected__
+        self.__collected__ = out
+        return out
+
+    def clear(self):
+        """
+        Удалить объекты из реестра
+        """
+        self.__objects__ = {}
+        self.__collected__ = []
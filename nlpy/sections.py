@@ -0,0 +1,254 @@
+from typing import List, Iterator
+
+from . import diagnostics
+
+# general variables of the task
+GENERAL_VARIABLES = [
+    "!!bb General variables",
+    "_t0C = 273.15;",
+    "_tOffset = _t0C;",
+    "_pi = 3.1415927;",
+    "_gg = 9.81;",
+    "_xgAir(1:4) = 0.,0.,0.757,0.243;",
+    "_xgN2(1:4) = 0.,0.,9.999e-1,0.;",
+    "_pAtm = 101.3e+03;",
+    "_tAtm = 20.+_tOffset;",
+    "_tsAtm = WS1P1(1,'P',_pAtm,2);",
+    "_kgs = 98066.5;  ! кгс/см2, Па",
+    "_MPa = 1.e6; ! МПа, Па",
+    "_kPa = 1.e3; ! МПа, Па",
+    "_MWt = 1.e6; ! МПа, Па",
+    "_kWt = 1.e3; ! МПа, Па",
+    "_atm = 101325.; ! атм, Па",
+    "_bar = 1.e5; ! бар, Па",
+    "_i = 0;",
+    "_j = 0;",
+    "_m = 0;",
+    "_n = 0;",
+    "_k = 0;",
+    "_x = 0.;",
+    "_y = 0.;",
+    "_z = 0.;",
+    "!!eb General variables",
+]
+
+# sections of kordat in the order of the file
+SECTIONS = ("TASK_KEYS", "GLOBALS", "MAIN", "DATA", "DIAGNOSTICS", "MONITORS", "SENSORS", "EVENTS", "OUTPUTS")
+
+# parts of the MAIN section
+MAIN_SECTIONS = ("LAYOUT", "CALLS", "SETS", "OUTS")
+
+# fragments of the models (see MODEL_PARTS), which are rendered for the section
+SECTION_PARTS = {
+    "GLOBALS": ("sensors",),
+    "LAYOUT": ("layout",),
+    "CALLS": ("elements",),
+    "SETS": ("procedures",),
+    "DATA": ("elements",),
+    "DIAGNOSTICS": ("diagnostics",),
+    "MONITORS": ("procedures",),
+    "SENSORS": ("sensors",),
+    "EVENTS": ("procedures",),
+    "OUTPUTS": ("procedures",)
+}
+
+
+class Sections:
+    """
+    Разделы kordat задачи
+    =====
+
+    Раздел строится при первом обращении и хранится до изменения его входных данных - фрагментов моделей.
+    Фрагменты моделей, нужные разделу (SECTION_PARTS), строятся только при первом обращении к разделу 
+    (Model.rebuild и Task.rebuild их не строят), например, task.sections["LAYOUT"] не строит блоки DATA, 
+    диагностику и события моделей
+
+    Разделы (SECTIONS): TASK_KEYS, GLOBALS, MAIN, DATA, DIAGNOSTICS, MONITORS, SENSORS, EVENTS, OUTPUTS.
+    Части раздела MAIN (MAIN_SECTIONS): LAYOUT, CALLS, SETS, OUTS
+
+    Methods
+    ----------
+    names -> List[str]
+        Возвращает имена разделов
+
+    iter -> Iterator[str]
+        Генерирует строки раздела
+
+    data -> List[str]
+        Возвращает блоки DATA модели
+
+    invalidate
+        Удаляет построенные разделы
+    """
+    def __init__(self, task):
+        self.__task__ = task
+        # section -> (inputs, lines)
+        self.__built__ = {}
+
+    def names(self) -> List[str]:
+        """
+        Имена разделов
+        """
+        return list(SECTIONS+MAIN_SECTIONS)
+
+    def __contains__(self, name: str) -> bool:
+        return name in SECTIONS or name in MAIN_SECTIONS
+
+    def __getitem__(self, name: str) -> List[str]:
+        """
+        Строки раздела name (строится, если изменились входные данные раздела)
+        """
+        inputs, build = self.__section__(name)
+        cached = self.__built__.get(name)
+        if cached is None or not _same(cached[0], inputs):
+            cached = (inputs, list(build()))
+            self.__built__[name] = cached
+        return cached[1]
+
+    def iter(self, name: str) -> Iterator[str]:
+        """
+        Сгенерировать строки раздела name
+
+        Построенный раздел выдается из кэша, иначе строки выдаются по одной без сохранения
+        """
+        inputs, build = self.__section__(name)
+        cached = self.__built__.get(name)
+        if not cached is None and _same(cached[0], inputs):
+            return iter(cached[1])
+        return build()
+
+    def data(self, model_name: str) -> List[str]:
+        """
+        Блоки DATA модели (включая ее подмодели)
+
+        Arguments
+        ----------
+        model_name : str
+            Имя модели в задаче (например, "COOLER1")
+        """
+        for model in self.__task__.models:
+            for m in model.__hierarchy__():
+                if m.model_name_task == model_name:
+                    self.__task__.__render_parts__(SECTION_PARTS["DATA"], [m])
+                    return list(m.__lines__("__data__"))
+        raise KeyError("Модель "+model_name+" не найдена в задаче "+self.__task__.task_name)
+
+    def invalidate(self):
+        """
+        Удалить построенные разделы
+        """
+        self.__built__ = {}
+
+    def __section__(self, name: str) -> tuple:
+        """
+        Входные данные (объекты, сравниваемые по идентичности) и генератор строк раздела
+        """
+        task = self.__task__
+        models = task.models
+        task.__render_parts__(SECTION_PARTS.get(name, ()))
+        # models of the hierarchies in the order of kordat (own fragments of the models are the inputs)
+        deck = [m for model in models for m in model.__deck__()]
+        if name == "TASK_KEYS":
+            return (task.__task_keys__,), lambda: iter(task.__task_keys__)
+        if name == "GLOBALS":
+            return (
+                (task.task_materials, task.task_tables)+tuple(mat.__globals__ for mat in task.task_materials)+
+                tuple(table.__globals__ for table in task.task_tables)+
+                tuple(m.task_sensors_def for m in deck)
+            ), self.__global_variables__
+        if name == "MAIN":
+            inputs = ()
+            for part in MAIN_SECTIONS:
+                inputs += self.__section__(part)[0]
+            return inputs, self.__main_section__
+        if name == "LAYOUT":
+            return tuple(m.task_layout for m in deck), lambda: self.__blocks__(models, "task_layout", ["LAYOUT"], ["END"])
+        if name == "CALLS":
+            return tuple(m.__calls__ for m in deck), lambda: self.__blocks__(models, "__calls__", ["!!bb CALLs"], ["!!eb CALLs"])
+        if name == "SETS":
+            return tuple(m.__sets__ for m in deck), lambda: self.__blocks__(
+                models, "__sets__", ["!!bb SETs"], ["SET _CalcSensor;", "SET _Monitors;", "!!eb SETs"]
+            )
+        if name == "OUTS":
+            return (), lambda: iter(["!!bb OUTs", "\tOUT _Out;", "!!eb OUTs"])
+        if name == "DATA":
+            return tuple(m.__data__ for m in deck), lambda: self.__blocks__(models, "__data__", [], [])
+        if name == "DIAGNOSTICS":
+            return (
+                (diagnostics.SHARED_PROCEDURES,)+tuple(m.__diagnostics__ for m in deck)
+            ), self.__diagnostics__
+        if name == "MONITORS":
+            return tuple(m.__monitors__ for m in deck), lambda: self.__blocks__(
+                models, "__monitors__", ["EVENT _Monitors", "\ttype = ALW;", "\treplace = 1;", "\tturn_on = 1;", ""], ["END"]
+            )
+        if name == "SENSORS":
+            return tuple(m.task_sensors_eval for m in deck), lambda: self.__blocks__(
+                models, "task_sensors_eval", ["EVENT _CalcSensor"], ["END"]
+            )
+        if name == "EVENTS":
+            return tuple(m.__events__ for m in deck), lambda: self.__blocks__(
+                models, "__events__", ["!!bb EVENTs"], ["!!eb EVENTs"]
+            )
+        if name == "OUTPUTS":
+            return tuple(m.__outputs__ for m in deck), self.__outputs__
+        raise KeyError("Раздел kordat "+name+" не существует")
+
+    @staticmethod
+    def __blocks__(models: list, attribute: str, head: List[str], tail: List[str]) -> Iterator[str]:
+        yield from head
+        for m in models:
+            yield from m.__lines__(attribute)
+        yield from tail
+
+    def __global_variables__(self) -> Iterator[str]:
+        yield "!!bb Global variables"
+        for mat in self.__task__.task_materials:
+            yield from mat.__globals__
+        for table in self.__task__.task_tables:
+            yield from table.__globals__
+        for m in self.__task__.models:
+            yield from m.__lines__("task_sensors_def")
+        yield from GENERAL_VARIABLES
+        yield "!!eb Global variables"
+
+    def __main_section__(self) -> Iterator[str]:
+        yield "MAIN:"
+        for part in MAIN_SECTIONS:
+            yield from self.iter(part)
+        yield "END"
+
+    def __diagnostics__(self) -> Iterator[str]:
+        yield "!!bb Diagnostics"
+        if diagnostics.SHARED_PROCEDURES:
+            yield from diagnostics.shared_events()
+        for m in self.__task__.models:
+            yield from m.__lines__("__diagnostics__")
+        yield "!!eb Diagnostics"
+
+    def __outputs__(self) -> Iterator[str]:
+        outputs = [
+            "WRITE",
+            "\tDT",
+            "\t,dt_out",
+            "\t,dt_max",
+            # "\t,dt_diag",
+            # "\t,_monPer",
+            "\t,dt_sav",
+            "\t,restart"
+            # "\t,_tauRest"
+        ]
+        for m in self.__task__.models:
+            outputs.extend(m.__lines__("__outputs__"))
+        outputs[-1] = outputs[-1]+";"
+        yield "!!bb OUTPUTs"
+        yield "OUTPUT _Out"
+        yield from outputs
+        yield "END"
+        yield "!!eb OUTPUTs"
+
+
+def _same(a: tuple, b: tuple) -> bool:
+    """
+    Совпадают ли входные данные раздела (поэлементно по идентичности)
+    """
+    return len(a) == len(b) and all(x is y for x, y in zip(a, b))
@@ -1,6 +1,51 @@
 import numpy as np
 import os
-from typing import Union, List
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import islice
+from typing import Union, List, Dict, Tuple, Iterable
+
+# size of write buffer and number of lines joined per write call
+WRITE_BUFFER = 1 << 20
+WRITE_CHUNK = 8192
+
+# number of significant digits of real numbers in kordat (None - shortest round-trip representation)
+NUMBER_PRECISION = None
+
+# minimal length of run of equal values, written as sub-range assignment (None - whole arrays are written)
+ARRAY_RUNS = None
+# relative tolerance of equality of values in a run
+RUN_TOLERANCE = 0.
+
+# index range of array variable: 1:<upper bound> in the last brackets
+_ARRAY_RANGE = re.compile(r"1:([^,()]+)\)$")
+
+
+def write_lines(lines: Iterable[str], path: str):
+    """
+    Записать последовательность строк в файл
+
+    Строки объединяются в блоки по WRITE_CHUNK и записываются через буфер размером WRITE_BUFFER, 
+    поэтому последовательность может быть генератором произвольной длины
+    
+    Arguments
+    ----------
+    lines : Iterable[str]
+        Строки для записи (без символа перевода строки)
+
+    path : str
+        Полный путь к файлу
+    """
+    lines = iter(lines)
+    with open(path, 'w', buffering=WRITE_BUFFER) as f:
+        chunk = list(islice(lines, WRITE_CHUNK))
+        while len(chunk) > 0:
+            chunk.append("")
+            f.write("\n".join(chunk))
+            chunk = list(islice(lines, WRITE_CHUNK))
 
 
 def write_data(data: List[str], path: str = ""):
@@ -18,9 +63,7 @@ def write_data(data: List[str], path: str = ""):
     if path == "":
         path = os.path.join("./block.txt")
         
-    with open(path,'w') as f:
-        for line in data:
-            f.write(line+'\n')
+    write_lines(data, path)
 
 
 def fill_list_or_float(var: Union[float, int, np.ndarray], N: int = None) -> np.ndarray:
@@ -48,12 +91,185 @@ def fill_list_or_float(var: Union[float, int, np.ndarray], N: int = None) -> np.
     return out
 
 
+def format_array(var: Union[np.ndarray, List[float]], precision: int = None) -> List[str]:
+    """
+    Преобразовать массив чисел в строки kordat
+    
+    Arguments
+    ----------
+    var : np.ndarray | List[float]
+        Значения
+
+    precision : int (optional)
+        Число значащих цифр вещественных чисел (формат %#.{precision}g). По умолчанию используется NUMBER_PRECISION. 
+        Если None - кратчайшая запись, однозначно восстанавливающая значение (совпадает с str(v))
+        
+    Returns
+    ----------
+    out : List[str]
+        Строковые представления значений
+    """
+    if precision is None:
+        precision = NUMBER_PRECISION
+
+    if isinstance(var, np.ndarray):
+        if precision is not None and var.dtype.kind == "f":
+            return list(map(("%#."+str(precision)+"g").__mod__, var.tolist()))
+        # python float/int have the same representation as float64/int numpy scalars
+        if var.dtype == np.float64 or var.dtype.kind in "iub":
+            return list(map(str, var.tolist()))
+        return var.astype(str).tolist()
+
+    # python values keep their own representation (e.g. int in list of floats)
+    if precision is None:
+        return list(map(str, var))
+    return [str(v) if isinstance(v, (int, np.integer)) else "%#.*g" % (precision, v) for v in var]
+
+
+def array_runs(var: np.ndarray, tolerance: float = 0.) -> np.ndarray:
+    """
+    Найти участки массива с одинаковыми значениями
+    
+    Arguments
+    ----------
+    var : np.ndarray
+        Значения
+
+    tolerance : float
+        Относительный допуск: значения участка отличаются от его первого значения не более чем на tolerance*|var[start]|
+        
+    Returns
+    ----------
+    starts : np.ndarray
+        Индексы начала участков (участок i - var[starts[i]:starts[i+1]])
+    """
+    var = np.asarray(var)
+    if len(var) == 0:
+        return np.zeros(0, dtype=int)
+
+    if tolerance > 0.:
+        same = np.abs(var[1:]-var[:-1]) <= tolerance*np.abs(var[:-1])
+    else:
+        same = var[1:] == var[:-1]
+    starts = np.flatnonzero(np.concatenate(([True], ~same)))
+    if tolerance <= 0.:
+        return starts
+
+    # neighbours may drift within a run: split runs, which exceed tolerance relative to the first value
+    out = []
+    ends = np.append(starts[1:], len(var))
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        while end-start > 1:
+            out.append(start)
+            far = np.flatnonzero(np.abs(var[start:end]-var[start]) > tolerance*np.abs(var[start]))
+            if len(far) == 0:
+                break
+            start = start+int(far[0])
+        else:
+            out.append(start)
+    return np.array(out, dtype=int)
+
+
+def table_error(x: np.ndarray, y: np.ndarray, keep: np.ndarray, relative: bool = False) -> np.ndarray:
+    """
+    Погрешность кусочно-линейной интерполяции таблицы по точкам keep во всех точках таблицы
+
+    Arguments
+    ----------
+    x : np.ndarray
+        Аргумент (N), возрастает
+
+    y : np.ndarray
+        Значения (N) или (K, N) - K функций одного аргумента
+
+    keep : np.ndarray
+        Индексы оставленных точек (по возрастанию, включая первую и последнюю)
+
+    relative : bool
+        Погрешность относительно |y|
+
+    Returns
+    ----------
+    error : np.ndarray
+        Погрешность (K, N)
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.atleast_2d(np.asarray(y, dtype=float))
+    error = np.abs(np.array([np.interp(x, x[keep], row[keep]) for row in y])-y)
+    if relative:
+        error = error/np.maximum(np.abs(y), np.finfo(float).tiny)
+    return error
+
+
+def simplify_table(
+        x: np.ndarray, y: np.ndarray, tolerance: float, relative: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Сократить таблицу функций y(x) до точек излома, воспроизводящих ее кусочно-линейной интерполяцией 
+    с погрешностью не более tolerance
+
+    На каждой итерации во все участки, где погрешность превышает допуск, одновременно добавляется точка 
+    с наибольшей погрешностью (Дуглас - Пекер по всем участкам сразу), поэтому количество итераций 
+    порядка логарифма длины таблицы
+
+    Arguments
+    ----------
+    x : np.ndarray
+        Аргумент (N), возрастает
+
+    y : np.ndarray
+        Значения (N) или (K, N) - K функций одного аргумента, точки излома общие
+
+    tolerance : float
+        Допустимая погрешность
+
+    relative : bool
+        Допуск относительно |y| (иначе - абсолютный)
+
+    Returns
+    ----------
+    keep : np.ndarray
+        Индексы оставленных точек
+
+    error : np.ndarray
+        Достигнутая погрешность каждой функции (K)
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.atleast_2d(np.asarray(y, dtype=float))
+    n = len(x)
+    if n != y.shape[1]:
+        raise ValueError("Длина аргумента ("+str(n)+") не совпадает с длиной значений ("+str(y.shape[1])+")")
+    if n <= 2:
+        return np.arange(n), np.zeros(len(y))
+    if np.any(np.diff(x) <= 0.):
+        raise ValueError("Аргумент таблицы не возрастает")
+
+    kept = np.zeros(n, dtype=bool)
+    kept[[0, -1]] = True
+    while True:
+        keep = np.flatnonzero(kept)
+        error = table_error(x, y, keep, relative)
+        worst = error.max(axis=0)
+        if not np.any(worst > tolerance):
+            return keep, error.max(axis=1)
+
+        # point with the largest error in each segment between kept points
+        segment_worst = np.maximum.reduceat(worst, keep[:-1])
+        segment = np.repeat(np.arange(len(keep)-1), np.diff(np.append(keep[:-1], n)))
+        candidates = np.flatnonzero((worst == segment_worst[segment]) & (worst > tolerance))
+        first = candidates[np.concatenate(([True], segment[candidates][1:] != segment[candidates][:-1]))]
+        kept[first] = True
+
+
 def fill_korsar_array(
     var: np.ndarray, 
     var_name: str,
     numel: str = "(1:N)",
     assign: str = "=", 
-    tab: str = "\t") -> List[str]:
+    tab: str = "\t",
+    precision: int = None,
+    runs: int = None,
+    tolerance: float = None) -> List[str]:
     """
     Преобразовать входной массив var в список строк для kordat
     
@@ -73,20 +289,297 @@ def fill_korsar_array(
 
     tab : str
         Символы отступа, которые вставляются перед значениями
+
+    precision : int (optional)
+        Число значащих цифр вещественных чисел (см. format_array)
+
+    runs : int (optional)
+        Минимальная длина участка одинаковых значений, который записывается присваиванием поддиапазону 
+        (например, S(6:25)=0.0053;). По умолчанию используется ARRAY_RUNS. Если None - массив записывается целиком
+
+    tolerance : float (optional)
+        Относительный допуск равенства значений участка (см. array_runs). По умолчанию используется RUN_TOLERANCE
         
     Returns
     ----------
     data : List[str]
         Выходной массив строк
     """
+    if runs is None:
+        runs = ARRAY_RUNS
+    if tolerance is None:
+        tolerance = RUN_TOLERANCE
 
     data = []
     if np.all(var == var[0]):
-        data.append(tab+var_name+assign+str(var[0])+";")
-    else:
+        data.append(tab+var_name+assign+format_array(var[0:1], precision)[0]+";")
+        return data
+
+    # values are joined and split back into lines by C-level str methods
+    prefix = tab+'\t'
+    # range in the name of the variable (e.g. T(1,1:N)) is replaced by the sub-ranges instead of numel
+    ranged = var_name if not _ARRAY_RANGE.search(var_name) is None else var_name+numel
+    array_range = _ARRAY_RANGE.search(ranged)
+    if runs is None or not isinstance(var, np.ndarray) or array_range is None:
         data.append(tab+var_name+numel+assign)
-        for v in var:
-            data.append(tab+'\t'+str(v)+",")
-        data[-1] = tab+'\t'+str(var[-1])+";"
+        data.extend((prefix+(",\n"+prefix).join(format_array(var, precision))+";").split("\n"))
+        return data
+
+    name = ranged[:array_range.start()]
+    starts = array_runs(var, tolerance)
+    ends = np.append(starts[1:], len(var))
+    is_run = (ends-starts) >= runs
+
+    # segments: runs and spans of values between runs
+    segments = []
+    for start, end, run in zip(starts.tolist(), ends.tolist(), is_run.tolist()):
+        if not run and len(segments) > 0 and not segments[-1][2]:
+            segments[-1][1] = end
+        else:
+            segments.append([start, end, run])
+
+    for start, end, run in segments:
+        ref = tab+name+str(start+1)+":"+str(end)+")"+assign
+        if run or end-start == 1:
+            data.append(ref+format_array(var[start:start+1], precision)[0]+";")
+        else:
+            data.append(ref)
+            data.extend((prefix+(",\n"+prefix).join(format_array(var[start:end], precision))+";").split("\n"))
+
+    return data
+
+def render_settings() -> tuple:
+    """
+    Текущие настройки записи массивов в kordat (NUMBER_PRECISION, ARRAY_RUNS, RUN_TOLERANCE)
+    """
+    return (NUMBER_PRECISION, ARRAY_RUNS, RUN_TOLERANCE)
+
+
+def _hash_update(h, value):
+    if isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value)
+        header = ("a"+value.dtype.str+str(value.shape)).encode()
+        h.update(len(header).to_bytes(8, "little"))
+        h.update(header)
+        h.update(value.tobytes())
+        return
+    if isinstance(value, (list, tuple)):
+        h.update(("l"+str(len(value))+";").encode())
+        for v in value:
+            _hash_update(h, v)
+        return
+    if isinstance(value, np.generic):
+        value = value.item()
+    elif not isinstance(value, (str, int, float)) and hasattr(value, "fingerprint"):
+        h.update(("f"+value.fingerprint()).encode())
+        return
+    text = ("s"+type(value).__name__+":"+repr(value)).encode()
+    h.update(len(text).to_bytes(8, "little"))
+    h.update(text)
+
+
+def fingerprint(*values) -> str:
+    """
+    Устойчивый (не зависящий от сеанса Python) хэш значений
+    
+    Arguments
+    ----------
+    values
+        Значения: числа, строки, массивы numpy, списки и кортежи значений, объекты с методом fingerprint()
+        
+    Returns
+    ----------
+    out : str
+        Шестнадцатеричная запись хэша
+    """
+    h = hashlib.blake2b(digest_size=16)
+    _hash_update(h, values)
+    return h.hexdigest()
+
+
+class LRUCache:
+    """
+    Кэш ограниченного размера с вытеснением давно не использованных записей
+    =====
+
+    Кэш может одновременно использоваться несколькими потоками (операции выполняются под блокировкой)
+
+    Attributes
+    ----------
+    maxsize : int
+        Максимальное количество записей (0 - кэш выключен)
+
+    Methods
+    ----------
+    get
+        Возвращает значение по ключу (или None)
+
+    put
+        Добавляет значение в кэш
+
+    clear
+        Очищает кэш
+    """
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.__items__ = OrderedDict()
+        self.__lock__ = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__items__)
+
+    def get(self, key):
+        """
+        Значение по ключу key (None, если значения нет в кэше)
+        """
+        with self.__lock__:
+            value = self.__items__.get(key)
+            if value is not None:
+                self.__items__.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """
+        Добавить значение value с ключом key
+        """
+        if self.maxsize <= 0:
+            return
+        with self.__lock__:
+            self.__items__[key] = value
+            self.__items__.move_to_end(key)
+            while len(self.__items__) > self.maxsize:
+                self.__items__.popitem(last=False)
+
+    def clear(self):
+        """
+        Очистить кэш
+        """
+        with self.__lock__:
+            self.__items__.clear()
+
+
+class Generation:
+    """
+    Счетчик изменений объекта
+    =====
+
+    Любое присваивание атрибута (кроме перечисленных в __untracked__) увеличивает номер поколения объекта.
+    Изменения массивов "на месте" (например, ch.P[0] = 1.e6) не отслеживаются - после них необходимо вызвать touch()
+
+    Methods
+    ----------
+    generation -> int
+        Возвращает номер поколения объекта
+
+    touch
+        Помечает объект как измененный
+    """
+    __untracked__ = frozenset()
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name not in self.__untracked__:
+            self.touch()
+
+    def generation(self) -> int:
+        """
+        Номер поколения объекта
+        """
+        return self.__dict__.get("__generation__", 0)
+
+    def touch(self):
+        """
+        Пометить объект как измененный
+        """
+        self.__dict__["__generation__"] = self.__dict__.get("__generation__", 0)+1
+
+
+# maximum number of parsed kordat lines kept in memory (see parse_layout_line)
+LAYOUT_CACHE_SIZE = 1 << 16
+
+# element reference: optional qualifier chain (e.g. "P.COOLER2") and element name (TYPE + number)
+_ELEMENT_REF = re.compile(r"(?<!\w)(?:((?:[A-Za-z_]\w*\.)*[A-Za-z_]\w*)\.)?([A-Z][A-Z_]*?\d+)(?!\d)")
+
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def parse_layout_line(line: str) -> tuple:
+    """
+    Разбить строку kordat на текстовые фрагменты и ссылки на элементы
+
+    Разобранные строки хранятся в кэше (не более LAYOUT_CACHE_SIZE последних строк)
+    
+    Arguments
+    ----------
+    line : str
+        Строка kordat (например, "Tube2.CH1/o - Tube1.CH1(2);")
+        
+    Returns
+    ----------
+    tokens : tuple
+        Последовательность фрагментов: str - неизменяемый текст, 
+        (qualifier, name) - ссылка на элемент (qualifier - цепочка имен перед элементом, например "P.Tube2", или "")
+    """
+    tokens = []
+    pos = 0
+    for match in _ELEMENT_REF.finditer(line):
+        if match.start() > pos:
+            tokens.append(line[pos:match.start()])
+        tokens.append((match.group(1) or "", match.group(2)))
+        pos = match.end()
+    if pos < len(line):
+        tokens.append(line[pos:])
+
+    return tuple(tokens)
+
+
+def resolve_layout_line(tokens: tuple, index: Dict[str, "Element"]) -> Tuple[str, int]:
+    """
+    Заменить ссылки на элементы в разобранной строке kordat на имена элементов в задаче
+    
+    Arguments
+    ----------
+    tokens : tuple
+        Разобранная строка (см. parse_layout_line)
+
+    index : Dict[str, Element]
+        Словарь имя элемента -> элемент. Ключи - имена в нумерации модели ("CH1") 
+        или полные имена с именем модели ("Tube1.CH1"). Имя модели ищется в конце цепочки ссылки 
+        ("P.COOLER2.BVOL_T1" -> "P." + имя элемента "COOLER2.BVOL_T1")
+        
+    Returns
+    ----------
+    line : str
+        Строка в нумерации задачи
+
+    disabled : int
+        Количество выключенных элементов, на которые ссылается строка
+    """
+    parts = []
+    disabled = 0
+    for token in tokens:
+        if isinstance(token, str):
+            parts.append(token)
+            continue
+        qualifier, name = token
+        el = None
+        if qualifier != "":
+            # model name is the last names of the chain, the rest is kept (e.g. variable "P.")
+            chain = qualifier.split(".")
+            for i in range(len(chain)):
+                el = index.get(".".join(chain[i:])+"."+name)
+                if el is not None:
+                    prefix = ".".join(chain[:i])
+                    break
+        if el is not None:
+            if prefix != "":
+                parts.append(prefix+".")
+            parts.append(el.name())
+        else:
+            el = index.get(name)
+            if qualifier != "":
+                parts.append(qualifier+".")
+            parts.append(name if el is None else el.name())
+        if el is not None and not el.is_enabled():
+            disabled += 1
 
-    return data
\ No newline at end of file
+    return "".join(parts), disabled
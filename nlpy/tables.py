@@ -0,0 +1,180 @@
+import numpy as np
+import os
+from typing import Union, List, Tuple
+
+from .service import*
+from .cache import active_build_cache
+from .registry import Registry
+
+# prefix of the time table name in kordat
+TABLE_PREFIX = "_ttab_"
+
+# suffix of the name of the decimated table (see TimeTable.decimate)
+DECIMATE_SUFFIX = "_d"
+
+
+class TimeTable:
+    """
+    Таблица зависимости граничного условия от времени
+    =====
+
+    Таблица размещается в блоке global variables файла kordat (как таблицы свойств материалов),
+    в блоке DATA граничного условия на нее задается ссылка (например, P=$_ttab_Pin;)
+
+    Attributes
+    ----------
+    name : str
+        Имя таблицы
+
+    time : np.ndarray
+        Моменты времени (возрастают) [с]
+
+    value : np.ndarray
+        Значения граничного условия в моменты времени
+
+    table : str
+        Имя массива таблицы в kordat
+
+    Methods
+    ----------
+    rebuild_data
+        Перестраивает блок переменных таблицы для kordat
+
+    fingerprint -> str
+        Возвращает хэш таблицы
+
+    decimate -> Tuple[TimeTable, float]
+        Возвращает таблицу, сокращенную до точек излома, и достигнутую погрешность
+    """
+    def __init__(
+        self,
+        name: str,
+        time: Union[List[float], np.ndarray],
+        value: Union[List[float], np.ndarray]
+    ):
+        self.name = name
+        self.time = np.asarray(time, dtype=float)
+        self.value = np.asarray(value, dtype=float)
+        if self.time.ndim != 1 or self.time.shape != self.value.shape:
+            raise ValueError(
+                "Длина времени ("+str(self.time.size)+") не совпадает с длиной значений ("+str(self.value.size)+
+                ") таблицы "+name
+            )
+        if len(self.time) == 0:
+            raise ValueError("Таблица "+name+" не содержит точек")
+        if np.any(np.diff(self.time) <= 0.):
+            raise ValueError("Время в таблице "+name+" не возрастает")
+
+        self.table = TABLE_PREFIX+self.name
+
+        self.__globals__ = []
+
+        self.rebuild_data()
+
+    def __write_data__(self, path: str = ""):
+        """
+        Записать блок переменных для kordat
+
+        Arguments
+        ----------
+        path : str
+            Полный путь к файлу зоны задания
+        """
+        if path == "":
+            path = os.path.join("./"+self.name+".txt")
+
+        write_data(self.__globals__,path)
+
+    def fingerprint(self) -> str:
+        """
+        Хэш таблицы (имя, время и значения)
+        """
+        return fingerprint(self.name, self.time, self.value)
+
+    def rebuild_data(self):
+        self.table = TABLE_PREFIX+self.name
+
+        # table and render settings, for which the block is rendered (see Registry)
+        key = self.fingerprint()
+        self.__rendered__ = (key, render_settings())
+
+        cache = active_build_cache()
+        if not cache is None:
+            stored = cache.get("table", fingerprint(*self.__rendered__))
+            if not stored is None:
+                self.__globals__ = stored
+                return
+
+        pairs = ["\t"+t+","+v for t, v in zip(format_array(self.time), format_array(self.value))]
+        self.__globals__ = ["!!bb Table "+self.name, self.table+"(1:2,1:"+str(len(pairs))+") ="]
+        self.__globals__.extend((",\n".join(pairs)+";").split("\n"))
+        self.__globals__.append("!!eb Table "+self.name)
+
+        if not cache is None:
+            cache.put("table", fingerprint(*self.__rendered__), self.__globals__)
+
+    def decimate(self, tolerance: float, relative: bool = False, name: str = None) -> Tuple["TimeTable", float]:
+        """
+        Сократить таблицу до точек излома, воспроизводящих значения линейной интерполяцией по времени
+        с погрешностью не более tolerance (см. simplify_table)
+
+        Arguments
+        ----------
+        tolerance : float
+            Допустимая погрешность значений
+
+        relative : bool
+            Допуск относительно значения (иначе - абсолютный)
+
+        name : str (optional)
+            Имя сокращенной таблицы. По умолчанию - имя таблицы с суффиксом DECIMATE_SUFFIX: таблицы 
+            с одинаковым именем и разными значениями не могут использоваться в одной задаче (см. TableRegistry)
+
+        Returns
+        ----------
+        table : TimeTable
+            Таблица с сокращенным количеством точек
+
+        error : float
+            Достигнутая погрешность
+        """
+        keep, error = simplify_table(self.time, self.value, tolerance, relative)
+        if name is None:
+            name = self.name+DECIMATE_SUFFIX
+        return TimeTable(name, self.time[keep], self.value[keep]), float(error[0])
+
+
+class TableRegistry(Registry):
+    """
+    Реестр таблиц граничных условий задачи
+    =====
+
+    Таблицы с одинаковыми значениями (см. TimeTable.fingerprint) хранятся один раз (см. Registry)
+    """
+    __kind__ = "Таблицы"
+
+
+def fill_table_or_float(var: Union[TimeTable, float, List[float], np.ndarray], N: int = 1) -> Union[TimeTable, np.ndarray]:
+    """
+    Значение параметра граничного условия: таблица от времени или массив значений (см. fill_list_or_float)
+    """
+    if isinstance(var, TimeTable):
+        return var
+    return np.array(fill_list_or_float(var, N), dtype=float)
+
+
+def fill_korsar_table(var: Union[TimeTable, np.ndarray], var_name: str, tab: str = "\t") -> List[str]:
+    """
+    Строки kordat параметра граничного условия: ссылка на таблицу от времени или массив значений
+    (см. fill_korsar_array)
+    """
+    if isinstance(var, TimeTable):
+        return [tab+var_name+"=$"+var.table+";"]
+    return fill_korsar_array(var, var_name, tab = tab)
+
+
+def element_tables(element) -> List[TimeTable]:
+    """
+    Таблицы от времени, заданные в параметрах элемента
+    """
+    return [v for v in (getattr(element, f) for f in element.__fields__) if isinstance(v, TimeTable)]
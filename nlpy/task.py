@@ -1,9 +1,17 @@
 import numpy as np
-from typing import List
+from typing import List, Iterator, Union
 import os
-import copy
+import time
 
 from . import Model
+from .service import write_lines
+from .patch import patch_kordat
+from .numbering import NumberingScope
+from .cache import BuildCache
+from .profiling import active_profiler
+from .materials import MaterialRegistry
+from .tables import TableRegistry
+from .sections import Sections, SECTIONS, GENERAL_VARIABLES
 
 class Task:
     """
@@ -18,14 +26,39 @@ class Task:
     models : List[model]
         Список моделей в задаче
 
+    numbering : NumberingScope
+        Область нумерации задачи. Если задана, элементы и события перенумеровываются при каждом построении kordat
+
+    cache : BuildCache
+        Кэш построения задачи (см. BuildCache). Если задан, при построении kordat используются 
+        сохраненные в нем блоки элементов и фрагменты моделей
+
     kordat : List[str]
         Массив строк, содержащих зону задания kordat
 
+    materials : MaterialRegistry
+        Реестр материалов задачи
+
+    task_materials : List[Material]
+        Материалы задачи (без повторов, в порядке появления)
+
+    tables : TableRegistry
+        Реестр таблиц граничных условий задачи
+
+    task_tables : List[TimeTable]
+        Таблицы граничных условий задачи (без повторов, в порядке появления)
+
+    sections : Sections
+        Разделы kordat, строящиеся по запросу (например, sections["LAYOUT"], sections.data("COOLER1"))
+
     Methods
     ----------
     rebuild
         Перестраивает зону задания kordat
 
+    iter_kordat -> Iterator[str]
+        Генерирует строки зоны задания kordat
+
     write_kordat
         Записывает kordat в файл
     """
@@ -33,21 +66,36 @@ class Task:
             self,
             task_name: str,
             models: List[Model],
+            numbering: NumberingScope = None,
+            cache: Union[str, BuildCache] = None,
             **kwargs: dict
         ):
         self.task_name = task_name
 
         self.models = models
 
-        self.kordat = []
+        self.numbering = numbering
+
+        if isinstance(cache, str):
+            cache = BuildCache(cache)
+        self.cache = cache
 
         self.task_keys = kwargs
 
+        self.sections = Sections(self)
+
+        self.materials = MaterialRegistry()
+
+        self.tables = TableRegistry()
+
         self.rebuild()
 
     def rebuild(self):
         """
         Перестроить kordat
+
+        Модели задачи нумеруются и собираются используемые материалы. Фрагменты kordat моделей 
+        строятся при первом обращении к соответствующим разделам (см. Sections, iter_kordat)
         """
         self.__task_keys__ = [
             "!!bb Task keys",
@@ -71,164 +119,102 @@ class Task:
             '\t_diag = '+str(self.task_keys['_diag'])+";",
             "!!eb Task keys"
         ]
-        self.__globals__ = []
-        self.__outs__ = [
-            "!!bb OUTs",
-            "\tOUT _Out;",
-            "!!eb OUTs"
-        ]
-        self.__layout__ = []
-        self.__calls__ = []
-        self.__sets__ = []
-        self.__main__ = []
-        self.__sensors__ = []
-        
-        self.__data__ = []
-        self.__dignostics__ = []
-        self.__monitors__ = []
-        self.__events__ = ["!!bb EVENTs"]
-        self.__outputs__ = [
-            "WRITE",
-            "\tDT",
-            "\t,dt_out",
-            "\t,dt_max",
-            # "\t,dt_diag",
-            # "\t,_monPer",
-            "\t,dt_sav",
-            "\t,restart"
-            # "\t,_tauRest"
-        ]
 
-        # find same materials
-        mats = []
-        for m in self.models:
-            m.rebuild(
-                elements=copy.copy(m.all_elements), 
-                model_layout=copy.copy(m.model_layout), 
-                boundary_layout=copy.copy(m.boundary_layout), 
-                sensors=copy.copy(m.sensors), 
-                submodels=copy.copy(m.submodels),
-                submodel_links_layout=copy.copy(m.submodel_links_layout),
-                events=copy.copy(m.events)
-            )
-            for el in m.elements_submodels:
-                if el.is_enabled():
-                    if el.el_type() == "HCS":
-                        mats.extend(el.MAT)
-        task_materials = list(set(mats))
-
-        for mat in task_materials:
-            self.__globals__.extend(mat.__globals__)
-
-
-        self.__monitors__ = [
-            "EVENT _Monitors",
-            "\ttype = ALW;",
-            "\treplace = 1;",
-            "\tturn_on = 1;",
-            ""
-        ]
+        if not self.numbering is None:
+            self.numbering.number(self.models)
 
+        if self.cache is None:
+            self.__render__()
+        else:
+            with self.cache:
+                self.__render__()
+
+    def __render__(self):
+        self.__build__ = next(Model._builds)
         for m in self.models:
-            self.__globals__.extend(m.task_sensors_def)
-            self.__sensors__.extend(m.task_sensors_eval)
-            self.__calls__.extend(m.__calls__)
-            self.__layout__.extend(m.task_layout)
-            self.__data__.extend(m.__data__)
-            self.__dignostics__.extend(m.__diagnostics__)
-            self.__monitors__.extend(m.__monitors__)
-            # if not m.mon_per is None:
-            #     self.__monitors__.append("\tCALL _Monitor"+m.model_name_task+"("+str(m.mon_per)+");")
-            # else:
-            #     self.__monitors__.append("\tCALL _Monitor"+m.model_name_task+"(_monPer);")
-            # if len(m.sensors)>0:
-            #     self.__outputs__.append("\t,"+"_sens_"+m.model_name_task)
-            self.__events__.extend(m.__events__)
-            self.__outputs__.extend(m.__outputs__)
-            self.__sets__.extend(m.__sets__)
-
-        self.__monitors__.append("END")
-        self.__events__.append("!!eb EVENTs")
-
-        self.__globals__.extend([
-            "!!bb General variables",
-            "_t0C = 273.15;",
-            "_tOffset = _t0C;",
-            "_pi = 3.1415927;",
-            "_gg = 9.81;",
-            "_xgAir(1:4) = 0.,0.,0.757,0.243;",
-            "_xgN2(1:4) = 0.,0.,9.999e-1,0.;",
-            "_pAtm = 101.3e+03;",
-            "_tAtm = 20.+_tOffset;",
-            "_tsAtm = WS1P1(1,'P',_pAtm,2);",
-            "_kgs = 98066.5;  ! кгс/см2, Па",
-            "_MPa = 1.e6; ! МПа, Па",
-            "_kPa = 1.e3; ! МПа, Па",
-            "_MWt = 1.e6; ! МПа, Па",
-            "_kWt = 1.e3; ! МПа, Па",
-            "_atm = 101325.; ! атм, Па",
-            "_bar = 1.e5; ! бар, Па",
-            "_i = 0;",
-            "_j = 0;",
-            "_m = 0;",
-            "_n = 0;",
-            "_k = 0;",
-            "_x = 0.;",
-            "_y = 0.;",
-            "_z = 0.;",
-            "!!eb General variables",
-        ])
-        self.__globals__.insert(0, "!!bb Global variables")
-        self.__globals__.append("!!eb Global variables")
-        self.__calls__.insert(0, "!!bb CALLs")
-        self.__calls__.append("!!eb CALLs")
-        self.__layout__.insert(0, "LAYOUT")
-        self.__layout__.append("END")
-        
-        self.__sets__.append("SET _CalcSensor;")
-        self.__sets__.append("SET _Monitors;")
-        self.__sets__.insert(0, "!!bb SETs")
-        self.__sets__.append("!!eb SETs")
-
-        self.__main__.extend(self.__layout__)
-        self.__main__.extend(self.__calls__)
-        self.__main__.extend(self.__sets__)
-        self.__main__.extend(self.__outs__)
-        self.__main__.insert(0, "MAIN:")
-        self.__main__.append("END")
-
-        self.__sensors__.insert(0,"EVENT _CalcSensor")
-        self.__sensors__.append("END")
-
-        self.__dignostics__.insert(0, "!!bb Diagnostics")
-        self.__dignostics__.append("!!eb Diagnostics")
-
-        self.__outputs__[-1] = self.__outputs__[-1]+";"
-        self.__outputs__.insert(0,"OUTPUT _Out")
-        self.__outputs__.append("END")
-        self.__outputs__.insert(0,"!!bb OUTPUTs")
-        self.__outputs__.append("!!eb OUTPUTs")
-
-
-
-        self.kordat.extend(self.__task_keys__)
-        self.kordat.extend(self.__globals__)
-        self.kordat.extend(self.__main__)
-        self.kordat.extend(self.__data__)
-        self.kordat.extend(self.__dignostics__)
-        self.kordat.extend(self.__monitors__)
-        self.kordat.extend(self.__sensors__)
-        self.kordat.extend(self.__events__)
-        self.kordat.extend(self.__outputs__)
-
-    def write_kordat(self, path: str = ""):
+            m.render(self.__build__, ("materials",))
+
+        profiler = active_profiler()
+        if not profiler is None:
+            start = time.perf_counter()
+
+        # materials of the models (without repeats, in order of appearance)
+        self.task_materials = self.materials.collect(mat for m in self.models for mat in m.__lines__("__materials__"))
+        self.task_tables = self.tables.collect(table for m in self.models for table in m.__lines__("__tables__"))
+
+        if not profiler is None:
+            profiler.record(self.task_name, "materials", time.perf_counter()-start, len(self.task_materials)+len(self.task_tables))
+
+    def __render_parts__(self, parts: tuple, models: List[Model] = None):
+        """
+        Построить фрагменты kordat моделей задачи в текущем проходе построения (см. Model.render)
+
+        Arguments
+        ----------
+        parts : tuple
+            Фрагменты (см. MODEL_PARTS)
+
+        models : List[Model] (optional)
+            Модели (по умолчанию - модели задачи)
+        """
+        if models is None:
+            models = self.models
+        if all(m.__build__ == self.__build__ and m.__rendered__.issuperset(parts) for m in models):
+            return
+
+        if self.cache is None:
+            for m in models:
+                m.render(self.__build__, parts)
+        else:
+            with self.cache:
+                for m in models:
+                    m.render(self.__build__, parts)
+
+    def iter_kordat(self) -> Iterator[str]:
+        """
+        Сгенерировать строки зоны задания kordat
+
+        Строки выдаются по одной из фрагментов kordat моделей (см. Sections) без сборки общего списка строк 
+        задачи. Каждая модель иерархии хранит для повторных построений только свои фрагменты (подмодели 
+        обходятся в порядке kordat, см. Model.__lines__), поэтому память, занимаемая строками, пропорциональна 
+        размеру kordat и не зависит от глубины вложенности моделей
+
+        Returns
+        ----------
+        lines : Iterator[str]
+            Строки kordat (без символа перевода строки)
+        """
+        for name in SECTIONS:
+            yield from self.sections.iter(name)
+
+    @property
+    def kordat(self) -> List[str]:
+        """
+        Массив строк, содержащих зону задания kordat
+
+        Строится заново при каждом обращении (для записи в файл используется iter_kordat)
+        """
+        return list(self.iter_kordat())
+
+    def write_kordat(self, path: str = "", patch: bool = False):
         """
         Записать kordat в файл
+
+        Строки зоны задания записываются потоком (см. write_lines): общий список строк задачи и текст файла 
+        целиком в памяти не собираются
         
         Arguments
         ----------
         path : str
             Полный путь к файлу зоны задания
+
+        patch : bool
+            Если True, в существующем файле перезаписываются только измененные разделы (см. patch_kordat)
+
+        Returns
+        ----------
+        report : dict
+            Отчет patch_kordat (только при patch = True)
         """
         if path == "":
             path = os.path.join(os.path.dirname(os.path.abspath(os.getcwd()))+"\\"+self.task_name+".kor")
@@ -236,7 +222,7 @@ class Task:
         if not os.path.exists(os.path.dirname(os.path.abspath(path))):
             os.mkdir(os.path.dirname(os.path.abspath(path)))
 
-        
-        with open(path,'w') as f:
-            for line in self.kordat:
-                f.write(line+'\n')
+        if patch:
+            return patch_kordat(self.iter_kordat(), path)
+
+        write_lines(self.iter_kordat(), path)
@@ -0,0 +1,32 @@
+import pytest
+
+from nlpy.elements import CH, HCS, BVOL_T, BHEAT
+from nlpy.elements.element import DATA_CACHE
+
+
+@pytest.fixture
+def task_keys() -> dict:
+    """
+    Ключи задачи для построения kordat
+    """
+    return dict(
+        restart = 0, title = "'test'", dt_max = 0.01, dt_out = 1., fin_tim = 10., dt_sav = 1., append_res = 1,
+        append_sav = 1, check_only = 0, local_err = 1.e-4, ngas = "'H2O'", dt_diag = 1., inf = 1, accel_stat = 0,
+        okbm = 1, nwsp_dat = "'c'", _monPer = 2., _diag = 2.
+    )
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """
+    Элементы, блоки DATA которых перестраивались (в порядке перестроения)
+    """
+    out = []
+    for cls in (CH, HCS, BVOL_T, BHEAT):
+        def rebuild(self, rebuild = cls.rebuild):
+            out.append(self)
+            rebuild(self)
+        monkeypatch.setattr(cls, "rebuild", rebuild)
+    DATA_CACHE.clear()
+    yield out
+    DATA_CACHE.clear()
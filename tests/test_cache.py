@@ -0,0 +1,98 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from nlpy import Model, Task, NumberingScope
+from nlpy.cache import BuildCache
+from nlpy.elements import CH, HCS, BVOL_T
+from nlpy.elements.element import DATA_CACHE
+from nlpy.materials import Steel08H18N10T
+from nlpy.service import LRUCache
+
+
+def test_lru_cache_eviction_order():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_lru_cache_concurrent_access():
+    # frequent switches of threads between get and move_to_end
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1.e-6)
+    cache = LRUCache(64)
+
+    def work(start: int):
+        for i in range(20000):
+            key = (start+i) % 200
+            if cache.get(key) is None:
+                cache.put(key, key)
+        return True
+
+    try:
+        with ThreadPoolExecutor(8) as pool:
+            assert all(pool.map(work, range(0, 800, 100)))
+    finally:
+        sys.setswitchinterval(interval)
+    assert len(cache) == 64
+
+
+def _plant() -> Model:
+    with NumberingScope():
+        pipe = Model(name = "PIPE", id = 1)
+        pipe.rebuild(
+            elements = [
+                CH(N = 3, S = 1.e-3, PR = 0.1, DZ = 1., DH = 0., P = 1.e6, T = [293., 453.15], VOID = 0., TYPE = 0, ROU = 0.),
+                HCS(
+                    N = 3, KL = 1, K = 3, TYPE = 0, COOR = 1, XL = np.array([6.2e-3, 8.0e-3]), 
+                    X = np.linspace(6.2e-3, 8.0e-3, 3), MAT = [Steel08H18N10T], DFZ = 1., B = 36.0, NGE = 0, 
+                    KIND = np.array([6, 4])
+                ),
+                BVOL_T(P = 1.e6, T = [293., 453.15], VOID = 0.)
+            ],
+            model_layout = ["CH1(1:3) - HCS1(1:3)/1;"], boundary_layout = ["CH1/i - BVOL_T1;"],
+            submodel_links_layout = [], sensors = [Model.Sensor("p", "P.CH1(1);")], submodels = [], events = []
+        )
+        plant = Model(name = "PLANT", id = 1)
+        plant.rebuild(
+            elements = [BVOL_T(P = 2.e6, T = [293., 453.15], VOID = 0.)], model_layout = [], 
+            boundary_layout = ["PIPE1.CH1/o - BVOL_T1;"], submodel_links_layout = [], sensors = [], 
+            submodels = [pipe], events = []
+        )
+    return plant
+
+
+def _files(directory) -> int:
+    return sum(len(files) for _, _, files in os.walk(directory))
+
+
+def test_second_build_is_restored_from_build_cache(tmp_path, renders, task_keys):
+    kordat = Task("plant", [_plant()], cache = str(tmp_path), **task_keys).kordat
+    assert len(renders) > 0 and _files(tmp_path) > 0
+
+    # new models and empty in-memory caches, as in a new Python session
+    DATA_CACHE.clear()
+    del renders[:]
+    assert Task("plant", [_plant()], cache = str(tmp_path), **task_keys).kordat == kordat
+    assert renders == []
+
+
+def test_fragments_built_before_build_cache_are_stored(tmp_path, renders, task_keys):
+    plant = _plant()
+    kordat = Task("plant", [plant], **task_keys).kordat
+    assert _files(tmp_path) == 0
+
+    # fragments and DATA blocks are taken from the memory of the models and stored in the build cache
+    assert Task("plant", [plant], cache = BuildCache(str(tmp_path)), **task_keys).kordat == kordat
+    assert _files(tmp_path) > 0
+
+    DATA_CACHE.clear()
+    del renders[:]
+    assert Task("plant", [_plant()], cache = str(tmp_path), **task_keys).kordat == kordat
+    assert renders == []
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from nlpy import service
+from nlpy.elements import CH, BVOL_T, HeatStructureTable
+
+
+def test_data_is_rendered_on_first_access():
+    bv = BVOL_T(P = 1.e6, T = [293., 453.15], VOID = 0.)
+    assert bv.__data__[0] == "DATA "+bv.name()
+    assert "\tP=1000000.0;" in bv.__data__
+
+    bv.P = np.array([2.e6])
+    assert "\tP=2000000.0;" in bv.__data__
+
+
+def test_rebuild_after_change_in_place():
+    bv = BVOL_T(P = 1.e6, T = [293., 453.15], VOID = 0.)
+    generation = bv.generation()
+    bv.P[0] = 3.e6
+    bv.rebuild()
+    assert bv.generation() > generation
+    assert "\tP=3000000.0;" in bv.__data__
+
+
+def test_table_scalar_count_is_checked():
+    kwargs = dict(
+        N = 2, KL = 1, K = 2, TYPE = [1, 1, 1], COOR = 1, XL = [0., 0.01], X = [0., 0.01], MAT = [],
+        DFZ = 0.1, B = 1., NGE = 1, KIND = [1]
+    )
+    with pytest.raises(ValueError, match="параметра TYPE"):
+        HeatStructureTable(2, **kwargs)
+
+
+def test_channel_temperature_profile(monkeypatch):
+    ch = CH(
+        N = 4, S = 1.e-3, PR = 0.1, DZ = 1., DH = 0., P = 1.e6, T = [np.array([293., 293., 303., 313.]), 453.15],
+        VOID = 0., TYPE = 0, ROU = 0.
+    )
+    ch.rebuild()
+    assert "\tT(1,1:N)(1:N)=" in ch.__data__
+    assert "\tT(2,1:N)=453.15;" in ch.__data__
+
+    # sub-ranges replace the range in the name
+    monkeypatch.setattr(service, "ARRAY_RUNS", 2)
+    ch.rebuild()
+    assert ch.__data__[ch.__data__.index("\tT(1,1:2)=293.0;")+1] == "\tT(1,3:4)="
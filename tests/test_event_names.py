@@ -0,0 +1,52 @@
+from nlpy import Model, Task, Event, NumberingScope
+from nlpy.elements import BVOL_T
+
+
+def _volumes(name: str, id: int, events = lambda model: []) -> Model:
+    model = Model(name = name, id = id)
+    model.rebuild(
+        elements = [BVOL_T(P = 1.e6, T = [293., 453.15], VOID = 0.) for _ in range(2)],
+        model_layout = [], boundary_layout = [], submodel_links_layout = [],
+        sensors = [], submodels = [], events = events(model)
+    )
+    return model
+
+
+def _event_lines(task: Task, name: str) -> list:
+    lines = task.sections["EVENTS"]
+    start = [i for i, l in enumerate(lines) if l.startswith("EVENT "+name)][0]
+    return lines[start:lines.index("END", start)+1]
+
+
+def test_uppercase_model_qualifier(task_keys):
+    with NumberingScope():
+        first = _volumes("COOLER", 1)
+        second = _volumes("COOLER", 2)
+        plant = Model(name = "PLANT", id = 1)
+        plant.rebuild(
+            elements = [], model_layout = [], boundary_layout = [], submodel_links_layout = [],
+            sensors = [], submodels = [first, second],
+            events = [
+                Event(
+                    "_print", 0, 1, [plant, first, second],
+                    ["PRINT P.COOLER2.BVOL_T1, P.COOLER2.BVOL_T2;", "PRINT P.COOLER1.BVOL_T2;"]
+                )
+            ]
+        )
+        task = Task("plant", [plant], **task_keys)
+
+    lines = _event_lines(task, "_print")
+    assert "PRINT P.BVOL_T3, P.BVOL_T4;" in lines
+    assert "PRINT P.BVOL_T2;" in lines
+
+
+def test_event_arguments_suffix(task_keys):
+    with NumberingScope():
+        model = _volumes(
+            "COOLER", 1, lambda model: [Event("_set", 0, 1, [model], ["P.BVOL_T1 = _p;"], arguments = ["_p"])]
+        )
+        task = Task("cooler", [model], **task_keys)
+
+    lines = _event_lines(task, "_set")
+    assert lines[0] == "EVENT _setCOOLER1(_pCOOLER1)"
+    assert "P.BVOL_T1 = _p;" in lines
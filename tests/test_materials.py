@@ -0,0 +1,57 @@
+import numpy as np
+
+from nlpy import Model, Task, NumberingScope, service
+from nlpy.elements import HCS
+from nlpy.materials import Material
+
+
+def _steel() -> Material:
+    T = np.linspace(300., 1300., 21)
+    return Material("STEEL", T, 15.+0.01*(T-300.), np.full(len(T), 465.), np.full(len(T), 7850.))
+
+
+def _wall(material: Material) -> HCS:
+    return HCS(
+        N = 2, KL = 1, K = 3, TYPE = 0, COOR = 1, XL = np.array([6.2e-3, 8.0e-3]), X = np.linspace(6.2e-3, 8.0e-3, 3),
+        MAT = [material], DFZ = 1., B = 36.0, NGE = 0, KIND = np.array([6, 4])
+    )
+
+
+def test_compact_material_is_used_with_original(task_keys):
+    steel = _steel()
+    compact, error = steel.compact(1.e-6)
+    assert compact.name == "STEEL_c" and len(compact.T) == 2
+    assert max(error.values()) <= 1.e-6
+
+    with NumberingScope():
+        model = Model(name = "WALLS", id = 1)
+        model.rebuild(
+            elements = [_wall(steel), _wall(compact)], model_layout = [], boundary_layout = [],
+            submodel_links_layout = [], sensors = [], submodels = [], events = []
+        )
+        task = Task("walls", [model], **task_keys)
+
+    assert task.task_materials == [steel, compact]
+    globals = task.sections["GLOBALS"]
+    assert "_tlam_STEEL(1:2,1:21) =" in globals and "_tlam_STEEL_c(1:2,1:2) =" in globals
+    assert "\t\t$_tlam_STEEL_c;" in task.sections["DATA"]
+
+
+def test_precision_applies_to_material_and_scalars(monkeypatch, task_keys):
+    steel = _steel()
+    with NumberingScope():
+        model = Model(name = "WALLS", id = 1)
+        wall = _wall(steel)
+        wall.B = 36.123456
+        model.rebuild(
+            elements = [wall], model_layout = [], boundary_layout = [],
+            submodel_links_layout = [], sensors = [], submodels = [], events = []
+        )
+    # materials are rendered when they are created, before the setting is changed
+    monkeypatch.setattr(service, "NUMBER_PRECISION", 4)
+    task = Task("walls", [model], **task_keys)
+
+    globals = task.sections["GLOBALS"]
+    start = globals.index("_tlam_STEEL(1:2,1:21) =")
+    assert globals[start+1:start+3] == ["\t300.0,15.00,", "\t350.0,15.50,"]
+    assert "\tB = 36.12;" in task.sections["DATA"]
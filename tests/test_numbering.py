@@ -0,0 +1,24 @@
+from nlpy import Model, Task, Event, NumberingScope, Profiler
+from nlpy.elements import BVOL_T
+
+
+def test_unchanged_numbers_keep_procedures(task_keys):
+    with NumberingScope():
+        model = Model(name = "COOLER", id = 1)
+        model.rebuild(
+            elements = [BVOL_T(P = 1.e6, T = [293., 453.15], VOID = 0.) for _ in range(2)],
+            model_layout = [], boundary_layout = [], submodel_links_layout = [], sensors = [], submodels = [],
+            events = [Event("_print", 0, 1, [model], ["PRINT P.BVOL_T1;"])]
+        )
+    task = Task("cooler", [model], numbering = NumberingScope(), **task_keys)
+    kordat = task.kordat
+    event = model.events[0]
+    generation = event.generation()
+
+    with Profiler() as profiler:
+        task.rebuild()
+        assert task.kordat == kordat
+    assert event.generation() == generation
+    totals = profiler.totals()
+    assert totals["procedures"]["calls"] == 0
+    assert totals["procedures"]["cached"] == 1
@@ -0,0 +1,102 @@
+import contextlib
+import io
+import os
+import sys
+
+import numpy as np
+import pytest
+
+from nlpy import Task
+from nlpy.reader import Kordat, read_kordat
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "examples")
+
+
+@pytest.fixture(scope="module")
+def examples() -> dict:
+    """
+    Модели примеров (examples/cooler.py, examples/tjun.py)
+    """
+    sys.path.insert(0, EXAMPLES)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            from cooler import cool
+            from tjun import tjun
+    finally:
+        sys.path.remove(EXAMPLES)
+    return {"cooler": cool, "tjun": tjun}
+
+
+def _blocks(lines: list) -> dict:
+    """
+    Блоки DATA kordat: имя элемента -> строки блока (от DATA до END)
+    """
+    out = {}
+    name = None
+    for line in lines:
+        if line.startswith("DATA "):
+            name = line[len("DATA "):]
+            out[name] = []
+        if not name is None:
+            out[name].append(line)
+            if line == "END":
+                name = None
+    return out
+
+
+def _layout(lines: list) -> list:
+    """
+    Строки раздела LAYOUT без маркеров
+    """
+    return [l for l in lines[1:-1] if not l.startswith("!!bb ") and not l.startswith("!!eb ")]
+
+
+def _check(task: Task, path: str) -> Kordat:
+    """
+    Элементы и структура, прочитанные из файла, совпадают с kordat задачи
+    """
+    kordat = read_kordat(path)
+    blocks = _blocks(task.kordat)
+    assert list(kordat.data) == list(blocks)
+
+    for el in kordat.elements():
+        el.rebuild()
+        assert el.__data__ == blocks[el.name()]
+
+    assert kordat.layout == _layout(task.sections["LAYOUT"])
+    return kordat
+
+
+@pytest.mark.parametrize("name", ["cooler", "tjun"])
+def test_example_round_trip(examples, name, tmp_path, task_keys):
+    task = Task(name, [examples[name]], **task_keys)
+    path = str(tmp_path/"kordat")
+    task.write_kordat(path)
+
+    kordat = _check(task, path)
+    if name == "cooler":
+        assert {b.type for b in kordat.data.values()} == {"CH", "HCS", "LR", "BVOL_T", "SMASS_T", "BHEAT", "BLJUN"}
+
+
+def test_patched_file_round_trip(examples, tmp_path, task_keys):
+    model = examples["cooler"]
+    task = Task("cooler", [model], **task_keys)
+    path = str(tmp_path/"kordat")
+    task.write_kordat(path, patch=True)
+
+    ch = [el for el in model.all_elements if el.el_type() == "CH"][0]
+    P = ch.P
+    try:
+        ch.P = P*1.01
+        task.rebuild()
+        report = task.write_kordat(path, patch=True)
+        assert report["rewritten"] < report["sections"]
+
+        with open(path) as f:
+            padding = [l for l in f.read().split("\n") if l.startswith("!") and set(l) <= {"!", " "}]
+        assert len(padding) > 0
+
+        kordat = _check(task, path)
+        assert np.allclose(kordat.element(ch.name()).P, P*1.01)
+    finally:
+        ch.P = P
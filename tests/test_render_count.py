@@ -0,0 +1,91 @@
+import numpy as np
+
+from nlpy import Model, Task, NumberingScope
+from nlpy.elements import CH, HCS, BVOL_T, BHEAT
+from nlpy.materials import Steel08H18N10T
+
+
+def _tube(id: int, P: float) -> Model:
+    tube = Model(name = "Tube", id = id)
+    tube.ch1 = CH(N = 5, S = 1.2e-4, PR = 1.2e-4, DZ = 2.49, DH = 2.49, P = P, T = [293., 453.15], VOID = 0., TYPE = 0, ROU = 2.e-5)
+    tube.hcs1 = HCS(
+        N = 5, KL = 1, K = 5, TYPE = 0, COOR = 1, XL = np.array([6.2e-3, 8.0e-3]), X = np.linspace(6.2e-3, 8.0e-3, 5),
+        MAT = [Steel08H18N10T], DFZ = 0.3*P*1.e-6, B = 36.0, NGE = 0, KIND = np.array([6, 4])
+    )
+    tube.bv1 = BVOL_T(P = P, T = [293., 453.15], VOID = 0.)
+    tube.bv2 = BVOL_T(P = P, T = [293., 303.15], VOID = 0.)
+    tube.bh = BHEAT(TYPE = 3, BCOND = [1., P*1.e-4])
+    tube.rebuild(
+        elements = [tube.ch1, tube.hcs1, tube.bh, tube.bv1, tube.bv2],
+        model_layout = ["CH1(1:5) - HCS1(1:5)/1;", "HCS1(1:5)/2 - BHEAT1;"],
+        boundary_layout = ["CH1/i - BVOL_T1;", "CH1/o - BVOL_T2;"],
+        sensors = [], submodels = [], submodel_links_layout = [], events = []
+    )
+    return tube
+
+
+def _tjun() -> Model:
+    tjun = Model(name = "TJUN", id = 1)
+    tjun.pipe1 = _tube(1, 1.e6)
+    tjun.pipe2 = _tube(2, 2.e6)
+    tjun.rebuild(
+        elements = [], model_layout = [], boundary_layout = [],
+        submodel_links_layout = ["Tube2.CH1/o - Tube1.CH1(2);"],
+        sensors = [], submodels = [tjun.pipe1, tjun.pipe2], events = []
+    )
+    return tjun
+
+
+def test_unchanged_hierarchy_is_not_rendered(renders, task_keys):
+    with NumberingScope():
+        tjun = _tjun()
+        task = Task("tjun", [tjun], **task_keys)
+    # DATA blocks are not rendered while the models and the task are built
+    assert renders == []
+
+    task.kordat
+    elements = tjun.pipe1.all_elements+tjun.pipe2.all_elements
+    assert sorted(map(id, renders)) == sorted(map(id, elements))
+
+    del renders[:]
+    task.rebuild()
+    task.kordat
+    task.rebuild()
+    task.kordat
+    assert renders == []
+
+
+def test_only_changed_element_is_rendered(renders, task_keys):
+    with NumberingScope():
+        tjun = _tjun()
+        task = Task("tjun", [tjun], **task_keys)
+    task.kordat
+
+    del renders[:]
+    tjun.pipe2.ch1.P = np.full(5, 3.e6)
+    task.rebuild()
+    task.kordat
+    assert renders == [tjun.pipe2.ch1]
+    assert any(l.startswith("\tP=3000000.0") for l in task.sections.data(tjun.pipe2.model_name_task))
+
+
+def test_deep_hierarchy_renders_linearly(renders, task_keys):
+    depth = 30
+    with NumberingScope():
+        model = None
+        for i in range(depth):
+            parent = Model(name = "Level", id = i+1)
+            parent.rebuild(
+                elements = [BVOL_T(P = 1.e5*(i+1), T = [293., 453.15], VOID = 0.)],
+                model_layout = [], boundary_layout = [], submodel_links_layout = [], sensors = [],
+                submodels = [] if model is None else [model], events = []
+            )
+            model = parent
+        task = Task("deep", [model], **task_keys)
+    task.kordat
+    assert len(renders) == depth
+
+    del renders[:]
+    task.rebuild()
+    task.kordat
+    assert renders == []
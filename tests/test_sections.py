@@ -0,0 +1,85 @@
+import numpy as np
+
+from nlpy import Model, Task, NumberingScope, Profiler
+from nlpy.elements import CH, BVOL_T
+
+
+def _pipe(name: str, id: int) -> Model:
+    model = Model(name = name, id = id)
+    model.ch1 = CH(N = 3, S = 1.e-3, PR = 0.1, DZ = 1., DH = 0., P = 1.e6, T = [293., 453.15], VOID = 0., TYPE = 0, ROU = 0.)
+    model.bv1 = BVOL_T(P = 1.e6, T = [293., 453.15], VOID = 0.)
+    model.rebuild(
+        elements = [model.ch1, model.bv1], model_layout = [], boundary_layout = ["CH1/i - BVOL_T1;"],
+        submodel_links_layout = [], sensors = [], submodels = [], events = []
+    )
+    return model
+
+
+def test_layout_does_not_render_data(task_keys):
+    with NumberingScope():
+        first = _pipe("PIPE", 1)
+        second = _pipe("PIPE", 2)
+        task = Task("pipes", [first, second], **task_keys)
+    task.kordat
+
+    first.ch1.P = np.full(3, 2.e6)
+    task.rebuild()
+    layout = task.sections["LAYOUT"]
+    assert "CH1/i - BVOL_T1;" in layout and "CH2/i - BVOL_T2;" in layout
+    # DATA blocks of the changed element are rendered only when they are read
+    assert first.ch1.__dict__["__rendered_generation__"] != first.ch1.generation()
+
+    data = task.sections.data("PIPE1")
+    assert "\tP=2000000.0;" in data
+    assert second.__data__[0] == "!!bb DATAs PIPE2"
+
+
+def test_fresh_task_renders_only_requested_section(task_keys):
+    with NumberingScope():
+        first = _pipe("PIPE", 1)
+        second = _pipe("PIPE", 2)
+        task = Task("pipes", [first, second], **task_keys)
+
+    with Profiler() as profiler:
+        layout = task.sections["LAYOUT"]
+    assert "CH2/i - BVOL_T2;" in layout
+    assert set(profiler.totals()) == {"layout"}
+    # DATA blocks of the elements are not rendered
+    assert all(el.__dict__["__rendered_generation__"] != el.generation() for el in first.all_elements+second.all_elements)
+
+    with Profiler() as profiler:
+        kordat = task.kordat
+    assert set(profiler.totals()) == {"elements", "sensors", "diagnostics", "procedures"}
+    assert "DATA CH1" in kordat
+
+
+def test_sections_match_kordat(task_keys):
+    with NumberingScope():
+        task = Task("pipes", [_pipe("PIPE", 1)], **task_keys)
+
+    kordat = task.kordat
+    task.rebuild()
+    assert task.sections["DATA"] is task.sections["DATA"]
+    assert list(task.iter_kordat()) == kordat
+
+
+def test_models_keep_only_own_fragments(task_keys):
+    depth = 10
+    with NumberingScope():
+        model = None
+        for i in range(depth):
+            parent = Model(name = "Level", id = i+1)
+            parent.rebuild(
+                elements = [BVOL_T(P = 1.e5*(i+1), T = [293., 453.15], VOID = 0.)],
+                model_layout = [], boundary_layout = [], submodel_links_layout = [], sensors = [],
+                submodels = [] if model is None else [model], events = []
+            )
+            model = parent
+        task = Task("deep", [model], **task_keys)
+
+    data = task.sections["DATA"]
+    hierarchy = model.__hierarchy__()
+    # lines of the submodels are not copied into the models above them
+    assert sum(len(m.__data__) for m in hierarchy) == len(data)
+    assert data[0] == "!!bb DATAs Level1" and data[-1] == "!!eb DATAs Level"+str(depth)
+    assert task.sections.data("Level2") == data[:len(hierarchy[-2].__data__)+len(hierarchy[-1].__data__)]
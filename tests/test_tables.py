@@ -0,0 +1,22 @@
+import numpy as np
+
+from nlpy import Model, Task, NumberingScope, TimeTable
+from nlpy.elements import BVOL_T
+
+
+def test_decimated_table_is_used_with_original(task_keys):
+    time = np.linspace(0., 100., 101)
+    table = TimeTable("Pin", time, 1.e6+1.e3*time)
+    decimated, error = table.decimate(1.e-3)
+    assert decimated.name == "Pin_d" and len(decimated.time) == 2 and error <= 1.e-3
+
+    with NumberingScope():
+        model = Model(name = "INLET", id = 1)
+        model.rebuild(
+            elements = [BVOL_T(P = table, T = [293., 453.15], VOID = 0.), BVOL_T(P = decimated, T = [293., 453.15], VOID = 0.)],
+            model_layout = [], boundary_layout = [], submodel_links_layout = [], sensors = [], submodels = [], events = []
+        )
+        task = Task("inlet", [model], **task_keys)
+
+    assert task.task_tables == [table, decimated]
+    assert "\tP=$_ttab_Pin_d;" in task.sections["DATA"]